@@ -35,9 +35,101 @@ class ConfigManager:
 import json
 import os
 import logging
-from typing import Dict, Any, List, Optional, Tuple
+import threading
+from typing import Callable, Dict, Any, List, Mapping, Optional, Tuple
+from utils.cache_utils import TTLCache
 from utils.config_validator import validate_and_fix_config
 
+# 已載入配置的有效秒數；配置只在管理操作時變更，任何 save_config() 都會立即使其失效
+CONFIG_CACHE_TTL = 60
+_config_cache = TTLCache(CONFIG_CACHE_TTL)
+
+# 配置世代編號：每次儲存配置遞增，供衍生快取判斷資料是否過期
+_config_generation = 0
+_generation_lock = threading.Lock()
+
+
+def _bump_config_generation() -> None:
+    """遞增配置世代編號"""
+    global _config_generation
+    with _generation_lock:
+        _config_generation += 1
+
+
+def get_config_generation() -> int:
+    """
+    獲取目前的配置世代編號
+
+    Returns:
+        int: 每次儲存配置後遞增的編號
+    """
+    return _config_generation
+
+
+FormProcessor = Callable[[Mapping[str, str]], Dict[str, Any]]
+
+# 以 (協定, 配置世代) 為鍵的表單處理函數快取
+_form_processor_cache: Dict[Tuple[str, int], FormProcessor] = {}
+_FORM_PROCESSOR_CACHE_SIZE = 32
+
+
+def _to_number(value: str, default: Any) -> Any:
+    """數值欄位：純整數字串直接 int()，其餘經 float() 後整數值仍轉回 int"""
+    if not value:
+        return default
+    digits = value[1:] if value[0] == '-' else value
+    if digits.isdecimal():
+        return int(value)
+    try:
+        float_val = float(value)
+    except ValueError:
+        return default
+    return int(float_val) if float_val.is_integer() else float_val
+
+
+def _to_bool(value: str, default: Any) -> bool:
+    """勾選欄位：瀏覽器只送出已勾選的方塊，出現在表單中即為 True"""
+    return True
+
+
+def _to_text(value: str, default: Any) -> str:
+    """其餘欄位 (文字、密碼、下拉選單) 維持原字串"""
+    return value
+
+
+# 欄位類型 -> 轉換函數，未列出的類型以 _to_text 處理
+_CONVERTERS = {
+    'number': _to_number,
+    'checkbox': _to_bool,
+}
+
+
+def _compile_form_processor(field_info: Dict[str, Dict[str, Any]]) -> FormProcessor:
+    """
+    依欄位資訊預先決定每個欄位的 (轉換函數, 預設值)，回傳表單處理函數
+
+    Args:
+        field_info: get_protocol_field_info() 的結果
+
+    Returns:
+        FormProcessor: 輸入表單 (dict 或 request.form)、輸出轉換後配置的函數；
+            不在 field_info 中的欄位會被略過
+    """
+    specs = {
+        field: (_CONVERTERS.get(spec['type'], _to_text), spec.get('default', 0))
+        for field, spec in field_info.items()
+    }
+
+    def process(form_data: Mapping[str, str]) -> Dict[str, Any]:
+        processed = {}
+        for field, value in form_data.items():
+            spec = specs.get(field)
+            if spec is not None:
+                processed[field] = spec[0](value, spec[1])
+        return processed
+
+    return process
+
 class ConfigManager:
     """
     配置管理器
@@ -198,6 +290,8 @@ class ConfigManager:
         try:
             with open(self.config_file, 'w', encoding='utf-8') as f:
                 json.dump(self.config, f, indent=2, ensure_ascii=False)
+            invalidate_config_cache(self.config_file)
+            _bump_config_generation()
             self.logger.info(f"配置已儲存到 {self.config_file}")
             return True
         except Exception as e:
@@ -361,6 +455,25 @@ class ConfigManager:
         }
         return field_info.get(protocol, {})
     
+    def get_form_processor(self, protocol: str) -> FormProcessor:
+        """
+        獲取協定的表單處理函數 (已預先編譯並快取，配置儲存後重新建立)
+        
+        Args:
+            protocol: 協定名稱
+            
+        Returns:
+            FormProcessor: 將表單字典轉為協定配置的函數
+        """
+        key = (protocol, _config_generation)
+        processor = _form_processor_cache.get(key)
+        if processor is None:
+            if len(_form_processor_cache) >= _FORM_PROCESSOR_CACHE_SIZE:
+                _form_processor_cache.clear()
+            processor = _compile_form_processor(self.get_protocol_field_info(protocol))
+            _form_processor_cache[key] = processor
+        return processor
+    
     def validate_protocol_config(self, protocol: str, config: Dict[str, Any]) -> Tuple[bool, Dict[str, List[str]]]:
         """
         驗證協定配置值
@@ -728,6 +841,39 @@ def get_config_manager(config_file: str = "config.json") -> ConfigManager:
     return _config_manager
 
 
+def get_cached_config_manager(config_file: str = "config.json") -> ConfigManager:
+    """
+    獲取全域配置管理器實例，並確保配置不超過 CONFIG_CACHE_TTL 秒未重新讀檔
+
+    與 get_config_manager() 共用同一個實例；每個請求不必重新建立管理器與驗證配置，
+    超過 CONFIG_CACHE_TTL 或任何 save_config() 之後的第一次呼叫才重新載入。
+
+    Args:
+        config_file: 配置檔案路徑
+
+    Returns:
+        ConfigManager: 配置管理器實例
+    """
+    manager = get_config_manager(config_file)
+    if config_file not in _config_cache:
+        manager.reload_config()
+        _config_cache.set(config_file, True)
+    return manager
+
+
+def invalidate_config_cache(config_file: Optional[str] = None) -> None:
+    """
+    讓 get_cached_config_manager() 下次呼叫時重新載入配置
+
+    Args:
+        config_file: 配置檔案路徑，未指定時清除全部
+    """
+    if config_file is None:
+        _config_cache.invalidate()
+    else:
+        _config_cache.invalidate(config_file)
+
+
 if __name__ == "__main__":
     # 測試配置管理器
     import logging
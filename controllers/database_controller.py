@@ -5,8 +5,12 @@
 
 from flask import Blueprint, request, jsonify
 import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
 from datetime import datetime
 from models import UartDataModel
+from views.api_responses import json_error
+
+logger = logging.getLogger(__name__)
 
 # 創建 Blueprint
 database_bp = Blueprint('database', __name__, url_prefix='/api/database')
@@ -14,6 +18,37 @@ database_bp = Blueprint('database', __name__, url_prefix='/api/database')
 # 初始化模型
 uart_model = UartDataModel()
 
+# 圖表數據支援的數值欄位
+CHART_VALUE_KEYS = ('temperature', 'humidity', 'pressure', 'rssi')
+
+# 各 MAC ID 的檔案讀取屬 I/O 密集，使用執行緒池並行處理
+_MAC_STATS_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix='mac-stats')
+MAC_STATS_TIMEOUT = 30  # 秒
+
+
+def _gather_per_mac(func, mac_ids):
+    """並行對每個 MAC ID 執行 func，依原順序回傳 (mac_id, 結果)；逾時則只回傳已完成的部分"""
+    futures = {_MAC_STATS_POOL.submit(func, mac_id): mac_id for mac_id in mac_ids}
+    results = {}
+    try:
+        for future in as_completed(futures, timeout=MAC_STATS_TIMEOUT):
+            results[futures[future]] = future.result()
+    except FuturesTimeoutError:
+        logger.warning("MAC ID 查詢逾時，僅回傳 %s/%s 筆結果", len(results), len(futures))
+    return [(mac_id, results[mac_id]) for mac_id in mac_ids if mac_id in results]
+
+
+def _collect_mac_stats(mac_id):
+    """讀取單一 MAC ID 的數據與通道資訊"""
+    data_result = uart_model.get_uart_data_from_files(mac_id=mac_id, limit=1000)
+    channels = uart_model.get_mac_channels(mac_id) if data_result['success'] else []
+    return data_result, channels
+
+
+def _collect_latest_record(mac_id):
+    """讀取單一 MAC ID 的最新一筆數據"""
+    return uart_model.get_uart_data_from_files(mac_id=mac_id, limit=1)
+
 
 @database_bp.route('/factory-areas')
 def api_database_factory_areas():
@@ -68,11 +103,8 @@ def api_database_factory_areas():
         })
         
     except Exception as e:
-        logging.error(f"獲取工廠區域資訊時發生錯誤: {e}")
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 500
+        logger.error("獲取工廠區域資訊時發生錯誤: %s", e)
+        return json_error(e)
 
 
 @database_bp.route('/floor-levels')
@@ -105,11 +137,8 @@ def api_database_floor_levels():
         })
         
     except Exception as e:
-        logging.error(f"獲取樓層資訊時發生錯誤: {e}")
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 500
+        logger.error("獲取樓層資訊時發生錯誤: %s", e)
+        return json_error(e)
 
 
 @database_bp.route('/mac-ids')
@@ -120,12 +149,9 @@ def api_database_mac_ids():
         
         # 為每個MAC ID添加統計資訊
         mac_stats = []
-        for mac_id in mac_ids:
-            data_result = uart_model.get_uart_data_from_files(mac_id=mac_id, limit=1000)
-            
+        for mac_id, (data_result, channels) in _gather_per_mac(_collect_mac_stats, mac_ids):
             if data_result['success']:
                 data_count = data_result['total_count']
-                channels = uart_model.get_mac_channels(mac_id)
                 
                 mac_stats.append({
                     'mac_id': mac_id,
@@ -144,11 +170,8 @@ def api_database_mac_ids():
         })
         
     except Exception as e:
-        logging.error(f"獲取MAC ID統計時發生錯誤: {e}")
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 500
+        logger.error("獲取MAC ID統計時發生錯誤: %s", e)
+        return json_error(e)
 
 
 @database_bp.route('/device-models')
@@ -196,11 +219,8 @@ def api_database_device_models():
         })
         
     except Exception as e:
-        logging.error(f"獲取設備型號資訊時發生錯誤: {e}")
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 500
+        logger.error("獲取設備型號資訊時發生錯誤: %s", e)
+        return json_error(e)
 
 
 @database_bp.route('/chart-data')
@@ -216,54 +236,48 @@ def api_database_chart_data():
         data_result = uart_model.get_uart_data_from_files(mac_id=mac_id, limit=1000)
         
         if not data_result['success']:
-            return jsonify({
-                'success': False,
-                'error': data_result['error']
-            }), 400
+            return json_error(data_result['error'], 400)
+        
+        # 處理圖表數據（欄式結構：時間戳與各數值序列為平行陣列）
+        records = data_result['data']
+        timestamps = []
+        series = {key: [] for key in CHART_VALUE_KEYS}
+        data_types = set()
+        
+        for record in records:
+            timestamps.append(record.get('timestamp'))
+            
+            # 添加數值型資料，缺值以 None 對齊
+            for key, column in series.items():
+                value = record.get(key)
+                if value is not None:
+                    try:
+                        value = float(value)
+                        data_types.add(key)
+                    except (ValueError, TypeError):
+                        value = None
+                column.append(value)
         
-        # 處理圖表數據
         chart_data = {
             'type': chart_type,
             'time_range': time_range,
-            'data_points': [],
+            'timestamps': timestamps,
+            'series': {key: series[key] for key in CHART_VALUE_KEYS if key in data_types},
             'summary': {
-                'total_points': len(data_result['data']),
+                'total_points': len(records),
                 'time_span': time_range,
-                'data_types': set()
+                'data_types': [key for key in CHART_VALUE_KEYS if key in data_types]
             }
         }
         
-        for record in data_result['data']:
-            point = {
-                'timestamp': record.get('timestamp'),
-                'values': {}
-            }
-            
-            # 添加數值型資料
-            for key in ['temperature', 'humidity', 'pressure', 'rssi']:
-                if key in record and record[key] is not None:
-                    try:
-                        point['values'][key] = float(record[key])
-                        chart_data['summary']['data_types'].add(key)
-                    except (ValueError, TypeError):
-                        pass
-            
-            chart_data['data_points'].append(point)
-        
-        # 轉換 set 為 list 以便 JSON 序列化
-        chart_data['summary']['data_types'] = list(chart_data['summary']['data_types'])
-        
         return jsonify({
             'success': True,
             'data': chart_data
         })
         
     except Exception as e:
-        logging.error(f"獲取圖表數據時發生錯誤: {e}")
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 500
+        logger.error("獲取圖表數據時發生錯誤: %s", e)
+        return json_error(e)
 
 
 @database_bp.route('/statistics')
@@ -315,11 +329,8 @@ def api_database_statistics():
         })
         
     except Exception as e:
-        logging.error(f"獲取資料庫統計時發生錯誤: {e}")
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 500
+        logger.error("獲取資料庫統計時發生錯誤: %s", e)
+        return json_error(e)
 
 
 @database_bp.route('/latest-data')
@@ -334,11 +345,8 @@ def api_database_latest_data():
         return jsonify(data_result)
         
     except Exception as e:
-        logging.error(f"獲取最新數據時發生錯誤: {e}")
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 500
+        logger.error("獲取最新數據時發生錯誤: %s", e)
+        return json_error(e)
 
 
 @database_bp.route('/latest-auto')
@@ -349,8 +357,7 @@ def api_database_latest_auto():
         mac_ids = uart_model.get_mac_ids()
         latest_data = {}
         
-        for mac_id in mac_ids[:5]:  # 限制前5個MAC ID
-            data_result = uart_model.get_uart_data_from_files(mac_id=mac_id, limit=1)
+        for mac_id, data_result in _gather_per_mac(_collect_latest_record, mac_ids[:5]):  # 限制前5個MAC ID
             if data_result['success'] and data_result['data']:
                 latest_data[mac_id] = data_result['data'][0]
         
@@ -362,11 +369,8 @@ def api_database_latest_auto():
         })
         
     except Exception as e:
-        logging.error(f"自動獲取最新數據時發生錯誤: {e}")
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 500
+        logger.error("自動獲取最新數據時發生錯誤: %s", e)
+        return json_error(e)
 
 
 @database_bp.route('/register-device', methods=['POST'])
@@ -375,22 +379,19 @@ def api_database_register_device():
     try:
         data = request.get_json()
         if not data:
-            return jsonify({
-                'success': False,
-                'error': '沒有接收到設備數據'
-            }), 400
+            return json_error('沒有接收到設備數據', 400)
         
         # 驗證必要字段
         required_fields = ['mac_id', 'device_model', 'location']
         for field in required_fields:
             if field not in data:
-                return jsonify({
-                    'success': False,
-                    'error': f'缺少必要字段: {field}'
-                }), 400
+                return json_error(f'缺少必要字段: {field}', 400)
         
         # 這裡應該實現實際的設備註冊邏輯
         
+        # 新設備可能帶來新的 MAC ID，清除模型快取
+        uart_model.invalidate_cache()
+        
         device_info = {
             'mac_id': data['mac_id'],
             'device_model': data['device_model'],
@@ -407,11 +408,8 @@ def api_database_register_device():
         })
         
     except Exception as e:
-        logging.error(f"註冊設備時發生錯誤: {e}")
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 500
+        logger.error("註冊設備時發生錯誤: %s", e)
+        return json_error(e)
 
 
 @database_bp.route('/device-info')
@@ -422,10 +420,7 @@ def api_database_device_info():
         device_id = request.args.get('device_id')
         
         if not mac_id and not device_id:
-            return jsonify({
-                'success': False,
-                'error': '需要提供 MAC ID 或設備 ID'
-            }), 400
+            return json_error('需要提供 MAC ID 或設備 ID', 400)
         
         # 這裡應該從實際資料庫獲取設備資訊
         # 暫時返回模擬數據
@@ -451,8 +446,5 @@ def api_database_device_info():
         })
         
     except Exception as e:
-        logging.error(f"獲取設備資訊時發生錯誤: {e}")
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 500
\ No newline at end of file
+        logger.error("獲取設備資訊時發生錯誤: %s", e)
+        return json_error(e)
\ No newline at end of file
@@ -7,6 +7,8 @@ from flask import Blueprint, render_template, request, jsonify, flash, redirect,
 import logging
 from datetime import datetime
 
+logger = logging.getLogger(__name__)
+
 # 創建 Blueprint
 device_bp = Blueprint('device', __name__)
 
@@ -23,7 +25,8 @@ def init_controller(device_settings_mgr, multi_device_settings_mgr):
 @device_bp.route('/db-setting')
 def db_setting():
     """設備設定頁面"""
-    logging.info(f'訪問設備設定頁面, remote_addr={request.remote_addr}')
+    if logger.isEnabledFor(logging.INFO):
+        logger.info('訪問設備設定頁面, remote_addr=%s', request.remote_addr)
     
     # 檢查是否從 dashboard 重定向過來
     redirect_to_dashboard = request.args.get('redirect', 'false').lower() == 'true'
@@ -32,7 +35,7 @@ def db_setting():
     try:
         current_settings = device_settings_manager.load_settings() if device_settings_manager else {}
     except Exception as e:
-        logging.error(f"載入設備設定時發生錯誤: {e}")
+        logger.error("載入設備設定時發生錯誤: %s", e)
         current_settings = {}
     
     return render_template('db_setting.html', 
@@ -57,7 +60,7 @@ def api_device_settings():
                 return jsonify({'success': True, 'settings': settings})
                 
         except Exception as e:
-            logging.error(f"獲取設備設定時發生錯誤: {e}")
+            logger.error("獲取設備設定時發生錯誤: %s", e)
             return jsonify({'success': False, 'message': f'獲取設定失敗: {str(e)}'})
     
     else:  # POST
@@ -81,7 +84,7 @@ def api_device_settings():
                         'message': f'設備 {mac_id} 的設定已成功儲存',
                         'mac_id': mac_id
                     }
-                    logging.info(f"設備 {mac_id} 設定已更新: {data.get('device_name')}")
+                    logger.info("設備 %s 設定已更新: %s", mac_id, data.get('device_name'))
                     return jsonify(response_data)
                 else:
                     return jsonify({'success': False, 'message': f'儲存設備 {mac_id} 設定失敗'})
@@ -92,13 +95,13 @@ def api_device_settings():
                         'success': True, 
                         'message': '設備設定已成功儲存'
                     }
-                    logging.info(f"設備設定已更新: {data.get('device_name')}")
+                    logger.info("設備設定已更新: %s", data.get('device_name'))
                     return jsonify(response_data)
                 else:
                     return jsonify({'success': False, 'message': '儲存設定失敗'})
                 
         except Exception as e:
-            logging.error(f"儲存設備設定時發生錯誤: {e}")
+            logger.error("儲存設備設定時發生錯誤: %s", e)
             return jsonify({'success': False, 'message': f'處理請求時發生錯誤: {str(e)}'})
 
 @device_bp.route('/api/multi-device-settings')
@@ -120,7 +123,7 @@ def api_multi_device_settings():
             'timestamp': datetime.now().isoformat()
         })
     except Exception as e:
-        logging.error(f"獲取多設備設定時發生錯誤: {e}")
+        logger.error("獲取多設備設定時發生錯誤: %s", e)
         return jsonify({
             'success': False,
             'message': f'獲取多設備設定失敗: {str(e)}',
@@ -176,7 +179,7 @@ def api_dashboard_areas():
         })
         
     except Exception as e:
-        logging.error(f"獲取廠區統計資料時發生錯誤: {e}")
+        logger.error("獲取廠區統計資料時發生錯誤: %s", e)
         return jsonify({
             'success': False,
             'message': f'獲取廠區統計資料失敗: {str(e)}',
@@ -4,28 +4,140 @@ FTP 控制器
 """
 
 from flask import Blueprint, request, jsonify
+import ftplib
+import io
 import logging
-from datetime import datetime
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from ftp_pool import ftp_pool, parse_response, UPLOAD_BLOCKSIZE
+from utils.time_utils import cached_iso_now
+from views.api_responses import etag_json
 
 # 創建 Blueprint
 ftp_bp = Blueprint('ftp', __name__, url_prefix='/api/ftp')
 
+# FTP 上傳必要字段
+UPLOAD_REQUIRED_FIELDS = ('server', 'username', 'filename')
+
+# 只允許上傳此目錄 (History) 內的檔案，local_path 須為相對於此目錄的路徑
+UPLOAD_ROOT = os.path.realpath(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                            'History'))
+
+# 單次批次上傳的最大檔案數
+UPLOAD_BATCH_MAX = 32
+
+# 連接/上傳測試的逾時秒數，與測試上傳檔案的名稱及大小上限
+FTP_TEST_TIMEOUT = 10
+TEST_UPLOAD_FILENAME = 'test_upload.txt'
+TEST_UPLOAD_MAX_SIZE = 1024 * 1024
+
+# 批次上傳時並行傳輸的執行緒池，每個工作各自向連線池借用連線
+_upload_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix='ftp-upload')
+
+
+def _resolve_local_path(local_path):
+    """
+    將 local_path 解析為 UPLOAD_ROOT 內的實際檔案路徑
+
+    絕對路徑、../ 或符號連結指向目錄外的檔案一律拒絕。
+
+    Raises:
+        ValueError: 路徑不在 UPLOAD_ROOT 內
+        FileNotFoundError: 檔案不存在
+    """
+    if not local_path or not isinstance(local_path, str):
+        raise FileNotFoundError(f'本地檔案不存在: {local_path}')
+    resolved = os.path.realpath(os.path.join(UPLOAD_ROOT, local_path))
+    if os.path.commonpath((UPLOAD_ROOT, resolved)) != UPLOAD_ROOT:
+        raise ValueError(f'不允許上傳 History 目錄以外的檔案: {local_path}')
+    if not os.path.isfile(resolved):
+        raise FileNotFoundError(f'本地檔案不存在: {local_path}')
+    return resolved
+
+
+def _store_file(server, port, username, password, filename, local_path):
+    """透過連線池將本地檔案上傳為遠端 filename，回傳伺服器的完成訊息"""
+    # 從連線池借用已登入的連線，省去每次上傳的連線與登入
+    with ftp_pool.borrow(server, port, username, password) as ftp:
+        with open(local_path, 'rb') as f:
+            reply = ftp.storbinary(f'STOR {filename}', f, blocksize=UPLOAD_BLOCKSIZE)
+    return parse_response(reply)[1]
+
+
+def _server_features(ftp):
+    """以 FEAT 查詢伺服器支援的擴充功能，伺服器不支援 FEAT 時回傳空清單"""
+    try:
+        reply = ftp.sendcmd('FEAT')
+    except ftplib.error_perm:
+        return []
+    # 多行回應的首尾為狀態行，中間每行為一項功能 (例如 " UTF8"、" MLST type*;size*;")
+    return [line.strip().split(' ', 1)[0] for line in reply.splitlines()[1:-1] if line.strip()]
+
+
+def _upload_one(item):
+    """上傳批次中的單一檔案，回傳 {filename, status, duration}（失敗時附 error）"""
+    filename = item.get('filename', '')
+    start = time.monotonic()
+    try:
+        missing = [field for field in UPLOAD_REQUIRED_FIELDS if field not in item]
+        if missing:
+            raise ValueError(f'缺少必要字段: {missing[0]}')
+        local_path = _resolve_local_path(item.get('local_path', ''))
+        reply = _store_file(item['server'], item.get('port', 21), item['username'],
+                            item.get('password', ''), filename, local_path)
+        result = {'filename': filename, 'status': 'success', 'server_reply': reply}
+    except Exception as e:
+        logging.warning(f"FTP批次上傳 {filename} 失敗: {e}")
+        result = {'filename': filename, 'status': 'failed', 'error': str(e)}
+    result['duration'] = round(time.monotonic() - start, 3)
+    return result
+
+
+def _upload_batch(items):
+    """並行上傳多個檔案，總耗時約等於最慢的單檔而非全部加總"""
+    if any(not isinstance(item, dict) for item in items):
+        return jsonify({
+            'success': False,
+            'error': '批次上傳的每個項目都必須是物件'
+        }), 400
+    if len(items) > UPLOAD_BATCH_MAX:
+        return jsonify({
+            'success': False,
+            'error': f'批次上傳最多 {UPLOAD_BATCH_MAX} 個檔案'
+        }), 400
+    
+    results = list(_upload_executor.map(_upload_one, items))
+    failed = sum(1 for result in results if result['status'] != 'success')
+    
+    return jsonify({
+        'success': failed == 0,
+        'message': f'FTP 批次上傳完成: 成功 {len(results) - failed} 個，失敗 {failed} 個',
+        'data': {
+            'results': results,
+            'upload_time': cached_iso_now()
+        }
+    })
+
 
 @ftp_bp.route('/upload', methods=['POST'])
 def api_ftp_upload():
-    """FTP 上傳檔案"""
+    """FTP 上傳檔案（傳入陣列時為批次並行上傳）"""
     try:
-        data = request.get_json()
+        data = request.get_json(silent=True, cache=False)
         if not data:
             return jsonify({
                 'success': False,
                 'error': '沒有接收到上傳數據'
             }), 400
         
+        # 陣列內容視為批次上傳
+        if isinstance(data, list):
+            return _upload_batch(data)
+        
         # 驗證必要字段
-        required_fields = ['server', 'username', 'filename']
-        for field in required_fields:
+        for field in UPLOAD_REQUIRED_FIELDS:
             if field not in data:
                 return jsonify({
                     'success': False,
@@ -33,20 +145,30 @@ def api_ftp_upload():
                 }), 400
         
         server = data['server']
+        port = data.get('port', 21)
         username = data['username']
+        password = data.get('password', '')
         filename = data['filename']
         local_path = data.get('local_path', '')
         
-        # 這裡應該實現實際的FTP上傳邏輯
-        # 暫時返回模擬結果
+        try:
+            resolved_path = _resolve_local_path(local_path)
+        except (ValueError, FileNotFoundError) as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
+        
+        reply = _store_file(server, port, username, password, filename, resolved_path)
         
         upload_result = {
             'server': server,
             'username': username,
             'filename': filename,
             'local_path': local_path,
-            'upload_time': datetime.now().isoformat(),
-            'file_size': os.path.getsize(local_path) if local_path and os.path.exists(local_path) else 0,
+            'upload_time': cached_iso_now(),
+            'file_size': os.path.getsize(resolved_path),
+            'server_reply': reply,
             'status': 'success'
         }
         
@@ -68,6 +190,7 @@ def api_ftp_upload():
 def api_ftp_status():
     """獲取 FTP 狀態"""
     try:
+        now_iso = cached_iso_now()
         ftp_status = {
             'service_status': 'active',
             'connection_pool': {
@@ -78,7 +201,7 @@ def api_ftp_status():
             'recent_uploads': [
                 {
                     'filename': 'uart_data_20250923.csv',
-                    'upload_time': datetime.now().isoformat(),
+                    'upload_time': now_iso,
                     'status': 'success',
                     'file_size': 1024
                 }
@@ -89,7 +212,7 @@ def api_ftp_status():
                 'failed_uploads': 4,
                 'total_bytes_transferred': 1048576
             },
-            'last_check_time': datetime.now().isoformat()
+            'last_check_time': now_iso
         }
         
         return jsonify({
@@ -109,7 +232,7 @@ def api_ftp_status():
 def api_ftp_test_connection():
     """測試 FTP 連接"""
     try:
-        data = request.get_json()
+        data = request.get_json(silent=True, cache=False)
         if not data:
             return jsonify({
                 'success': False,
@@ -127,16 +250,25 @@ def api_ftp_test_connection():
                 'error': '缺少必要的連接參數'
             }), 400
         
-        # 這裡應該實現實際的FTP連接測試邏輯
-        # 暫時返回模擬結果
+        start = time.monotonic()
+        try:
+            with ftp_pool.borrow(server, port, username, password or '', timeout=FTP_TEST_TIMEOUT) as ftp:
+                ftp.voidcmd('NOOP')
+                features = _server_features(ftp)
+        except ftplib.all_errors as e:
+            logging.warning(f"FTP連接測試失敗: {e}")
+            return jsonify({
+                'success': False,
+                'error': f'FTP 連接測試失敗: {e}'
+            }), 502
         
         test_result = {
             'server': server,
             'port': port,
             'username': username,
-            'connection_time': 0.5,  # 秒
-            'server_features': ['UTF8', 'MLST', 'MLSD'],
-            'test_time': datetime.now().isoformat(),
+            'connection_time': round(time.monotonic() - start, 3),  # 秒
+            'server_features': features,
+            'test_time': cached_iso_now(),
             'status': 'connected'
         }
         
@@ -158,7 +290,7 @@ def api_ftp_test_connection():
 def api_ftp_test_upload():
     """測試 FTP 上傳"""
     try:
-        data = request.get_json()
+        data = request.get_json(silent=True, cache=False)
         if not data:
             return jsonify({
                 'success': False,
@@ -166,7 +298,9 @@ def api_ftp_test_upload():
             }), 400
         
         server = data.get('server')
+        port = data.get('port', 21)
         username = data.get('username')
+        password = data.get('password')
         test_file_size = data.get('test_file_size', 1024)  # 預設1KB
         
         if not all([server, username]):
@@ -175,17 +309,37 @@ def api_ftp_test_upload():
                 'error': '缺少必要的測試參數'
             }), 400
         
-        # 這裡應該實現實際的FTP上傳測試邏輯
-        # 暫時返回模擬結果
+        if (not isinstance(test_file_size, int) or isinstance(test_file_size, bool)
+                or not 0 < test_file_size <= TEST_UPLOAD_MAX_SIZE):
+            return jsonify({
+                'success': False,
+                'error': f'test_file_size 必須介於 1 到 {TEST_UPLOAD_MAX_SIZE} 位元組'
+            }), 400
+        
+        # 上傳記憶體中的測試檔案後立即刪除，不在伺服器留下檔案
+        payload = io.BytesIO(b'0' * test_file_size)
+        start = time.monotonic()
+        try:
+            with ftp_pool.borrow(server, port, username, password or '', timeout=FTP_TEST_TIMEOUT) as ftp:
+                reply = ftp.storbinary(f'STOR {TEST_UPLOAD_FILENAME}', payload, blocksize=UPLOAD_BLOCKSIZE)
+                upload_time = time.monotonic() - start
+                ftp.delete(TEST_UPLOAD_FILENAME)
+        except ftplib.all_errors as e:
+            logging.warning(f"FTP上傳測試失敗: {e}")
+            return jsonify({
+                'success': False,
+                'error': f'FTP 上傳測試失敗: {e}'
+            }), 502
         
         test_result = {
             'server': server,
             'username': username,
-            'test_file_name': 'test_upload.txt',
+            'test_file_name': TEST_UPLOAD_FILENAME,
             'test_file_size': test_file_size,
-            'upload_speed': '512 KB/s',
-            'upload_time': 2.0,  # 秒
-            'test_time': datetime.now().isoformat(),
+            'upload_speed': f'{test_file_size / 1024 / max(upload_time, 0.001):.1f} KB/s',
+            'upload_time': round(upload_time, 3),  # 秒
+            'server_reply': parse_response(reply)[1],
+            'test_time': cached_iso_now(),
             'status': 'success'
         }
         
@@ -204,6 +358,7 @@ def api_ftp_test_upload():
 
 
 @ftp_bp.route('/config', methods=['GET', 'POST'])
+@etag_json
 def api_ftp_config():
     """FTP 配置管理"""
     try:
@@ -228,7 +383,7 @@ def api_ftp_config():
         
         elif request.method == 'POST':
             # 儲存FTP配置
-            data = request.get_json()
+            data = request.get_json(silent=True, cache=False)
             if not data:
                 return jsonify({
                     'success': False,
@@ -1,12 +1,181 @@
 # controllers/integrated_dashboard_controller.py
-from flask import Blueprint, render_template, request, jsonify, redirect, url_for, flash
+from flask import Blueprint, render_template, request, jsonify, redirect, url_for, flash, current_app, make_response
+import hashlib
 import logging
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from functools import lru_cache
+
+from config.config_manager import get_cached_config_manager
+from device_settings import device_settings_manager
+from uart_integrated import uart_reader
+from utils.cache_utils import ttl_cache
+from utils.sse_utils import open_event_stream
+from views.api_responses import etag_json
+
+try:
+    from multi_protocol_manager import offline_mode_manager
+except ImportError:
+    offline_mode_manager = None
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+
+def _probe(func):
+    """匯入時試呼叫一次 psutil 功能，回傳該功能在此平台是否可用"""
+    if psutil is None:
+        return False
+    try:
+        func()
+        return True
+    except Exception:
+        return False
+
+
+# 在 Windows 系統上需指定磁碟機根目錄
+_DISK_ROOT = 'C:\\' if os.name == 'nt' else '/'
+
+# psutil 各功能可用性只在匯入時探測一次，取樣時只需判斷旗標
+# CPU 探測同時預熱取樣：之後以 interval=None 呼叫會回傳自上次呼叫以來的使用率，不再阻塞
+_HAS_PSUTIL = psutil is not None
+_HAS_CPU = _probe(lambda: psutil.cpu_percent(interval=None))
+_HAS_MEMORY = _probe(lambda: psutil.virtual_memory())
+_HAS_DISK = _probe(lambda: psutil.disk_usage(_DISK_ROOT))
+_HAS_NET = _probe(lambda: psutil.net_io_counters())
+_HAS_BOOT_TIME = _probe(lambda: psutil.boot_time())
+
+# 檢查是否有安裝 flask-monitoringdashboard
+try:
+    import flask_monitoringdashboard
+    DASHBOARD_AVAILABLE = True
+    logging.info("Flask MonitoringDashboard 可用")
+except ImportError:
+    DASHBOARD_AVAILABLE = False
+    logging.warning("Flask MonitoringDashboard 不可用")
 
 # 創建 Blueprint
 integrated_dashboard_bp = Blueprint('integrated_dashboard', __name__)
 
+# 頁面渲染前的阻塞式 I/O（設定檔讀取）交由背景執行緒並行處理
+_io_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='dashboard-io')
+
+# 系統資源取樣快取秒數，期間內的重複輪詢共用同一份結果
+SYSTEM_SAMPLE_TTL = 2
+# 磁碟使用量變化緩慢，快取較久；網路計數器快取較短
+DISK_SAMPLE_TTL = 30
+NETWORK_SAMPLE_TTL = 1
+
+# SSE 推送間隔（秒）；每次推送都會送出資料，不需另外的心跳
+STREAM_INTERVAL = 2
+
+
+@ttl_cache(SYSTEM_SAMPLE_TTL)
+def _sample_cpu():
+    return psutil.cpu_percent(interval=None)
+
+
+@ttl_cache(SYSTEM_SAMPLE_TTL)
+def _sample_memory():
+    return psutil.virtual_memory()._asdict()
+
+
+@ttl_cache(DISK_SAMPLE_TTL)
+def _sample_disk():
+    return psutil.disk_usage(_DISK_ROOT)._asdict()
+
+
+@ttl_cache(NETWORK_SAMPLE_TTL)
+def _sample_network():
+    counters = psutil.net_io_counters()
+    return counters._asdict() if counters else {}
+
+
+@ttl_cache(SYSTEM_SAMPLE_TTL)
+def _sample_boot_time():
+    return datetime.fromtimestamp(psutil.boot_time()).strftime('%Y-%m-%d %H:%M:%S')
+
+
+# 指標名稱 -> (回應欄位, 取樣函數, 不可用時的預設值)；不可用的指標直接以預設值取代取樣函數
+_SAFE_METRICS = {
+    'cpu': ('cpu_percent', _sample_cpu if _HAS_CPU else None, 0),
+    'memory': ('memory', _sample_memory if _HAS_MEMORY else None,
+               {'percent': 0, 'total': 0, 'available': 0}),
+    'disk': ('disk', _sample_disk if _HAS_DISK else None, {'percent': 0, 'total': 0, 'free': 0}),
+    'network': ('network', _sample_network if _HAS_NET else None, {}),
+    'boot_time': ('boot_time', _sample_boot_time if _HAS_BOOT_TIME else None, 'N/A'),
+}
+# dashboard_stats 未指定 fields 時回傳的指標
+DEFAULT_STATS_FIELDS = ('cpu', 'memory', 'disk', 'network')
+
+
+def _sample_system(fields=tuple(_SAFE_METRICS)):
+    """
+    取樣系統資源資訊
+
+    各指標依自身 TTL 快取，無法取得或取樣失敗的指標回傳預設值，單一指標失敗不影響其他指標；
+    回傳的巢狀字典為共用快取，呼叫端不可修改。
+
+    Args:
+        fields: 要取樣的指標名稱（_SAFE_METRICS 的鍵），未知名稱會被忽略
+    """
+    system_info = {}
+    for name in fields:
+        metric = _SAFE_METRICS.get(name)
+        if metric is None:
+            continue
+        key, sampler, fallback = metric
+        if sampler is None:
+            system_info[key] = fallback
+            continue
+        try:
+            system_info[key] = sampler()
+        except Exception as e:
+            logging.warning(f"取得系統指標 {name} 失敗: {e}")
+            system_info[key] = fallback
+    return system_info
+
+
+# 圖表參數 -> (borderColor, backgroundColor) 快取
+_chart_colors = {}
+
+
+def _get_chart_colors(param_key):
+    """取得參數對應的 Chart.js 顏色，依參數名稱雜湊產生並快取"""
+    colors = _chart_colors.get(param_key)
+    if colors is None:
+        h = hash(param_key)
+        rgb = f'{h % 255}, {(h * 2) % 255}, {(h * 3) % 255}'
+        colors = _chart_colors[param_key] = (f'rgb({rgb})', f'rgba({rgb}, 0.1)')
+    return colors
+
+
+def _parse_timestamp(timestamp):
+    """解析 ISO 格式時間戳記，無法解析或不是字串時回傳 None（呼叫端視為不過濾）"""
+    if not isinstance(timestamp, str):
+        return None
+    return _parse_iso_timestamp(timestamp)
+
+
+@lru_cache(maxsize=4096)
+def _parse_iso_timestamp(timestamp):
+    """
+    解析 ISO 字串為本地時間的 naive datetime（結果以 LRU 快取重用）
+
+    帶時區的時間戳記先換算為本地時間再去除時區，才能與 datetime.now() 比較。
+    """
+    try:
+        parsed = datetime.fromisoformat(timestamp)
+    except ValueError:
+        return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone().replace(tzinfo=None)
+    return parsed
+
 
 @integrated_dashboard_bp.route('/dashboard')
 def flask_dashboard():
@@ -14,12 +183,11 @@ def flask_dashboard():
     logging.info(f'訪問Flask Dashboard, remote_addr={request.remote_addr}')
     
     try:
-        from device_settings import device_settings_manager
-        from config.config_manager import ConfigManager
-        from uart_integrated import uart_reader
+        # 先送出設定檔讀取，與下方其餘工作重疊執行
+        device_settings_future = _io_executor.submit(device_settings_manager.load_settings)
         
-        # 創建配置管理器實例
-        config_manager = ConfigManager()
+        # 取得配置管理器（快取實例，配置儲存時自動重新載入）
+        config_manager = get_cached_config_manager()
         
         # 移除設備設定檢查，直接顯示 dashboard
         # if not device_settings_manager.is_configured():
@@ -34,15 +202,6 @@ def flask_dashboard():
         #                              error_message="請先完成設備設定", 
         #                              redirect_url="/db-setting")
         
-        # 檢查是否有安裝 flask-monitoringdashboard
-        try:
-            import flask_monitoringdashboard
-            DASHBOARD_AVAILABLE = True
-            logging.info("Flask MonitoringDashboard 可用")
-        except ImportError:
-            DASHBOARD_AVAILABLE = False
-            logging.warning("Flask MonitoringDashboard 不可用")
-        
         # 不重定向到 MonitoringDashboard，直接提供我們的自定義 dashboard
         # if DASHBOARD_AVAILABLE:
         #     try:
@@ -53,51 +212,16 @@ def flask_dashboard():
         
         # 提供基本的系統監控資訊
         try:
-            import psutil
-            # 在 Windows 系統上，某些 psutil 功能可能需要特殊處理
-            try:
-                cpu_percent = psutil.cpu_percent(interval=1)
-            except:
-                cpu_percent = 0
-                
-            try:
-                memory_info = psutil.virtual_memory()._asdict()
-            except:
-                memory_info = {'percent': 0, 'total': 0, 'available': 0}
-                
-            try:
-                if os.name == 'nt':  # Windows 系統
-                    disk_info = psutil.disk_usage('C:\\')._asdict()
-                else:
-                    disk_info = psutil.disk_usage('/')._asdict()
-            except:
-                disk_info = {'percent': 0, 'total': 0, 'free': 0}
-                
-            try:
-                network_info = psutil.net_io_counters()._asdict() if psutil.net_io_counters() else {}
-            except:
-                network_info = {}
-                
-            try:
-                boot_time = datetime.fromtimestamp(psutil.boot_time()).strftime('%Y-%m-%d %H:%M:%S')
-            except:
-                boot_time = 'N/A'
-                
-            system_info = {
-                'cpu_percent': cpu_percent,
-                'memory': memory_info,
-                'disk': disk_info,
-                'network': network_info,
-                'boot_time': boot_time
-            }
-        except ImportError:
-            system_info = {
-                'cpu_percent': 'N/A (需要安裝 psutil)',
-                'memory': {'percent': 0},
-                'disk': {'percent': 0},
-                'network': {},
-                'boot_time': 'N/A'
-            }
+            if _HAS_PSUTIL:
+                system_info = _sample_system()
+            else:
+                system_info = {
+                    'cpu_percent': 'N/A (需要安裝 psutil)',
+                    'memory': {'percent': 0},
+                    'disk': {'percent': 0},
+                    'network': {},
+                    'boot_time': 'N/A'
+                }
         except Exception as psutil_error:
             logging.error(f"獲取系統資訊時發生錯誤: {psutil_error}")
             system_info = {
@@ -134,7 +258,7 @@ def flask_dashboard():
         
         # 載入設備設定
         try:
-            device_settings = device_settings_manager.load_settings()
+            device_settings = device_settings_future.result()
         except Exception as device_error:
             logging.error(f"載入設備設定時發生錯誤: {device_error}")
             device_settings = {
@@ -159,73 +283,41 @@ def flask_dashboard():
                          device_settings=device_settings)
 
 
+def _collect_app_stats(config_manager):
+    """收集應用程式統計"""
+    # 需要從外部定義或導入 offline_mode_manager
+    try:
+        current_mode = offline_mode_manager.get_current_mode()
+    except:
+        current_mode = 'idle'
+    
+    return {
+        'uart_running': uart_reader.is_running,
+        'uart_data_count': uart_reader.get_data_count(),
+        'active_protocol': config_manager.get_active_protocol(),
+        'offline_mode': config_manager.get('offline_mode', False),
+        'supported_protocols': config_manager.get_supported_protocols(),
+        'current_mode': current_mode
+    }
+
+
 @integrated_dashboard_bp.route('/api/dashboard/stats')
 def dashboard_stats():
     """API: 獲取 Dashboard 統計資料"""
     try:
-        # 系統資源資訊
-        try:
-            import psutil
-            try:
-                cpu_percent = psutil.cpu_percent(interval=0.1)
-            except:
-                cpu_percent = 0
-                
-            try:
-                memory_info = psutil.virtual_memory()._asdict()
-            except:
-                memory_info = {'percent': 0, 'total': 0, 'available': 0}
-                
-            try:
-                if os.name == 'nt':
-                    disk_info = psutil.disk_usage('C:\\')._asdict()
-                else:
-                    disk_info = psutil.disk_usage('/')._asdict()
-            except:
-                disk_info = {'percent': 0, 'total': 0, 'free': 0}
-                
-            try:
-                network_info = psutil.net_io_counters()._asdict() if psutil.net_io_counters() else {}
-            except:
-                network_info = {}
-                
-        except ImportError:
-            cpu_percent = 0
-            memory_info = {'percent': 0, 'total': 0, 'available': 0}
-            disk_info = {'percent': 0, 'total': 0, 'free': 0}
-            network_info = {}
+        # 系統資源資訊：可用 ?fields=cpu,memory 只取需要的指標
+        fields_arg = request.args.get('fields')
+        fields = [f.strip() for f in fields_arg.split(',')] if fields_arg else DEFAULT_STATS_FIELDS
+        system_stats = _sample_system(fields)
         
         # 應用程式統計
-        from uart_integrated import uart_reader
-        from config.config_manager import ConfigManager
-        
-        # 創建配置管理器實例
-        config_manager = ConfigManager()
-        
-        # 需要從外部定義或導入 offline_mode_manager
-        try:
-            from multi_protocol_manager import offline_mode_manager
-            current_mode = offline_mode_manager.get_current_mode()
-        except:
-            current_mode = 'idle'
-        
-        app_stats = {
-            'uart_running': uart_reader.is_running,
-            'uart_data_count': uart_reader.get_data_count(),
-            'active_protocol': config_manager.get_active_protocol(),
-            'offline_mode': config_manager.get('offline_mode', False),
-            'supported_protocols': config_manager.get_supported_protocols(),
-            'current_mode': current_mode
-        }
+        # 取得配置管理器（快取實例，配置儲存時自動重新載入）
+        config_manager = get_cached_config_manager()
+        app_stats = _collect_app_stats(config_manager)
         
         return jsonify({
             'success': True,
-            'system': {
-                'cpu_percent': cpu_percent,
-                'memory': memory_info,
-                'disk': disk_info,
-                'network': network_info
-            },
+            'system': system_stats,
             'app': app_stats
         })
         
@@ -237,11 +329,44 @@ def dashboard_stats():
         }), 500
 
 
+@integrated_dashboard_bp.route('/api/dashboard/stream')
+def dashboard_stream():
+    """SSE: 持續推送 Dashboard 統計資料，取代前端定時輪詢 /api/dashboard/stats"""
+    fields_arg = request.args.get('fields')
+    fields = [f.strip() for f in fields_arg.split(',')] if fields_arg else DEFAULT_STATS_FIELDS
+    # 產生器在請求結束後才執行，先取出目前應用的 JSON 序列化函數
+    dumps = current_app.json.dumps
+    
+    def event_stream():
+        while True:
+            try:
+                payload = {
+                    'success': True,
+                    'system': _sample_system(fields),
+                    'app': _collect_app_stats(get_cached_config_manager())
+                }
+            except Exception as e:
+                logging.error(f"推送 Dashboard 統計資料失敗: {e}")
+                payload = {'success': False, 'error': str(e)}
+            yield f"data: {dumps(payload)}\n\n"
+            
+            time.sleep(STREAM_INTERVAL)
+    
+    # 連線有壽命上限 (到期後前端自動重連)，同時連線數已滿時回傳 503
+    response = open_event_stream(event_stream())
+    if response is None:
+        return jsonify({
+            'success': False,
+            'error': '即時串流連線數已達上限，請稍後再試'
+        }), 503
+    return response
+
+
 @integrated_dashboard_bp.route('/api/dashboard/device-settings')
+@etag_json
 def dashboard_device_settings():
     """API: 獲取設備設定資料"""
     try:
-        from device_settings import device_settings_manager
         settings = device_settings_manager.load_settings()
         
         return jsonify({
@@ -256,17 +381,33 @@ def dashboard_device_settings():
         }), 500
 
 
+def _chart_etag(hours, mac_id, parameter):
+    """
+    圖表資料的 ETag：由 UART 資料版本、查詢參數與目前分鐘組成
+
+    回應內的 time_range 每次都不同，不能拿來比對；加入分鐘數讓時間窗移動後
+    最多一分鐘內就會重新計算。
+    """
+    key = f'{uart_reader.get_data_version()}|{int(time.time()) // 60}|{hours}|{mac_id}|{parameter}'
+    return hashlib.blake2b(key.encode('utf-8'), digest_size=16).hexdigest()
+
+
 @integrated_dashboard_bp.route('/api/dashboard/chart-data')
 def dashboard_chart_data():
     """API: 獲取圖表資料"""
     try:
-        from uart_integrated import uart_reader
-        
         # 獲取時間範圍參數
         hours = request.args.get('hours', 24, type=int)  # 預設24小時
         mac_id = request.args.get('mac_id', '')  # MAC ID過濾
         parameter = request.args.get('parameter', '')  # 參數過濾
         
+        # 資料與查詢條件都未變動時直接回應 304，不必重新分組與序列化
+        etag = _chart_etag(hours, mac_id, parameter)
+        if request.if_none_match.contains(etag):
+            not_modified = make_response('', 304)
+            not_modified.set_etag(etag)
+            return not_modified
+        
         # 計算時間範圍
         end_time = datetime.now()
         start_time = end_time - timedelta(hours=hours)
@@ -274,67 +415,66 @@ def dashboard_chart_data():
         # 獲取UART資料
         uart_data = uart_reader.get_latest_data()
         
-        # 過濾資料
-        filtered_data = []
-        if uart_data:
-            for item in uart_data:
-                if isinstance(item, dict):
-                    # 時間過濾
-                    if 'timestamp' in item:
-                        try:
-                            item_time = datetime.fromisoformat(item['timestamp'])
-                            if item_time < start_time:
-                                continue
-                        except:
-                            pass  # 如果時間解析失敗，包含這個項目
-                    
-                    # MAC ID過濾
-                    if mac_id and item.get('mac_id', '') != mac_id:
-                        continue
-                        
-                    # 參數過濾
-                    if parameter and item.get('parameter', '') != parameter:
-                        continue
-                        
-                    filtered_data.append(item)
-        
-        # 準備圖表資料
-        chart_data = {
-            'labels': [],
-            'datasets': []
-        }
-        
-        # 按參數分組資料
+        # 單次走訪完成過濾與分組，不再建立中間的 filtered_data 串列
         parameter_data = {}
-        for item in filtered_data:
-            param_key = f"{item.get('parameter', 'Unknown')} ({item.get('unit', '')})"
-            if param_key not in parameter_data:
-                parameter_data[param_key] = {
+        data_count = 0
+        for item in uart_data or ():
+            if not isinstance(item, dict):
+                continue
+            item_get = item.get
+
+            # MAC ID / 參數過濾（字串比較較便宜，先於時間解析）
+            if mac_id and item_get('mac_id', '') != mac_id:
+                continue
+            if parameter and item_get('parameter', '') != parameter:
+                continue
+
+            # 時間過濾：同一筆 UART 資料拆出的多個參數共用時間戳記，解析結果以快取重用
+            timestamp = item_get('timestamp')
+            if timestamp is not None:
+                item_time = _parse_timestamp(timestamp)
+                if item_time is not None and item_time < start_time:
+                    continue
+
+            param_key = f"{item_get('parameter', 'Unknown')} ({item_get('unit', '')})"
+            dataset = parameter_data.get(param_key)
+            if dataset is None:
+                border_color, background_color = _get_chart_colors(param_key)
+                dataset = parameter_data[param_key] = {
                     'data': [],
                     'label': param_key,
-                    'borderColor': f'rgb({hash(param_key) % 255}, {(hash(param_key) * 2) % 255}, {(hash(param_key) * 3) % 255})',
-                    'backgroundColor': f'rgba({hash(param_key) % 255}, {(hash(param_key) * 2) % 255}, {(hash(param_key) * 3) % 255}, 0.1)'
+                    'borderColor': border_color,
+                    'backgroundColor': background_color
                 }
             
             # 添加資料點
-            parameter_data[param_key]['data'].append({
-                'x': item.get('timestamp', ''),
-                'y': item.get('value', 0)
+            dataset['data'].append({
+                'x': item_get('timestamp', ''),
+                'y': item_get('value', 0)
             })
+            data_count += 1
+        
+        # 準備圖表資料
+        chart_data = {
+            'labels': [],
+            'datasets': []
+        }
         
         # 轉換為Chart.js格式
         chart_data['datasets'] = list(parameter_data.values())
         
-        return jsonify({
+        response = jsonify({
             'success': True,
             'chart_data': chart_data,
-            'data_count': len(filtered_data),
+            'data_count': data_count,
             'time_range': {
                 'start': start_time.isoformat(),
                 'end': end_time.isoformat(),
                 'hours': hours
             }
         })
+        response.set_etag(etag)
+        return response
         
     except Exception as e:
         logging.error(f"獲取圖表資料失敗: {e}")
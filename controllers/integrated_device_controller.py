@@ -1,11 +1,50 @@
 # controllers/integrated_device_controller.py
 from flask import Blueprint, render_template, request, jsonify, url_for
 import logging
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+import time
+
+from device_settings import device_settings_manager
+from multi_device_settings import multi_device_settings_manager
+from views.api_responses import etag_json
+
+try:
+    from database_manager import db_manager as database_manager
+except ImportError:
+    database_manager = None
 
 # 創建 Blueprint
 integrated_device_bp = Blueprint('integrated_device', __name__)
 
+# 設備資訊同步到資料庫屬於盡力而為，交由背景執行緒處理，不阻塞設定儲存的回應
+_db_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='device-db')
+
+
+# 以應用根路徑為鍵快取的 dashboard 網址；路由固定，解析一次即可重用
+_dashboard_urls = {}
+
+
+def _dashboard_url():
+    """取得 dashboard 頁面網址，首次呼叫後直接重用快取結果"""
+    script_root = request.script_root
+    url = _dashboard_urls.get(script_root)
+    if url is None:
+        url = _dashboard_urls[script_root] = url_for('integrated_dashboard.flask_dashboard')
+    return url
+
+
+def _log_register_result(mac_id):
+    """建立資料庫同步完成後的記錄回呼"""
+    def callback(future):
+        error = future.exception()
+        if error is not None:
+            logging.warning(f"設備資訊同步到資料庫失敗: {error}")
+        elif future.result() is False:
+            logging.warning(f"設備 {mac_id} 資訊同步到資料庫失敗")
+        else:
+            logging.info(f"設備 {mac_id} 資訊已同步到資料庫")
+    return callback
+
 
 @integrated_device_bp.route('/db-setting')
 def db_setting():
@@ -17,11 +56,9 @@ def db_setting():
     
     # 載入當前設備設定
     try:
-        from device_settings import device_settings_manager
         current_settings = device_settings_manager.load_settings()
     except Exception as e:
         logging.error(f"載入設備設定時發生錯誤: {e}")
-        from device_settings import device_settings_manager
         current_settings = device_settings_manager.default_settings.copy()
     
     return render_template('db_setting.html', 
@@ -32,10 +69,6 @@ def db_setting():
 @integrated_device_bp.route('/api/device-settings', methods=['GET', 'POST'])
 def api_device_settings():
     """API: 獲取或儲存設備設定，支援多設備"""
-    from device_settings import device_settings_manager
-    from multi_device_settings import multi_device_settings_manager
-    from database_manager import database_manager
-    
     if request.method == 'GET':
         try:
             # 檢查是否指定了特定的 MAC ID
@@ -56,7 +89,7 @@ def api_device_settings():
     
     else:  # POST
         try:
-            data = request.get_json()
+            data = request.get_json(silent=True, cache=False)
             if not data:
                 return jsonify({'success': False, 'message': '無效的請求資料'})
             
@@ -75,12 +108,12 @@ def api_device_settings():
                         # 格式化設備型號
                         device_model = data.get('device_model', {})
                         if isinstance(device_model, dict):
-                            # 將多頻道型號合併為字串
-                            model_parts = []
-                            for channel, model in device_model.items():
-                                if model and model.strip():
-                                    model_parts.append(f"Ch{channel}:{model}")
-                            formatted_model = "; ".join(model_parts) if model_parts else "未設定"
+                            # 將多頻道型號合併為字串，略過空白型號
+                            formatted_model = "; ".join(
+                                f"Ch{channel}:{model}"
+                                for channel, model in device_model.items()
+                                if model and model.strip()
+                            ) or "未設定"
                         else:
                             formatted_model = str(device_model) if device_model else "未設定"
                         
@@ -92,11 +125,11 @@ def api_device_settings():
                             'factory_area': data.get('device_name', ''),  # 使用設備名稱作為廠區
                             'floor_level': '1F',  # 預設樓層，可以後續修改
                             'location_description': data.get('device_location', ''),
-                            'installation_date': datetime.now().date().isoformat(),
+                            'installation_date': time.strftime('%Y-%m-%d'),
                             'status': 'active'
                         }
-                        database_manager.register_device(device_info)
-                        logging.info(f"設備 {mac_id} 資訊已同步到資料庫")
+                        future = _db_executor.submit(database_manager.register_device, device_info)
+                        future.add_done_callback(_log_register_result(mac_id))
                     except Exception as db_error:
                         logging.warning(f"設備資訊同步到資料庫失敗: {db_error}")
                     
@@ -109,7 +142,7 @@ def api_device_settings():
                     # 檢查是否需要重定向到 dashboard
                     redirect_to_dashboard = data.get('redirect_to_dashboard', False)
                     if redirect_to_dashboard:
-                        response_data['redirect_url'] = url_for('integrated_dashboard.flask_dashboard')
+                        response_data['redirect_url'] = _dashboard_url()
                     
                     return jsonify(response_data)
                 else:
@@ -125,7 +158,7 @@ def api_device_settings():
                     # 檢查是否需要重定向到 dashboard
                     redirect_to_dashboard = data.get('redirect_to_dashboard', False)
                     if redirect_to_dashboard:
-                        response_data['redirect_url'] = url_for('integrated_dashboard.flask_dashboard')
+                        response_data['redirect_url'] = _dashboard_url()
                     
                     return jsonify(response_data)
                 else:
@@ -137,10 +170,10 @@ def api_device_settings():
 
 
 @integrated_device_bp.route('/api/multi-device-settings')
+@etag_json
 def api_multi_device_settings():
     """API: 獲取所有設備設定"""
     try:
-        from multi_device_settings import multi_device_settings_manager
         settings = multi_device_settings_manager.get_all_device_settings()
         device_count = len(settings)
         
@@ -1,36 +1,86 @@
 # controllers/integrated_home_controller.py
-from flask import Blueprint, render_template, request, make_response
+from flask import Blueprint, render_template, request, make_response, current_app
+import hashlib
 import logging
 
+from uart_integrated import uart_reader
+
+try:
+    from multi_protocol_manager import multi_protocol_manager
+except ImportError:
+    multi_protocol_manager = None
+
 # 創建 Blueprint
 integrated_home_bp = Blueprint('integrated_home', __name__)
 
+# 應用程式頁面支援的協議（以大寫比對）
+SUPPORTED_PROTOCOLS = frozenset({'FTP', 'SFTP', 'SAMBA', 'TCP', 'UDP', 'MQTT'})
+
+# 首頁只顯示最新 UART 資料，可容忍 1 秒內的舊資料，其後需重新驗證
+HOME_CACHE_CONTROL = 'private, max-age=1, must-revalidate'
+# 不含動態內容的靜態頁面
+STATIC_PAGE_MAX_AGE = 3600
+
+# 靜態頁面渲染結果快取：模板名稱 -> (HTML, ETag)
+_STATIC_CACHE = {}
+
+
+def _status_etag(uart_status):
+    """依首頁狀態資料計算 ETag，內容未變時可直接回應 304 而不重新渲染模板"""
+    payload = current_app.json.dumps(uart_status, sort_keys=True, default=str)
+    return hashlib.blake2b(payload.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def _static_page(template_name):
+    """
+    回應不帶參數的靜態頁面
+
+    首次渲染後快取 HTML 與 ETag，之後的請求不再經過 Jinja；
+    開啟模板自動重新載入（開發模式）時每次都重新渲染。
+    """
+    cached = _STATIC_CACHE.get(template_name)
+    if cached is None:
+        html = render_template(template_name)
+        cached = (html, hashlib.blake2b(html.encode('utf-8'), digest_size=16).hexdigest())
+        if not current_app.templates_auto_reload:
+            _STATIC_CACHE[template_name] = cached
+    
+    html, etag = cached
+    response = make_response(html)
+    response.set_etag(etag)
+    response.cache_control.public = True
+    response.cache_control.max_age = STATIC_PAGE_MAX_AGE
+    return response.make_conditional(request)
+
+
+def clear_static_page_cache():
+    """清除靜態頁面快取（模板更新後呼叫）"""
+    _STATIC_CACHE.clear()
+
 
 @integrated_home_bp.route('/')
 def home():
     """主頁面"""
     logging.info(f'訪問首頁, remote_addr={request.remote_addr}')
     
-    # 這裡需要從外部傳入 uart_reader 實例
-    from uart_integrated import uart_reader
-    
     # 獲取UART資料
-    uart_data = uart_reader.get_latest_data()
     com_port = uart_reader.get_uart_config()[0]
     uart_status = {
         'is_running': uart_reader.is_running,
         'data_count': uart_reader.get_data_count(),
-        'latest_data': list(reversed(uart_data[-10:])) if uart_data else [],  # 只顯示最新10筆，最新在最上方
+        'latest_data': uart_reader.get_tail(10)[::-1],  # 只顯示最新10筆，最新在最上方
         'com_port': com_port
     }
     
-    response = render_template('home.html', uart_status=uart_status)
+    # 狀態未變時直接回應 304，省去模板渲染
+    etag = _status_etag(uart_status)
+    if etag in request.if_none_match:
+        response = make_response('', 304)
+    else:
+        response = make_response(render_template('home.html', uart_status=uart_status))
     
-    # 設定防止快取的 HTTP 標頭
-    response = make_response(response)
-    response.headers['Cache-Control'] = 'no-cache, no-store, must-revalidate'
-    response.headers['Pragma'] = 'no-cache'
-    response.headers['Expires'] = '0'
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = HOME_CACHE_CONTROL
     
     return response
 
@@ -38,34 +88,32 @@ def home():
 @integrated_home_bp.route('/test-mac-id')
 def test_mac_id():
     """MAC ID 測試頁面"""
-    return render_template('mac_id_test.html')
+    return _static_page('mac_id_test.html')
 
 
 @integrated_home_bp.route('/config-summary')
 def config_summary():
     """配置摘要頁面"""
     logging.info(f'訪問配置摘要頁面, remote_addr={request.remote_addr}')
-    return render_template('config_summary.html')
+    return _static_page('config_summary.html')
 
 
 @integrated_home_bp.route('/11')
 def page_11():
     """11 頁面"""
-    return render_template('11.html')
+    return _static_page('11.html')
 
 
 @integrated_home_bp.route('/application/<protocol>')
 def application_page(protocol):
     """應用程式頁面"""
     # 檢查協議是否支持
-    supported_protocols = ['FTP', 'SFTP', 'Samba', 'TCP', 'UDP', 'MQTT']
-    if protocol.upper() not in supported_protocols:
+    if protocol.upper() not in SUPPORTED_PROTOCOLS:
         return render_template('error.html', 
                              error_message=f'不支援的協議: {protocol}'), 404
     
     # 動態載入協議配置模組
     try:
-        from multi_protocol_manager import multi_protocol_manager
         protocol_config = multi_protocol_manager.get_protocol_config(protocol.upper())
         
         return render_template('application.html', 
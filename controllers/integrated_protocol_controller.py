@@ -1,42 +1,118 @@
 # controllers/integrated_protocol_controller.py
-from flask import Blueprint, render_template, request, jsonify, redirect, url_for, flash
+from flask import Blueprint, render_template, request, jsonify, redirect, url_for, flash, make_response
+import ftplib
 import logging
+import os
+import threading
+import time
+
+from config.config_manager import get_config_generation, get_config_manager
+from ftp_pool import ftp_pool
+from models.dashboard_data_sender_model import reset_dashboard_sender
+from uart_integrated import protocol_manager
+from utils.cache_utils import TTLCache
+
+# 配置管理器只在匯入時取得一次，各路由共用
+config_manager = get_config_manager()
 
 # 創建 Blueprint
 integrated_protocol_bp = Blueprint('integrated_protocol', __name__)
 
+# FTP 連接測試的連線/讀取逾時秒數
+FTP_TEST_TIMEOUT = 10
+
+# 同一 (主機, 埠, 使用者) 的連接測試依序執行：後到的請求等前一個測試歸還連線後
+# 直接重用池中已登入的連線，不會為同時按下的測試各自開新連線。
+# 鎖的數量固定，依鍵值雜湊分配，不會隨用戶端送來的帳號無限增加
+FTP_TEST_LOCK_STRIPES = 16
+_ftp_test_locks = tuple(threading.Lock() for _ in range(FTP_TEST_LOCK_STRIPES))
+
+# FTP 連接測試回傳的目錄列表樣本行數
+FTP_LIST_SAMPLE_SIZE = 50
+
+# 設定頁面的 ETag 以配置世代區分版本；世代在行程重啟後歸零，
+# 因此再加上行程識別，避免重啟前後相同世代號碼被誤判為同一版本
+_PAGE_ETAG_PREFIX = f'{os.getpid():x}{int(time.time()):x}'
+
+# 協定設定組合 (設定, 欄位資訊, 描述) 的快取秒數
+PROTOCOL_BUNDLE_TTL = 5
+
+# 以 (協定, 配置世代) 為鍵：配置儲存後世代遞增，舊項目自然失效
+_protocol_bundle_cache = TTLCache(PROTOCOL_BUNDLE_TTL, maxsize=32)
+
+
+def _get_bundle(config_manager, protocol):
+    """
+    取得協定的 (設定, 欄位資訊, 描述)，回傳的字典為共用快取，呼叫端不可修改
+    """
+    return _protocol_bundle_cache.get_or_set(
+        (protocol, get_config_generation()),
+        lambda: (config_manager.get_protocol_config(protocol),
+                 config_manager.get_protocol_field_info(protocol),
+                 config_manager.get_protocol_description(protocol)))
+
+
+def _count_listing(ftp):
+    """
+    以串流方式讀取 LIST 結果
+
+    Returns:
+        tuple: (項目總數, 前 FTP_LIST_SAMPLE_SIZE 行)
+    """
+    count = 0
+    sample = []
+
+    def on_line(line):
+        nonlocal count
+        count += 1
+        if len(sample) < FTP_LIST_SAMPLE_SIZE:
+            sample.append(line)
+
+    ftp.retrlines('LIST', on_line)
+    return count, sample
+
+
+def _ftp_test_lock(host, port, username):
+    """取得指定 FTP 帳號對應的測試鎖（不同帳號可能共用同一把鎖）"""
+    return _ftp_test_locks[hash((host, int(port), username)) % FTP_TEST_LOCK_STRIPES]
+
 
 @integrated_protocol_bp.route('/protocol-config/<protocol>')
 def protocol_config(protocol):
     """特定協定的設定頁面"""
     logging.info(f'訪問協定設定頁面: {protocol}, remote_addr={request.remote_addr}')
     
-    from config_manager import config_manager
-    
     if not config_manager.validate_protocol(protocol):
         flash('不支援的協定', 'error')
         return redirect(url_for('integrated_home.home'))
     
-    # 獲取當前設定
-    current_config = config_manager.get_protocol_config(protocol)
-    field_info = config_manager.get_protocol_field_info(protocol)
-    description = config_manager.get_protocol_description(protocol)
+    # 配置未變更時直接回應 304，省去模板渲染
+    etag = f'{protocol}-{_PAGE_ETAG_PREFIX}-{get_config_generation()}'
+    if request.if_none_match.contains_weak(etag):
+        response = make_response('', 304)
+    else:
+        # 獲取當前設定
+        current_config, field_info, description = _get_bundle(config_manager, protocol)
+        
+        response = make_response(render_template('protocol_config.html',
+                                                 protocol=protocol,
+                                                 current_config=current_config,
+                                                 field_info=field_info,
+                                                 description=description))
     
-    return render_template('protocol_config.html',
-                         protocol=protocol,
-                         current_config=current_config,
-                         field_info=field_info,
-                         description=description)
+    response.set_etag(etag, weak=True)
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response
 
 
 @integrated_protocol_bp.route('/save-protocol-config/<protocol>', methods=['POST'])
 def save_protocol_config(protocol):
     """儲存協定設定"""
-    logging.info(f'儲存協定設定: {protocol}, 表單資料: {request.form.to_dict()}, remote_addr={request.remote_addr}')
-    print('收到儲存請求:', protocol)
-    print('表單資料:', request.form.to_dict())
-    
-    from config_manager import config_manager
+    logging.info(f'儲存協定設定: {protocol}, remote_addr={request.remote_addr}')
+    # 表單內容只在除錯層級輸出，平時不必額外複製一份字典
+    if logging.getLogger().isEnabledFor(logging.DEBUG):
+        logging.debug(f'表單資料: {request.form.to_dict()}')
     
     if not config_manager.validate_protocol(protocol):
         return jsonify({'success': False, 'message': '不支援的協定'})
@@ -45,35 +121,8 @@ def save_protocol_config(protocol):
         # 檢查是否為離線模式
         offline_mode = config_manager.get('offline_mode', False)
         
-        # 獲取表單資料
-        form_data = request.form.to_dict()
-        
-        # 處理數值型欄位
-        field_info = config_manager.get_protocol_field_info(protocol)
-        processed_config = {}
-        
-        for field, value in form_data.items():
-            if field in field_info:
-                field_config = field_info[field]
-                
-                # 根據欄位類型處理值
-                if field_config['type'] == 'number':
-                    if value:
-                        try:
-                            # 先嘗試轉換為浮點數，如果是整數則轉為int
-                            float_val = float(value)
-                            if float_val.is_integer():
-                                processed_config[field] = int(float_val)
-                            else:
-                                processed_config[field] = float_val
-                        except ValueError:
-                            processed_config[field] = field_config.get('default', 0)
-                    else:
-                        processed_config[field] = field_config.get('default', 0)
-                elif field_config['type'] == 'checkbox':
-                    processed_config[field] = field in form_data
-                else:
-                    processed_config[field] = value
+        # 依欄位類型轉換表單值（直接走訪 request.form，每個欄位取第一個值）
+        processed_config = config_manager.get_form_processor(protocol)(request.form)
         
         # 在離線模式下跳過網路相關的驗證
         if not offline_mode:
@@ -89,6 +138,8 @@ def save_protocol_config(protocol):
         # 儲存設定
         if config_manager.update_protocol_config(protocol, processed_config):
             config_manager.load_config()
+            _protocol_bundle_cache.invalidate()
+            reset_dashboard_sender()
             
             # 自動將此協定設為啟用協定
             if config_manager.set_active_protocol(protocol):
@@ -101,7 +152,6 @@ def save_protocol_config(protocol):
             
             # 自動啟動已設定的協定（不僅限於MQTT）
             try:
-                from uart_integrated import protocol_manager
                 protocol_manager.start(protocol)
                 logging.info(f"自動啟動協定: {protocol}")
             except Exception as e:
@@ -131,8 +181,6 @@ def test_ftp_connection(protocol):
     """測試 FTP 連接"""
     logging.info(f'測試 FTP 連接: {protocol}, remote_addr={request.remote_addr}')
     
-    from config_manager import config_manager
-    
     if protocol.upper() != 'FTP':
         return jsonify({'success': False, 'message': '此功能僅支援 FTP 協定'})
     
@@ -156,24 +204,25 @@ def test_ftp_connection(protocol):
             })
         
         # 執行 FTP 連接測試
-        import ftplib
-        from io import StringIO
-        import contextlib
-        
-        # 捕獲連接過程中的輸出
-        connection_log = StringIO()
+        test_lock = _ftp_test_lock(host, port, username)
+        if not test_lock.acquire(timeout=FTP_TEST_TIMEOUT):
+            return jsonify({
+                'success': False,
+                'message': '同一 FTP 帳號的連接測試仍在進行中，請稍後再試'
+            })
         
         try:
-            with contextlib.redirect_stdout(connection_log):
-                ftp = ftplib.FTP()
-                ftp.connect(host, int(port), timeout=10)
-                ftp.login(username, password)
-                
-                # 測試目錄列表
-                file_list = []
-                ftp.retrlines('LIST', file_list.append)
-                
-                ftp.quit()
+            # 借用連線池中的連線 (被動模式)；控制與資料連線皆限時，避免 LIST 卡住工作執行緒
+            with ftp_pool.borrow(host, port, username, password,
+                                 timeout=FTP_TEST_TIMEOUT) as ftp:
+                # 記錄本次測試的控制連線收發內容
+                transcript = [f'< {ftp.welcome}'] if ftp.welcome else []
+                ftp.transcript = transcript
+                try:
+                    # 測試目錄列表：只計數並保留前幾行，大目錄也不會佔用大量記憶體
+                    file_count, sample = _count_listing(ftp)
+                finally:
+                    ftp.transcript = None
             
             return jsonify({
                 'success': True,
@@ -182,8 +231,9 @@ def test_ftp_connection(protocol):
                     'host': host,
                     'port': port,
                     'username': username,
-                    'file_count': len(file_list),
-                    'connection_info': connection_log.getvalue()
+                    'file_count': file_count,
+                    'sample': sample,
+                    'connection_info': '\n'.join(transcript)
                 }
             })
             
@@ -202,6 +252,8 @@ def test_ftp_connection(protocol):
                 'success': False,
                 'message': f'FTP 連接失敗: {str(e)}'
             })
+        finally:
+            test_lock.release()
             
     except Exception as e:
         logging.error(f"FTP 連接測試失敗: {e}")
@@ -215,8 +267,6 @@ def test_ftp_connection(protocol):
 def api_protocols():
     """API: 獲取支援的協定清單"""
     try:
-        from config_manager import config_manager
-        
         protocols = config_manager.get_supported_protocols()
         active_protocol = config_manager.get_active_protocol()
         
@@ -237,17 +287,13 @@ def api_protocols():
 def api_protocol_config(protocol):
     """API: 獲取特定協定的設定"""
     try:
-        from config_manager import config_manager
-        
         if not config_manager.validate_protocol(protocol):
             return jsonify({
                 'success': False,
                 'message': '不支援的協定'
             }), 400
         
-        config = config_manager.get_protocol_config(protocol)
-        field_info = config_manager.get_protocol_field_info(protocol)
-        description = config_manager.get_protocol_description(protocol)
+        config, field_info, description = _get_bundle(config_manager, protocol)
         
         return jsonify({
             'success': True,
@@ -268,8 +314,7 @@ def api_protocol_config(protocol):
 def api_config():
     """API: 獲取完整設定"""
     try:
-        from config_manager import config_manager
-        config = config_manager.get_all_config()
+        config = config_manager.get_all()
         
         return jsonify({
             'success': True,
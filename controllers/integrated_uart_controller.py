@@ -1,16 +1,113 @@
 # controllers/integrated_uart_controller.py
 from flask import Blueprint, request, jsonify
 import logging
+from operator import itemgetter
+
+from config.config_manager import get_config_manager
+from models.dashboard_data_sender_model import get_dashboard_sender
+from network_utils import network_checker
+from uart_integrated import uart_reader, entry_ts_us, INVALID_MAC_SENTINELS
+
+try:
+    from multi_protocol_manager import offline_mode_manager
+except ImportError:
+    offline_mode_manager = None
+
+# 配置管理器只在匯入時取得一次，各路由共用
+config_manager = get_config_manager()
 
 # 創建 Blueprint
 integrated_uart_bp = Blueprint('integrated_uart', __name__)
 
+# 所有 MAC ID 通道摘要的快取：(資料版本號, 摘要列表)，資料未變動時直接重用
+_mac_summary_cache = (None, None)
+
+
+def _parse_ch(value):
+    """解析頻道編號，僅接受 0-6 的整數或數字字串，其餘回傳 None"""
+    if isinstance(value, int):
+        return value if 0 <= value <= 6 else None
+    if isinstance(value, str) and value.isdecimal():
+        channel_num = int(value)
+        return channel_num if channel_num <= 6 else None
+    return None
+
+
+def _build_mac_summary(data):
+    """彙整每個 MAC ID 的有效頻道（0-6）、最新時間戳與筆數"""
+    mac_summary = {}
+    for entry in data:
+        mac = entry.get('mac_id')
+        if mac and mac not in INVALID_MAC_SENTINELS:
+            if mac not in mac_summary:
+                mac_summary[mac] = {
+                    'mac_id': mac,
+                    'channels': set(),
+                    'latest_timestamp': '',
+                    'latest_us': -1,
+                    'total_records': 0
+                }
+            
+            # 只統計有效範圍內（0-6）的頻道
+            channel_num = _parse_ch(entry.get('channel'))
+            if channel_num is None:
+                continue
+            mac_summary[mac]['channels'].add(channel_num)
+            mac_summary[mac]['total_records'] += 1
+            
+            # 更新最新時間戳（以整數微秒比較）
+            ts_us = entry_ts_us(entry)
+            if ts_us is not None and ts_us > mac_summary[mac]['latest_us']:
+                mac_summary[mac]['latest_us'] = ts_us
+                mac_summary[mac]['latest_timestamp'] = entry.get('timestamp', '')
+    
+    # 轉換為列表格式
+    result = []
+    for mac, info in mac_summary.items():
+        result.append({
+            'mac_id': mac,
+            'channels': sorted(list(info['channels'])),
+            'channel_count': len(info['channels']),
+            'latest_timestamp': info['latest_timestamp'],
+            'total_records': info['total_records']
+        })
+    
+    # 按 MAC ID 排序
+    result.sort(key=lambda x: x['mac_id'])
+    return result
+
+
+def _ensure_offline_if_no_net():
+    """
+    沒有網路時自動啟用離線模式
+
+    已是離線模式或沒有離線模式管理器時不做網路檢查；網路檢查失敗視同無網路。
+
+    Returns:
+        bool: 目前是否為離線模式
+    """
+    offline_mode = config_manager.get('offline_mode', False)
+    if offline_mode or offline_mode_manager is None:
+        return offline_mode
+    
+    try:
+        internet_available = network_checker.get_network_status()['internet_available']
+    except Exception as network_error:
+        logging.warning(f"網路檢查失敗，繼續以離線模式運行: {network_error}")
+        internet_available = False
+    
+    if internet_available:
+        return False
+    
+    logging.info("偵測到無網路連接，自動啟用離線模式")
+    offline_mode_manager.enable_offline_mode()
+    return True
+
 
 @integrated_uart_bp.route('/api/uart/test', methods=['POST'])
 def test_uart_connection():
     """API: 測試UART連接"""
     try:
-        from uart_integrated import uart_reader
         success, message = uart_reader.test_uart_connection()
         return jsonify({'success': success, 'message': message})
     except Exception as e:
@@ -21,7 +118,6 @@ def test_uart_connection():
 def list_uart_ports():
     """API: 列出可用的串口"""
     try:
-        from uart_integrated import uart_reader
         ports = uart_reader.list_available_ports()
         return jsonify({'success': True, 'ports': ports})
     except Exception as e:
@@ -34,19 +130,7 @@ def start_uart():
     logging.info(f'API: 開始UART讀取, remote_addr={request.remote_addr}')
     
     try:
-        from uart_integrated import uart_reader
-        from config_manager import config_manager
-        from network_utils import network_checker
-        from models.dashboard_data_sender_model import DashboardDataSenderModel
-        
-        # 初始化相關管理器
-        try:
-            from multi_protocol_manager import offline_mode_manager
-        except ImportError:
-            offline_mode_manager = None
-        
-        dashboard_sender_model = DashboardDataSenderModel()
-        dashboard_sender = dashboard_sender_model.get_sender()
+        dashboard_sender = get_dashboard_sender()
         
         if uart_reader.is_running:
             return jsonify({'success': True, 'message': 'UART已在運行'})
@@ -66,19 +150,7 @@ def start_uart():
             })
         
         # 檢查網路狀態並自動設定離線模式
-        try:
-            network_status = network_checker.get_network_status()
-            if not network_status['internet_available'] and offline_mode_manager:
-                if not config_manager.get('offline_mode', False):
-                    logging.info("偵測到無網路連接，自動啟用離線模式")
-                    offline_mode_manager.enable_offline_mode()
-        except Exception as network_error:
-            logging.warning(f"網路檢查失敗，繼續以離線模式運行: {network_error}")
-            if offline_mode_manager:
-                offline_mode_manager.enable_offline_mode()
-        
-        # 檢查是否為離線模式
-        offline_mode = config_manager.get('offline_mode', False)
+        offline_mode = _ensure_offline_if_no_net()
         if offline_mode:
             logging.info("離線模式：UART讀取將在離線模式下啟動")
         
@@ -128,11 +200,7 @@ def stop_uart():
     logging.info(f'API: 停止UART讀取, remote_addr={request.remote_addr}')
     
     try:
-        from uart_integrated import uart_reader
-        from models.dashboard_data_sender_model import DashboardDataSenderModel
-        
-        dashboard_sender_model = DashboardDataSenderModel()
-        dashboard_sender = dashboard_sender_model.get_sender()
+        dashboard_sender = get_dashboard_sender()
         
         uart_reader.stop_reading()
         
@@ -154,13 +222,11 @@ def stop_uart():
 def uart_status():
     """API: 獲取UART狀態"""
     try:
-        from uart_integrated import uart_reader
-        data = uart_reader.get_latest_data()
         return jsonify({
             'success': True,
             'is_running': uart_reader.is_running,
             'data_count': uart_reader.get_data_count(),
-            'latest_data': data[-20:] if data else []  # 返回最新20筆資料
+            'latest_data': uart_reader.get_tail(20)  # 返回最新20筆資料
         })
     except Exception as e:
         return jsonify({'success': False, 'message': f'獲取UART狀態時發生錯誤: {str(e)}'})
@@ -170,7 +236,6 @@ def uart_status():
 def clear_uart_data():
     """API: 清除UART資料"""
     try:
-        from uart_integrated import uart_reader
         uart_reader.clear_data()
         return jsonify({'success': True, 'message': 'UART資料已清除'})
     except Exception as e:
@@ -183,21 +248,20 @@ def get_uart_mac_ids():
     try:
         logging.info(f'API請求: /api/uart/mac-ids from {request.remote_addr}')
         
-        from uart_integrated import uart_reader
-        
-        data = uart_reader.get_latest_data()
-        logging.info(f'UART數據總數: {len(data) if data else 0}')
+        # 只需筆數與 MAC ID 索引，不複製整份資料
+        data_count = uart_reader.get_data_count()
+        logging.info(f'UART數據總數: {data_count}')
         data_source = 'UART即時數據'
         
-        # 修正：如果即時數據為空或MAC ID數量少於預期，強制載入歷史數據
-        if not data or len(set(entry.get('mac_id') for entry in data if entry.get('mac_id') and entry.get('mac_id') not in ['N/A', '', None])) < 1:
+        # 修正：如果即時數據為空或沒有任何有效MAC ID，強制載入歷史數據
+        if not data_count or not uart_reader.has_any_valid_mac_id():
             logging.info('即時數據不足，嘗試從歷史文件載入MAC ID')
             uart_reader.load_historical_data(days_back=90)  # 載入最近90天的數據
-            data = uart_reader.get_latest_data()
+            data_count = uart_reader.get_data_count()
             data_source = '歷史文件增強載入'
-            logging.info(f'從歷史文件增強載入數據: {len(data) if data else 0} 筆')
+            logging.info(f'從歷史文件增強載入數據: {data_count} 筆')
             
-        if not data:
+        if not data_count:
             logging.warning('沒有可用的UART數據')
             return jsonify({
                 'success': True, 
@@ -206,20 +270,8 @@ def get_uart_mac_ids():
                 'message': '暫無UART數據，請先啟動UART讀取或檢查歷史數據'
             })
         
-        # 從UART數據中提取所有的MAC ID
-        mac_ids = []
-        valid_mac_count = 0
-        
-        for entry in data:
-            mac_id = entry.get('mac_id')
-            if mac_id and mac_id not in ['N/A', '', None]:
-                valid_mac_count += 1
-                mac_ids.append(mac_id)
-        
-        # 去重複並排序
-        unique_mac_ids = sorted(list(set(mac_ids)))
-        
-        logging.info(f'MAC ID 處理結果: 總數據{len(data)}, 有效MAC數據{valid_mac_count}, 唯一MAC ID數{len(unique_mac_ids)}')
+        unique_mac_ids, valid_mac_count = uart_reader.get_mac_id_index()
+        logging.info(f'MAC ID 處理結果: 總數據{data_count}, 有效MAC數據{valid_mac_count}, 唯一MAC ID數{len(unique_mac_ids)}')
         if unique_mac_ids:
             logging.info(f'找到的 MAC IDs: {unique_mac_ids}')
 
@@ -227,7 +279,7 @@ def get_uart_mac_ids():
             'success': True,
             'mac_ids': unique_mac_ids,
             'data_source': data_source,
-            'total_entries': len(data),
+            'total_entries': data_count,
             'valid_mac_entries': valid_mac_count,
             'unique_mac_count': len(unique_mac_ids)
         })
@@ -244,15 +296,14 @@ def get_uart_mac_ids():
 @integrated_uart_bp.route('/api/uart/mac-channels/<mac_id>', methods=['GET'])
 def get_uart_mac_channels(mac_id=None):
     """API: 獲取指定 MAC ID 的通道資訊"""
+    global _mac_summary_cache
     try:
         logging.info(f'API請求: /api/uart/mac-channels/{mac_id or "all"} from {request.remote_addr}')
         
-        from uart_integrated import uart_reader
-        
-        # 獲取最新數據
-        data = uart_reader.get_latest_data()
+        # 先取版本號再取資料，確保快取內容不會比標記的版本舊
+        data_version = uart_reader.get_data_version()
         
-        if not data:
+        if not uart_reader.get_data_count():
             logging.warning('沒有可用的UART數據')
             return jsonify({
                 'success': True,
@@ -262,36 +313,37 @@ def get_uart_mac_channels(mac_id=None):
         
         if mac_id:
             # 獲取指定 MAC ID 的通道資訊
+            data = uart_reader.get_latest_data()
             mac_channels = []
             valid_channels = set()  # 用於收集有效頻道（0-6）
             
+            add_channel = valid_channels.add
+            append_row = mac_channels.append
+            
+            # 單次走訪完成篩選、頻道驗證與資料列建立
             for entry in data:
-                if entry.get('mac_id') == mac_id:
-                    channel = entry.get('channel', 'N/A')
-                    
-                    # 檢查頻道是否在有效範圍內（0-6）
-                    try:
-                        channel_num = int(channel)
-                        if 0 <= channel_num <= 6:
-                            valid_channels.add(channel_num)
-                            
-                            channel_info = {
-                                'timestamp': entry.get('timestamp', ''),
-                                'channel': channel_num,
-                                'current': entry.get('current', 0),
-                                'temperature': entry.get('temperature', 0),
-                                'power': entry.get('power', 0),
-                                'voltage': entry.get('voltage', 0),
-                                'frequency': entry.get('frequency', 0),
-                                'power_factor': entry.get('power_factor', 0)
-                            }
-                            mac_channels.append(channel_info)
-                    except (ValueError, TypeError):
-                        # 忽略無效的頻道值
-                        continue
+                get = entry.get
+                if get('mac_id') != mac_id:
+                    continue
+                # 忽略有效範圍（0-6）以外的頻道
+                channel_num = _parse_ch(get('channel'))
+                if channel_num is None:
+                    continue
+                add_channel(channel_num)
+                
+                append_row({
+                    'timestamp': get('timestamp', ''),
+                    'channel': channel_num,
+                    'current': get('current', 0),
+                    'temperature': get('temperature', 0),
+                    'power': get('power', 0),
+                    'voltage': get('voltage', 0),
+                    'frequency': get('frequency', 0),
+                    'power_factor': get('power_factor', 0)
+                })
             
-            # 按時間戳排序（最新的在前）
-            mac_channels.sort(key=lambda x: x.get('timestamp', ''), reverse=True)
+            # 按時間戳排序（最新的在前）；資料本身依時間遞增，排序接近線性
+            mac_channels.sort(key=itemgetter('timestamp'), reverse=True)
             
             # 轉換有效頻道為排序列表
             valid_channels_list = sorted(list(valid_channels))
@@ -305,48 +357,11 @@ def get_uart_mac_channels(mac_id=None):
                 'data_source': 'UART實時數據' if mac_channels else '無有效數據'
             })
         else:
-            # 獲取所有 MAC ID 的通道摘要
-            mac_summary = {}
-            for entry in data:
-                mac = entry.get('mac_id')
-                if mac and mac not in ['N/A', '', None]:
-                    if mac not in mac_summary:
-                        mac_summary[mac] = {
-                            'mac_id': mac,
-                            'channels': set(),
-                            'latest_timestamp': '',
-                            'total_records': 0
-                        }
-                    
-                    # 檢查頻道是否在有效範圍內（0-6）
-                    channel = entry.get('channel', 'N/A')
-                    try:
-                        channel_num = int(channel)
-                        if 0 <= channel_num <= 6:
-                            mac_summary[mac]['channels'].add(channel_num)
-                            mac_summary[mac]['total_records'] += 1
-                            
-                            # 更新最新時間戳
-                            timestamp = entry.get('timestamp', '')
-                            if timestamp > mac_summary[mac]['latest_timestamp']:
-                                mac_summary[mac]['latest_timestamp'] = timestamp
-                    except (ValueError, TypeError):
-                        # 忽略無效的頻道值
-                        continue
-            
-            # 轉換為列表格式
-            result = []
-            for mac, info in mac_summary.items():
-                result.append({
-                    'mac_id': mac,
-                    'channels': sorted(list(info['channels'])),
-                    'channel_count': len(info['channels']),
-                    'latest_timestamp': info['latest_timestamp'],
-                    'total_records': info['total_records']
-                })
-            
-            # 按 MAC ID 排序
-            result.sort(key=lambda x: x['mac_id'])
+            # 獲取所有 MAC ID 的通道摘要（資料未變動時重用上次結果，不必複製資料）
+            cached_version, result = _mac_summary_cache
+            if cached_version != data_version or result is None:
+                result = _build_mac_summary(uart_reader.get_latest_data())
+                _mac_summary_cache = (data_version, result)
             
             return jsonify({
                 'success': True,
@@ -1,10 +1,41 @@
 # controllers/integrated_wifi_controller.py
 from flask import Blueprint, render_template, request, jsonify
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+from utils.cache_utils import TTLCache
 
 # 創建 Blueprint
 integrated_wifi_bp = Blueprint('integrated_wifi', __name__)
 
+# WiFi 操作（nmcli/netsh 子程序）一律交給單一背景執行緒依序執行，
+# 請求執行緒最多只等待下列秒數，逾時回傳 504，不會被卡住的子程序長時間佔用
+WIFI_SCAN_TIMEOUT = 20
+WIFI_CONNECT_TIMEOUT = 45
+
+# 掃描結果保留秒數：吸收前端自動重新整理造成的連續掃描；POST ?force=1 可略過
+WIFI_SCAN_CACHE_TTL = 10
+
+_wifi_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='wifi-io')
+_scan_cache = TTLCache(WIFI_SCAN_CACHE_TTL, maxsize=1)
+_scan_lock = threading.Lock()
+_scan_future = None
+
+
+def _submit_scan():
+    """
+    提交 WiFi 掃描；已有掃描進行中時直接共用同一個 Future
+
+    多個分頁同時按下掃描時只會執行一次 scan_networks()。
+    """
+    global _scan_future
+    with _scan_lock:
+        if _scan_future is None or _scan_future.done():
+            from wifi_manager import wifi_manager
+            _scan_future = _wifi_executor.submit(wifi_manager.scan_networks)
+        return _scan_future
+
 
 @integrated_wifi_bp.route('/wifi')
 def wifi_setting():
@@ -17,8 +48,18 @@ def wifi_setting():
 def api_wifi_scan():
     """API: 掃描 WiFi 網路"""
     try:
-        from wifi_manager import wifi_manager
-        networks = wifi_manager.scan_networks()
+        force = request.method == 'POST' and request.args.get('force') == '1'
+        if not force:
+            networks = _scan_cache.get('networks')
+            if networks is not None:
+                return jsonify({
+                    'success': True,
+                    'networks': networks,
+                    'cached': True
+                })
+        
+        networks = _submit_scan().result(timeout=WIFI_SCAN_TIMEOUT)
+        _scan_cache.set('networks', networks)
         
         logging.info(f"掃描到 {len(networks)} 個 WiFi 網路")
         
@@ -26,6 +67,12 @@ def api_wifi_scan():
             'success': True,
             'networks': networks
         })
+    except FutureTimeoutError:
+        logging.warning(f"WiFi 掃描超過 {WIFI_SCAN_TIMEOUT} 秒仍未完成")
+        return jsonify({
+            'success': False,
+            'error': 'WiFi 掃描逾時，請稍後再試'
+        }), 504
     except Exception as e:
         logging.error(f"WiFi 掃描失敗: {e}")
         return jsonify({
@@ -49,9 +96,19 @@ def api_wifi_connect():
             }), 400
         
         from wifi_manager import wifi_manager
-        success, message = wifi_manager.connect_to_network(ssid, password)
+        future = _wifi_executor.submit(wifi_manager.connect_to_network, ssid, password)
+        try:
+            success, message = future.result(timeout=WIFI_CONNECT_TIMEOUT)
+        except FutureTimeoutError:
+            logging.warning(f"連接 WiFi {ssid} 超過 {WIFI_CONNECT_TIMEOUT} 秒仍未完成")
+            return jsonify({
+                'success': False,
+                'error': 'WiFi 連接逾時，連線可能仍在背景進行中'
+            }), 504
         
         if success:
+            # 連線狀態已改變，下次掃描重新取得
+            _scan_cache.invalidate()
             logging.info(f"成功連接到 WiFi: {ssid}")
             return jsonify({
                 'success': True,
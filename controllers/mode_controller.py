@@ -5,67 +5,184 @@
 
 from flask import Blueprint, request, jsonify
 import logging
+import sys
 from datetime import datetime
 
+from views.api_responses import TEMPLATE_SLOT, json_bytes_response, json_template, prebuilt_json
+
 # 創建 Blueprint
 mode_bp = Blueprint('mode', __name__)
+logger = logging.getLogger(__name__)
 
 # 系統模式狀態
 current_mode = {'mode': 'idle', 'last_change': datetime.now().isoformat()}
 
+# 以下為固定內容，於匯入時建立一次，各請求直接引用
+
+# 有效模式（集合比對）與無效模式錯誤訊息的固定後半段
+_VALID_MODES = frozenset(('idle', 'monitor', 'active', 'maintenance'))
+_VALID_MODES_SUFFIX = '，有效模式: ' + str(['idle', 'monitor', 'active', 'maintenance'])
+
+# 可用的系統模式
+_AVAILABLE_MODES = (
+    {
+        'name': 'idle',
+        'description': '待機模式',
+        'power_consumption': 'low'
+    },
+    {
+        'name': 'monitor',
+        'description': '監控模式',
+        'power_consumption': 'medium'
+    },
+    {
+        'name': 'active',
+        'description': '活動模式',
+        'power_consumption': 'high'
+    },
+    {
+        'name': 'maintenance',
+        'description': '維護模式',
+        'power_consumption': 'low'
+    }
+)
+
+# 模式歷史（示範資料）
+_MODE_HISTORY = (
+    {
+        'mode': 'active',
+        'start_time': '2025-09-23T08:00:00',
+        'end_time': '2025-09-23T12:00:00',
+        'duration': '4 hours'
+    },
+    {
+        'mode': 'monitor',
+        'start_time': '2025-09-23T12:00:00',
+        'end_time': '2025-09-23T18:00:00',
+        'duration': '6 hours'
+    }
+)
+
+# 模式切換時的說明與動作
+_MODE_ACTIONS = {
+    'idle': {
+        'description': '系統進入待機狀態',
+        'actions': ('停止數據收集', '降低系統功耗', '保持基本監控')
+    },
+    'monitor': {
+        'description': '系統進入監控狀態',
+        'actions': ('開始數據收集', '啟用即時監控', '設定警報閾值')
+    },
+    'active': {
+        'description': '系統進入活動狀態',
+        'actions': ('全功能運作', '高頻數據收集', '即時分析處理')
+    },
+    'maintenance': {
+        'description': '系統進入維護狀態',
+        'actions': ('暫停正常操作', '啟用診斷模式', '準備維護工具')
+    }
+}
+
+# 各模式的預估功耗
+_POWER_CONSUMPTION_LABELS = {
+    'idle': '低',
+    'monitor': '中等',
+    'active': '高',
+    'maintenance': '低'
+}
+
+# 各模式的服務狀態
+_STATUS_DETAILS = {
+    'idle': {
+        'services_active': ('基本監控', '網路連接'),
+        'services_inactive': ('數據收集', '即時分析', 'UART讀取'),
+        'power_level': 20,
+        'expected_actions': ('等待指令', '保持連接')
+    },
+    'monitor': {
+        'services_active': ('基本監控', '網路連接', '數據收集', 'UART讀取'),
+        'services_inactive': ('高頻分析', '預測分析'),
+        'power_level': 60,
+        'expected_actions': ('收集數據', '監控設備狀態', '記錄日誌')
+    },
+    'active': {
+        'services_active': ('所有服務',),
+        'services_inactive': (),
+        'power_level': 95,
+        'expected_actions': ('全功能運作', '即時分析', '自動決策')
+    },
+    'maintenance': {
+        'services_active': ('基本監控', '診斷工具'),
+        'services_inactive': ('正常數據處理', '自動化操作'),
+        'power_level': 30,
+        'expected_actions': ('系統診斷', '維護檢查', '故障排除')
+    }
+}
+
+# 未知模式的服務狀態
+_EMPTY_STATUS = {
+    'services_active': (),
+    'services_inactive': (),
+    'power_level': 0,
+    'expected_actions': ()
+}
+
+# 系統健康狀態（應該從實際系統獲取）
+_SYSTEM_HEALTH = {
+    'cpu_usage': 25,
+    'memory_usage': 45,
+    'disk_usage': 60,
+    'network_status': 'connected'
+}
+
+# 下一個排程動作
+_NEXT_SCHEDULED_ACTION = {
+    'action': '例行檢查',
+    'scheduled_time': '2025-09-24T02:00:00'
+}
+
+
+# 結構固定的回應模板，請求時只填入目前模式與切換時間
+_GET_MODE_TEMPLATE = json_template({
+    'success': True,
+    'data': {
+        'current_mode': TEMPLATE_SLOT,
+        'last_change': TEMPLATE_SLOT,
+        'available_modes': _AVAILABLE_MODES,
+        'mode_history': _MODE_HISTORY
+    }
+})
+
+
+def _mode_status_template(status):
+    """建立指定服務狀態的 mode-status 回應模板"""
+    return json_template({
+        'success': True,
+        'data': {
+            'current_mode': TEMPLATE_SLOT,
+            'mode_start_time': TEMPLATE_SLOT,
+            'runtime': '計算運行時間',  # 這裡應該計算實際運行時間
+            'status': status,
+            'system_health': _SYSTEM_HEALTH,
+            'next_scheduled_action': _NEXT_SCHEDULED_ACTION
+        }
+    })
+
+
+_MODE_STATUS_TEMPLATES = {mode: _mode_status_template(status)
+                          for mode, status in _STATUS_DETAILS.items()}
+_EMPTY_MODE_STATUS_TEMPLATE = _mode_status_template(_EMPTY_STATUS)
+
 
 @mode_bp.route('/get-mode', methods=['GET'])
 def get_mode():
     """獲取當前系統模式"""
     try:
-        mode_info = {
-            'current_mode': current_mode['mode'],
-            'last_change': current_mode['last_change'],
-            'available_modes': [
-                {
-                    'name': 'idle',
-                    'description': '待機模式',
-                    'power_consumption': 'low'
-                },
-                {
-                    'name': 'monitor',
-                    'description': '監控模式',
-                    'power_consumption': 'medium'
-                },
-                {
-                    'name': 'active',
-                    'description': '活動模式',
-                    'power_consumption': 'high'
-                },
-                {
-                    'name': 'maintenance',
-                    'description': '維護模式',
-                    'power_consumption': 'low'
-                }
-            ],
-            'mode_history': [
-                {
-                    'mode': 'active',
-                    'start_time': '2025-09-23T08:00:00',
-                    'end_time': '2025-09-23T12:00:00',
-                    'duration': '4 hours'
-                },
-                {
-                    'mode': 'monitor',
-                    'start_time': '2025-09-23T12:00:00',
-                    'end_time': '2025-09-23T18:00:00',
-                    'duration': '6 hours'
-                }
-            ]
-        }
-        
-        return jsonify({
-            'success': True,
-            'data': mode_info
-        })
+        return json_bytes_response(_GET_MODE_TEMPLATE % (
+            prebuilt_json(current_mode['mode']), prebuilt_json(current_mode['last_change'])))
         
     except Exception as e:
-        logging.error(f"獲取系統模式時發生錯誤: {e}")
+        logger.error("獲取系統模式時發生錯誤: %s", e)
         return jsonify({
             'success': False,
             'error': str(e)
@@ -76,7 +193,7 @@ def get_mode():
 def set_mode():
     """設定系統模式"""
     try:
-        data = request.get_json()
+        data = request.get_json(silent=True)
         if not data:
             return jsonify({
                 'success': False,
@@ -91,39 +208,22 @@ def set_mode():
             }), 400
         
         # 驗證模式是否有效
-        valid_modes = ['idle', 'monitor', 'active', 'maintenance']
-        if new_mode not in valid_modes:
+        # 非字串（例如 JSON 陣列）無法做集合比對，直接視為無效模式
+        if not isinstance(new_mode, str) or new_mode not in _VALID_MODES:
             return jsonify({
                 'success': False,
-                'error': f'無效的模式: {new_mode}，有效模式: {valid_modes}'
+                'error': f'無效的模式: {new_mode}' + _VALID_MODES_SUFFIX
             }), 400
         
+        # 保存駐留字串，之後各端點以模式為鍵查表時可直接比對指標
+        new_mode = sys.intern(new_mode)
+        
         # 記錄模式切換
         old_mode = current_mode['mode']
         current_mode['mode'] = new_mode
         current_mode['last_change'] = datetime.now().isoformat()
         
-        # 模式切換邏輯
-        mode_actions = {
-            'idle': {
-                'description': '系統進入待機狀態',
-                'actions': ['停止數據收集', '降低系統功耗', '保持基本監控']
-            },
-            'monitor': {
-                'description': '系統進入監控狀態',
-                'actions': ['開始數據收集', '啟用即時監控', '設定警報閾值']
-            },
-            'active': {
-                'description': '系統進入活動狀態',
-                'actions': ['全功能運作', '高頻數據收集', '即時分析處理']
-            },
-            'maintenance': {
-                'description': '系統進入維護狀態',
-                'actions': ['暫停正常操作', '啟用診斷模式', '準備維護工具']
-            }
-        }
-        
-        mode_info = mode_actions.get(new_mode, {})
+        mode_info = _MODE_ACTIONS.get(new_mode, {})
         
         # 這裡可以添加實際的模式切換邏輯
         # 例如啟動/停止特定服務、調整監控頻率等
@@ -135,15 +235,10 @@ def set_mode():
             'description': mode_info.get('description', ''),
             'actions_taken': mode_info.get('actions', []),
             'parameters': data.get('parameters', {}),
-            'estimated_power_consumption': {
-                'idle': '低',
-                'monitor': '中等',
-                'active': '高',
-                'maintenance': '低'
-            }.get(new_mode, '未知')
+            'estimated_power_consumption': _POWER_CONSUMPTION_LABELS.get(new_mode, '未知')
         }
         
-        logging.info(f"系統模式已從 {old_mode} 切換到 {new_mode}")
+        logger.info("系統模式已從 %s 切換到 %s", old_mode, new_mode)
         
         return jsonify({
             'success': True,
@@ -152,7 +247,7 @@ def set_mode():
         })
         
     except Exception as e:
-        logging.error(f"設定系統模式時發生錯誤: {e}")
+        logger.error("設定系統模式時發生錯誤: %s", e)
         return jsonify({
             'success': False,
             'error': str(e)
@@ -165,65 +260,14 @@ def mode_status():
     try:
         mode = current_mode['mode']
         
-        # 根據模式返回狀態資訊
-        status_details = {
-            'idle': {
-                'services_active': ['基本監控', '網路連接'],
-                'services_inactive': ['數據收集', '即時分析', 'UART讀取'],
-                'power_level': 20,
-                'expected_actions': ['等待指令', '保持連接']
-            },
-            'monitor': {
-                'services_active': ['基本監控', '網路連接', '數據收集', 'UART讀取'],
-                'services_inactive': ['高頻分析', '預測分析'],
-                'power_level': 60,
-                'expected_actions': ['收集數據', '監控設備狀態', '記錄日誌']
-            },
-            'active': {
-                'services_active': ['所有服務'],
-                'services_inactive': [],
-                'power_level': 95,
-                'expected_actions': ['全功能運作', '即時分析', '自動決策']
-            },
-            'maintenance': {
-                'services_active': ['基本監控', '診斷工具'],
-                'services_inactive': ['正常數據處理', '自動化操作'],
-                'power_level': 30,
-                'expected_actions': ['系統診斷', '維護檢查', '故障排除']
-            }
-        }
+        # 根據模式選擇對應的回應模板
+        template = _MODE_STATUS_TEMPLATES.get(mode, _EMPTY_MODE_STATUS_TEMPLATE)
         
-        current_status = status_details.get(mode, {
-            'services_active': [],
-            'services_inactive': [],
-            'power_level': 0,
-            'expected_actions': []
-        })
-        
-        result = {
-            'current_mode': mode,
-            'mode_start_time': current_mode['last_change'],
-            'runtime': '計算運行時間',  # 這裡應該計算實際運行時間
-            'status': current_status,
-            'system_health': {
-                'cpu_usage': 25,  # 應該從實際系統獲取
-                'memory_usage': 45,
-                'disk_usage': 60,
-                'network_status': 'connected'
-            },
-            'next_scheduled_action': {
-                'action': '例行檢查',
-                'scheduled_time': '2025-09-24T02:00:00'
-            }
-        }
-        
-        return jsonify({
-            'success': True,
-            'data': result
-        })
+        return json_bytes_response(template % (
+            prebuilt_json(mode), prebuilt_json(current_mode['last_change'])))
         
     except Exception as e:
-        logging.error(f"獲取模式狀態時發生錯誤: {e}")
+        logger.error("獲取模式狀態時發生錯誤: %s", e)
         return jsonify({
             'success': False,
             'error': str(e)
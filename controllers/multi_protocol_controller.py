@@ -5,49 +5,105 @@
 
 from flask import Blueprint, jsonify, request
 import logging
+from functools import partial
+
+from views.api_responses import TEMPLATE_SLOT, json_bytes_response, json_template, prebuilt_json
 
 # 創建 Blueprint
 multi_protocol_bp = Blueprint('multi_protocol', __name__)
+logger = logging.getLogger(__name__)
+
+# 以下為固定內容，於匯入時建立一次，各請求直接引用
+
+# 支援的協定
+_PROTOCOLS = (
+    {
+        'name': 'MQTT',
+        'enabled': True,
+        'status': 'active',
+        'description': 'Message Queuing Telemetry Transport'
+    },
+    {
+        'name': 'HTTP',
+        'enabled': True,
+        'status': 'active',
+        'description': 'HyperText Transfer Protocol'
+    },
+    {
+        'name': 'WebSocket',
+        'enabled': False,
+        'status': 'inactive',
+        'description': 'WebSocket Protocol'
+    },
+    {
+        'name': 'TCP',
+        'enabled': True,
+        'status': 'active',
+        'description': 'Transmission Control Protocol'
+    }
+)
+
+# 協定整體狀態
+_PROTOCOLS_STATUS = {
+    'active_protocols': ('MQTT', 'HTTP', 'TCP'),
+    'inactive_protocols': ('WebSocket',),
+    'total_connections': 3,
+    'error_count': 0
+}
+
+# 可啟用/停用的協定
+_VALID_PROTOCOLS = frozenset(('mqtt', 'http', 'websocket', 'tcp'))
+
+# 完全固定的 GET 回應，匯入時預先序列化
+_LIST_PROTOCOLS_BODY = prebuilt_json({
+    'success': True,
+    'protocols': _PROTOCOLS,
+    'count': len(_PROTOCOLS)
+})
+_PROTOCOLS_STATUS_BODY = prebuilt_json({
+    'success': True,
+    'status': _PROTOCOLS_STATUS
+})
+
+# 啟用/停用動作的顯示名稱，以及回應的預先序列化模板
+_ACTION_LABELS = {'enable': '啟用', 'disable': '停用'}
+_ACTION_OK_TEMPLATE = b'{"success":true,"message":%s,"protocol":%s}'
+_ACTION_FAILED_TEMPLATE = b'{"success":false,"message":%s}'
+
+# 以小寫協定名稱請求時的完整成功回應（動作 × 協定），其他大小寫仍以模板組成
+_ACTION_OK_BODIES = {
+    (action, protocol): _ACTION_OK_TEMPLATE % (
+        prebuilt_json(f'協定 {protocol} 已{label}'), prebuilt_json(protocol))
+    for action, label in _ACTION_LABELS.items()
+    for protocol in _VALID_PROTOCOLS
+}
+
+# 協定預設設定
+_DEFAULT_SETTINGS = {
+    'timeout': 30,
+    'retries': 3,
+    'buffer_size': 1024
+}
+
+# 協定配置回應模板
+_PROTOCOL_CONFIG_TEMPLATE = json_template({
+    'success': True,
+    'config': {
+        'protocol': TEMPLATE_SLOT,
+        'enabled': True,
+        'settings': _DEFAULT_SETTINGS,
+        'endpoints': ()
+    }
+})
 
 @multi_protocol_bp.route('/protocols')
 def list_protocols():
     """列出所有支援的協定"""
     try:
-        protocols = [
-            {
-                'name': 'MQTT',
-                'enabled': True,
-                'status': 'active',
-                'description': 'Message Queuing Telemetry Transport'
-            },
-            {
-                'name': 'HTTP',
-                'enabled': True,
-                'status': 'active',
-                'description': 'HyperText Transfer Protocol'
-            },
-            {
-                'name': 'WebSocket',
-                'enabled': False,
-                'status': 'inactive',
-                'description': 'WebSocket Protocol'
-            },
-            {
-                'name': 'TCP',
-                'enabled': True,
-                'status': 'active',
-                'description': 'Transmission Control Protocol'
-            }
-        ]
-        
-        return jsonify({
-            'success': True,
-            'protocols': protocols,
-            'count': len(protocols)
-        })
+        return json_bytes_response(_LIST_PROTOCOLS_BODY)
         
     except Exception as e:
-        logging.error(f"列出協定失敗: {e}")
+        logger.error("列出協定失敗: %s", e)
         return jsonify({
             'success': False,
             'message': f'列出協定失敗: {str(e)}'
@@ -57,100 +113,51 @@ def list_protocols():
 def protocols_status():
     """獲取所有協定狀態"""
     try:
-        status = {
-            'active_protocols': ['MQTT', 'HTTP', 'TCP'],
-            'inactive_protocols': ['WebSocket'],
-            'total_connections': 3,
-            'error_count': 0
-        }
-        
-        return jsonify({
-            'success': True,
-            'status': status
-        })
+        return json_bytes_response(_PROTOCOLS_STATUS_BODY)
         
     except Exception as e:
-        logging.error(f"獲取協定狀態失敗: {e}")
+        logger.error("獲取協定狀態失敗: %s", e)
         return jsonify({
             'success': False,
             'message': f'獲取協定狀態失敗: {str(e)}'
         }), 500
 
-@multi_protocol_bp.route('/enable/<protocol>', methods=['POST'])
-def enable_protocol(protocol):
-    """啟用指定協定"""
+def _protocol_action(protocol, action):
+    """啟用/停用指定協定（模擬），由 /enable 與 /disable 兩條路由共用"""
+    body = _ACTION_OK_BODIES.get((action, protocol))
+    if body is not None:
+        return json_bytes_response(body)
+    
+    label = _ACTION_LABELS[action]
     try:
-        # 模擬協定啟用
-        valid_protocols = ['mqtt', 'http', 'websocket', 'tcp']
-        
-        if protocol.lower() not in valid_protocols:
-            return jsonify({
-                'success': False,
-                'message': f'不支援的協定: {protocol}'
-            }), 400
+        if protocol.lower() not in _VALID_PROTOCOLS:
+            return json_bytes_response(
+                _ACTION_FAILED_TEMPLATE % prebuilt_json(f'不支援的協定: {protocol}'), 400)
         
-        return jsonify({
-            'success': True,
-            'message': f'協定 {protocol} 已啟用',
-            'protocol': protocol
-        })
+        return json_bytes_response(_ACTION_OK_TEMPLATE % (
+            prebuilt_json(f'協定 {protocol} 已{label}'), prebuilt_json(protocol)))
         
     except Exception as e:
-        logging.error(f"啟用協定失敗: {e}")
+        logger.error("%s協定失敗: %s", label, e)
         return jsonify({
             'success': False,
-            'message': f'啟用協定失敗: {str(e)}'
+            'message': f'{label}協定失敗: {str(e)}'
         }), 500
 
-@multi_protocol_bp.route('/disable/<protocol>', methods=['POST'])
-def disable_protocol(protocol):
-    """停用指定協定"""
-    try:
-        # 模擬協定停用
-        valid_protocols = ['mqtt', 'http', 'websocket', 'tcp']
-        
-        if protocol.lower() not in valid_protocols:
-            return jsonify({
-                'success': False,
-                'message': f'不支援的協定: {protocol}'
-            }), 400
-        
-        return jsonify({
-            'success': True,
-            'message': f'協定 {protocol} 已停用',
-            'protocol': protocol
-        })
-        
-    except Exception as e:
-        logging.error(f"停用協定失敗: {e}")
-        return jsonify({
-            'success': False,
-            'message': f'停用協定失敗: {str(e)}'
-        }), 500
+for _action in _ACTION_LABELS:
+    multi_protocol_bp.add_url_rule(f'/{_action}/<protocol>', endpoint=f'{_action}_protocol',
+                                   view_func=partial(_protocol_action, action=_action),
+                                   methods=['POST'])
 
 @multi_protocol_bp.route('/config/<protocol>')
 def get_protocol_config(protocol):
     """獲取協定配置"""
     try:
-        # 模擬協定配置
-        config = {
-            'protocol': protocol,
-            'enabled': True,
-            'settings': {
-                'timeout': 30,
-                'retries': 3,
-                'buffer_size': 1024
-            },
-            'endpoints': []
-        }
-        
-        return jsonify({
-            'success': True,
-            'config': config
-        })
+        # 模擬協定配置：只需填入協定名稱
+        return json_bytes_response(_PROTOCOL_CONFIG_TEMPLATE % prebuilt_json(protocol))
         
     except Exception as e:
-        logging.error(f"獲取協定配置失敗: {e}")
+        logger.error("獲取協定配置失敗: %s", e)
         return jsonify({
             'success': False,
             'message': f'獲取協定配置失敗: {str(e)}'
@@ -160,7 +167,7 @@ def get_protocol_config(protocol):
 def update_protocol_config(protocol):
     """更新協定配置"""
     try:
-        data = request.get_json()
+        data = request.get_json(silent=True)
         if not data:
             return jsonify({
                 'success': False,
@@ -176,7 +183,7 @@ def update_protocol_config(protocol):
         })
         
     except Exception as e:
-        logging.error(f"更新協定配置失敗: {e}")
+        logger.error("更新協定配置失敗: %s", e)
         return jsonify({
             'success': False,
             'message': f'更新協定配置失敗: {str(e)}'
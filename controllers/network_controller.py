@@ -5,29 +5,115 @@
 
 from flask import Blueprint, request, jsonify
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError, wait
 from models import NetworkModel
+from utils.cache_utils import TTLCache
+from views.api_responses import json_bytes_response, prebuilt_json
 
 # 創建 Blueprint
 network_bp = Blueprint('network', __name__, url_prefix='/api')
+logger = logging.getLogger(__name__)
 
-# 初始化模型
-network_model = NetworkModel()
+# 網路模型於第一次使用時才建立，未處理網路請求的 worker 不需初始化
+_network_model = None
+_network_model_lock = threading.Lock()
+
+
+def _nm():
+    """取得網路模型實例（第一次呼叫時建立）"""
+    global _network_model
+    if _network_model is None:
+        with _network_model_lock:
+            if _network_model is None:
+                _network_model = NetworkModel()
+    return _network_model
+
+# WiFi 掃描與 ping 測試都是子程序 I/O，交給背景執行緒執行；
+# 相同的操作同時只執行一次，其餘請求共用結果，請求執行緒最多等待下列秒數
+WIFI_SCAN_TIMEOUT = 20
+HOST_TEST_WAIT_TIMEOUT = 30
+
+# 批次測試一次最多接受的主機數（與背景執行緒數相同，全部主機可同時 ping）
+HOST_TEST_BATCH_MAX = 8
+
+# ping 逾時秒數的允許範圍，避免單一請求長時間佔用背景執行緒
+PING_TIMEOUT_MIN = 1
+PING_TIMEOUT_MAX = 10
+
+# 掃描結果（已序列化的回應內容）保留秒數，吸收前端輪詢造成的連續掃描
+WIFI_SCAN_CACHE_TTL = 5
+
+_scan_cache = TTLCache(WIFI_SCAN_CACHE_TTL, maxsize=1)
+_probe_executor = ThreadPoolExecutor(max_workers=HOST_TEST_BATCH_MAX,
+                                     thread_name_prefix='network-probe')
+_inflight = {}
+_inflight_lock = threading.Lock()
+
+
+def _submit_shared(key, func, *args):
+    """
+    提交背景操作；相同 key 的操作尚未完成時直接共用同一個 Future
+
+    例如多個分頁同時掃描 WiFi 或 ping 同一台主機時，只會啟動一個子程序。
+    """
+    with _inflight_lock:
+        future = _inflight.get(key)
+        if future is None:
+            future = _inflight[key] = _probe_executor.submit(func, *args)
+            future.add_done_callback(lambda f: _forget(key, f))
+        return future
+
+
+def _forget(key, future):
+    """操作完成後移出進行中清單"""
+    with _inflight_lock:
+        if _inflight.get(key) is future:
+            del _inflight[key]
+
+
+def _ping_timeout(value):
+    """將請求的逾時秒數轉為整數並限制在 PING_TIMEOUT_MIN..PING_TIMEOUT_MAX"""
+    try:
+        timeout = int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f'無效的逾時秒數: {value}')
+    return min(max(timeout, PING_TIMEOUT_MIN), PING_TIMEOUT_MAX)
+
+
+def _validate_host(host):
+    """主機會直接成為 ping 的參數，拒絕空值、以 - 開頭或含空白的值"""
+    if not isinstance(host, str) or not host or host.startswith('-') \
+            or any(ch.isspace() for ch in host):
+        raise ValueError(f'無效的主機: {host}')
+    return host
 
 
 @network_bp.route('/wifi/scan')
 def api_wifi_scan():
     """掃描 WiFi 網路"""
     try:
-        networks = network_model.scan_wifi_networks()
+        body = _scan_cache.get('body')
+        if body is None:
+            networks = _submit_shared(('wifi_scan',), _nm().scan_wifi_networks).result(
+                timeout=WIFI_SCAN_TIMEOUT)
+            body = prebuilt_json({
+                'success': True,
+                'data': networks,
+                'total_count': len(networks)
+            })
+            _scan_cache.set('body', body)
         
-        return jsonify({
-            'success': True,
-            'data': networks,
-            'total_count': len(networks)
-        })
+        return json_bytes_response(body)
         
+    except FutureTimeoutError:
+        logger.warning("WiFi 掃描超過 %s 秒仍未完成", WIFI_SCAN_TIMEOUT)
+        return jsonify({
+            'success': False,
+            'error': 'WiFi 掃描逾時，請稍後再試'
+        }), 504
     except Exception as e:
-        logging.error(f"掃描WiFi網路時發生錯誤: {e}")
+        logger.error("掃描WiFi網路時發生錯誤: %s", e)
         return jsonify({
             'success': False,
             'error': str(e)
@@ -39,10 +125,10 @@ def api_wifi_debug():
     """WiFi 調試資訊"""
     try:
         # 獲取網路狀態
-        network_status = network_model.get_network_status()
+        network_status = _nm().get_network_status()
         
         # 獲取當前WiFi資訊
-        current_wifi = network_model.get_current_wifi()
+        current_wifi = _nm().get_current_wifi()
         
         debug_info = {
             'network_status': network_status,
@@ -60,7 +146,7 @@ def api_wifi_debug():
         })
         
     except Exception as e:
-        logging.error(f"獲取WiFi調試資訊時發生錯誤: {e}")
+        logger.error("獲取WiFi調試資訊時發生錯誤: %s", e)
         return jsonify({
             'success': False,
             'error': str(e)
@@ -71,7 +157,7 @@ def api_wifi_debug():
 def api_wifi_connect():
     """連接 WiFi 網路"""
     try:
-        data = request.get_json()
+        data = request.get_json(silent=True)
         
         if not data:
             return jsonify({
@@ -89,9 +175,10 @@ def api_wifi_connect():
             }), 400
         
         # 嘗試連接WiFi
-        result = network_model.connect_wifi(ssid, password)
+        result = _nm().connect_wifi(ssid, password)
         
         if result['success']:
+            _scan_cache.invalidate()
             return jsonify({
                 'success': True,
                 'message': f'成功連接到 {ssid}',
@@ -105,7 +192,7 @@ def api_wifi_connect():
             }), 400
         
     except Exception as e:
-        logging.error(f"連接WiFi時發生錯誤: {e}")
+        logger.error("連接WiFi時發生錯誤: %s", e)
         return jsonify({
             'success': False,
             'error': str(e)
@@ -116,7 +203,7 @@ def api_wifi_connect():
 def api_wifi_current():
     """獲取當前 WiFi 連接資訊"""
     try:
-        current_wifi = network_model.get_current_wifi()
+        current_wifi = _nm().get_current_wifi()
         
         return jsonify({
             'success': current_wifi['success'],
@@ -125,7 +212,7 @@ def api_wifi_current():
         })
         
     except Exception as e:
-        logging.error(f"獲取當前WiFi資訊時發生錯誤: {e}")
+        logger.error("獲取當前WiFi資訊時發生錯誤: %s", e)
         return jsonify({
             'success': False,
             'error': str(e)
@@ -136,7 +223,7 @@ def api_wifi_current():
 def api_host_save_config():
     """儲存主機配置"""
     try:
-        data = request.get_json()
+        data = request.get_json(silent=True)
         
         if not data:
             return jsonify({
@@ -171,7 +258,7 @@ def api_host_save_config():
         })
         
     except Exception as e:
-        logging.error(f"儲存主機配置時發生錯誤: {e}")
+        logger.error("儲存主機配置時發生錯誤: %s", e)
         return jsonify({
             'success': False,
             'error': str(e)
@@ -182,7 +269,7 @@ def api_host_save_config():
 def api_host_test_connection():
     """測試主機連接"""
     try:
-        data = request.get_json()
+        data = request.get_json(silent=True)
         
         if not data:
             return jsonify({
@@ -190,11 +277,18 @@ def api_host_test_connection():
                 'error': '沒有接收到測試資料'
             }), 400
         
-        host = data.get('host', '8.8.8.8')
-        timeout = data.get('timeout', 5)
+        try:
+            host = _validate_host(data.get('host', '8.8.8.8'))
+            timeout = _ping_timeout(data.get('timeout', 5))
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
         
         # 測試連接
-        result = network_model.test_connection(host, timeout)
+        result = _submit_shared(('ping', host, timeout), _nm().test_connection,
+                                host, timeout).result(timeout=HOST_TEST_WAIT_TIMEOUT)
         
         return jsonify({
             'success': result['success'],
@@ -202,9 +296,89 @@ def api_host_test_connection():
             'message': '連接測試成功' if result['success'] else '連接測試失敗'
         })
         
+    except FutureTimeoutError:
+        logger.warning("主機連接測試超過 %s 秒仍未完成", HOST_TEST_WAIT_TIMEOUT)
+        return jsonify({
+            'success': False,
+            'error': '連接測試逾時，請稍後再試'
+        }), 504
+    except Exception as e:
+        logger.error("測試主機連接時發生錯誤: %s", e)
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@network_bp.route('/host/test-connections', methods=['POST'])
+def api_host_test_connections():
+    """同時測試多台主機連接，總耗時約為最慢的一台"""
+    try:
+        data = request.get_json(silent=True)
+        hosts = data.get('hosts') if isinstance(data, dict) else None
+        
+        if not isinstance(hosts, list) or not hosts:
+            return jsonify({
+                'success': False,
+                'error': '缺少主機清單 (hosts)'
+            }), 400
+        
+        # 去除重複並保留順序
+        hosts = list(dict.fromkeys(str(host) for host in hosts))
+        if len(hosts) > HOST_TEST_BATCH_MAX:
+            return jsonify({
+                'success': False,
+                'error': f'一次最多測試 {HOST_TEST_BATCH_MAX} 台主機'
+            }), 400
+        
+        try:
+            for host in hosts:
+                _validate_host(host)
+            timeout = _ping_timeout(data.get('timeout', 5))
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
+        
+        futures = {
+            host: _submit_shared(('ping', host, timeout), _nm().test_connection, host, timeout)
+            for host in hosts
+        }
+        wait(futures.values(), timeout=HOST_TEST_WAIT_TIMEOUT)
+        
+        results = {}
+        for host, future in futures.items():
+            if future.done():
+                # 單一主機的測試失敗只記錄在該主機的結果，不影響整批回應
+                error = future.exception()
+                if error is None:
+                    results[host] = future.result()
+                else:
+                    logger.warning("測試主機 %s 時發生錯誤: %s", host, error)
+                    results[host] = {
+                        'success': False,
+                        'host': host,
+                        'error': str(error)
+                    }
+            else:
+                results[host] = {
+                    'success': False,
+                    'host': host,
+                    'error': f'連接測試逾時 ({HOST_TEST_WAIT_TIMEOUT}s)'
+                }
+        
+        reachable = sum(1 for result in results.values() if result['success'])
+        return jsonify({
+            'success': reachable == len(results),
+            'data': results,
+            'reachable_count': reachable,
+            'total_count': len(results)
+        })
+        
     except Exception as e:
-        logging.error(f"測試主機連接時發生錯誤: {e}")
+        logger.error("批次測試主機連接時發生錯誤: %s", e)
         return jsonify({
             'success': False,
             'error': str(e)
-        }), 500
\ No newline at end of file
+        }), 500
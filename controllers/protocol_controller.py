@@ -5,49 +5,140 @@
 
 from flask import Blueprint, request, jsonify
 import logging
-from datetime import datetime
+
+from utils.time_utils import cached_iso_now
+from views.api_responses import (TEMPLATE_SLOT, json_bytes_response, json_error,
+                                 json_template, prebuilt_json)
 
 # 創建 Blueprint
 protocol_bp = Blueprint('protocol', __name__, url_prefix='/api')
+logger = logging.getLogger(__name__)
 
 # 全域變數（這些應該從原始程式碼移過來）
 protocol_manager = None
 
+# 以下為固定內容，於匯入時建立一次，各請求直接引用
+
+# 可用協議
+_PROTOCOLS = (
+    {
+        'name': 'UART',
+        'description': 'UART 串口通訊協議',
+        'status': 'available',
+        'version': '1.0'
+    },
+    {
+        'name': 'HTTP',
+        'description': 'HTTP 網路通訊協議',
+        'status': 'available',
+        'version': '1.1'
+    },
+    {
+        'name': 'TCP',
+        'description': 'TCP Socket 通訊協議',
+        'status': 'available',
+        'version': '1.0'
+    }
+)
+
+# 協議列表的完整回應，匯入時預先序列化
+_PROTOCOLS_BODY = prebuilt_json({
+    'success': True,
+    'data': _PROTOCOLS,
+    'total_count': len(_PROTOCOLS)
+})
+
+# 各協議的配置（以小寫協議名稱為鍵）
+_PROTOCOL_CONFIGS = {
+    'uart': {
+        'port': '/dev/ttyUSB0',
+        'baudrate': 9600,
+        'timeout': 1,
+        'data_bits': 8,
+        'stop_bits': 1,
+        'parity': 'none'
+    },
+    'http': {
+        'host': 'localhost',
+        'port': 80,
+        'timeout': 30,
+        'max_retries': 3,
+        'ssl_verify': True
+    },
+    'tcp': {
+        'host': 'localhost',
+        'port': 8080,
+        'timeout': 30,
+        'keep_alive': True,
+        'buffer_size': 1024
+    }
+}
+
+# 各協議配置回應的預先序列化模板，%s 處填入請求中的協議名稱
+_PROTOCOL_CONFIG_TEMPLATES = {
+    name: (b'{"success":true,"data":{"protocol":%s,"config":'
+           + prebuilt_json(config).replace(b'%', b'%%') + b'}}')
+    for name, config in _PROTOCOL_CONFIGS.items()
+}
+
+# 目前活動協議的配置
+_ACTIVE_PROTOCOL_CONFIG = {
+    'port': '/dev/ttyUSB0',
+    'baudrate': 9600
+}
+
+# 未啟用協議的狀態
+_INACTIVE_PROTOCOL_STATUS = {
+    'status': 'inactive',
+    'connected': False,
+    'last_activity': None,
+    'error_count': 0
+}
+
+# 各協議的配置狀態
+_CONFIGURED_DETAILS = (
+    {
+        'protocol': 'UART',
+        'configured': True,
+        'valid': True,
+        'active': True
+    },
+    {
+        'protocol': 'HTTP',
+        'configured': True,
+        'valid': True,
+        'active': False
+    },
+    {
+        'protocol': 'TCP',
+        'configured': True,
+        'valid': True,
+        'active': False
+    }
+)
+
+
+# 協議配置狀態的回應模板，請求時只填入更新時間
+_CONFIGURED_STATUS_TEMPLATE = json_template({
+    'success': True,
+    'data': {
+        'protocols_configured': 3,
+        'protocols_active': 1,
+        'configuration_valid': True,
+        'last_config_update': TEMPLATE_SLOT,
+        'details': _CONFIGURED_DETAILS
+    }
+})
+
 
 @protocol_bp.route('/protocols')
 def api_protocols():
     """獲取可用協議列表"""
     try:
-        # 返回支援的協議列表
-        protocols = [
-            {
-                'name': 'UART',
-                'description': 'UART 串口通訊協議',
-                'status': 'available',
-                'version': '1.0'
-            },
-            {
-                'name': 'HTTP',
-                'description': 'HTTP 網路通訊協議',
-                'status': 'available',
-                'version': '1.1'
-            },
-            {
-                'name': 'TCP',
-                'description': 'TCP Socket 通訊協議',
-                'status': 'available',
-                'version': '1.0'
-            }
-        ]
-        
-        return jsonify({
-            'success': True,
-            'data': protocols,
-            'total_count': len(protocols)
-        })
+        return json_bytes_response(_PROTOCOLS_BODY)
         
     except Exception as e:
-        logging.error(f"獲取協議列表時發生錯誤: {e}")
+        logger.error("獲取協議列表時發生錯誤: %s", e)
         return jsonify({
             'success': False,
             'error': str(e)
@@ -58,49 +149,15 @@ def api_protocols():
 def api_protocol_config(protocol):
     """獲取指定協議的配置"""
     try:
-        # 根據協議類型返回配置
-        configs = {
-            'uart': {
-                'port': '/dev/ttyUSB0',
-                'baudrate': 9600,
-                'timeout': 1,
-                'data_bits': 8,
-                'stop_bits': 1,
-                'parity': 'none'
-            },
-            'http': {
-                'host': 'localhost',
-                'port': 80,
-                'timeout': 30,
-                'max_retries': 3,
-                'ssl_verify': True
-            },
-            'tcp': {
-                'host': 'localhost',
-                'port': 8080,
-                'timeout': 30,
-                'keep_alive': True,
-                'buffer_size': 1024
-            }
-        }
-        
-        protocol_lower = protocol.lower()
-        if protocol_lower in configs:
-            return jsonify({
-                'success': True,
-                'data': {
-                    'protocol': protocol,
-                    'config': configs[protocol_lower]
-                }
-            })
+        template = _PROTOCOL_CONFIG_TEMPLATES.get(protocol.lower())
+        if template is not None:
+            # 回應中的 protocol 沿用請求的大小寫，只需填入該字串
+            return json_bytes_response(template % prebuilt_json(protocol))
         else:
-            return jsonify({
-                'success': False,
-                'error': f'不支援的協議: {protocol}'
-            }), 404
+            return json_error(f'不支援的協議: {protocol}', 404)
         
     except Exception as e:
-        logging.error(f"獲取協議配置時發生錯誤: {e}")
+        logger.error("獲取協議配置時發生錯誤: %s", e)
         return jsonify({
             'success': False,
             'error': str(e)
@@ -116,11 +173,8 @@ def api_active_protocol():
             active_protocol = {
                 'name': 'UART',  # 預設協議
                 'status': 'active',
-                'start_time': datetime.now().isoformat(),
-                'config': {
-                    'port': '/dev/ttyUSB0',
-                    'baudrate': 9600
-                }
+                'start_time': cached_iso_now(),
+                'config': _ACTIVE_PROTOCOL_CONFIG
             }
             
             return jsonify({
@@ -130,7 +184,7 @@ def api_active_protocol():
         
         elif request.method == 'POST':
             # 設定活動協議
-            data = request.get_json()
+            data = request.get_json(silent=True)
             if not data:
                 return jsonify({
                     'success': False,
@@ -152,12 +206,12 @@ def api_active_protocol():
                 'data': {
                     'protocol': protocol_name,
                     'status': 'active',
-                    'switch_time': datetime.now().isoformat()
+                    'switch_time': cached_iso_now()
                 }
             })
         
     except Exception as e:
-        logging.error(f"處理活動協議時發生錯誤: {e}")
+        logger.error("處理活動協議時發生錯誤: %s", e)
         return jsonify({
             'success': False,
             'error': str(e)
@@ -172,21 +226,11 @@ def api_protocol_status():
             'uart': {
                 'status': 'active',
                 'connected': True,
-                'last_activity': datetime.now().isoformat(),
+                'last_activity': cached_iso_now(),
                 'error_count': 0
             },
-            'http': {
-                'status': 'inactive',
-                'connected': False,
-                'last_activity': None,
-                'error_count': 0
-            },
-            'tcp': {
-                'status': 'inactive',
-                'connected': False,
-                'last_activity': None,
-                'error_count': 0
-            }
+            'http': _INACTIVE_PROTOCOL_STATUS,
+            'tcp': _INACTIVE_PROTOCOL_STATUS
         }
         
         return jsonify({
@@ -195,7 +239,7 @@ def api_protocol_status():
         })
         
     except Exception as e:
-        logging.error(f"獲取協議狀態時發生錯誤: {e}")
+        logger.error("獲取協議狀態時發生錯誤: %s", e)
         return jsonify({
             'success': False,
             'error': str(e)
@@ -206,40 +250,11 @@ def api_protocol_status():
 def api_protocol_configured_status():
     """獲取協議配置狀態"""
     try:
-        configured_status = {
-            'protocols_configured': 3,
-            'protocols_active': 1,
-            'configuration_valid': True,
-            'last_config_update': datetime.now().isoformat(),
-            'details': [
-                {
-                    'protocol': 'UART',
-                    'configured': True,
-                    'valid': True,
-                    'active': True
-                },
-                {
-                    'protocol': 'HTTP',
-                    'configured': True,
-                    'valid': True,
-                    'active': False
-                },
-                {
-                    'protocol': 'TCP',
-                    'configured': True,
-                    'valid': True,
-                    'active': False
-                }
-            ]
-        }
-        
-        return jsonify({
-            'success': True,
-            'data': configured_status
-        })
+        return json_bytes_response(
+            _CONFIGURED_STATUS_TEMPLATE % prebuilt_json(cached_iso_now()))
         
     except Exception as e:
-        logging.error(f"獲取協議配置狀態時發生錯誤: {e}")
+        logger.error("獲取協議配置狀態時發生錯誤: %s", e)
         return jsonify({
             'success': False,
             'error': str(e)
@@ -250,7 +265,7 @@ def api_protocol_configured_status():
 def api_protocol_start():
     """啟動協議"""
     try:
-        data = request.get_json()
+        data = request.get_json(silent=True)
         if not data:
             return jsonify({
                 'success': False,
@@ -274,13 +289,13 @@ def api_protocol_start():
             'data': {
                 'protocol': protocol,
                 'status': 'started',
-                'start_time': datetime.now().isoformat(),
+                'start_time': cached_iso_now(),
                 'config': config
             }
         })
         
     except Exception as e:
-        logging.error(f"啟動協議時發生錯誤: {e}")
+        logger.error("啟動協議時發生錯誤: %s", e)
         return jsonify({
             'success': False,
             'error': str(e)
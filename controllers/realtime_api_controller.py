@@ -3,14 +3,26 @@
 提供 RAS_pi 連接狀態、即時資料監控和智能觸發管理的 API 端點
 """
 
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, Response, make_response, request, url_for
+from werkzeug.exceptions import HTTPException
 import logging
-from datetime import datetime
+import sys
+import threading
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from bisect import bisect_right
+from functools import wraps
+from itertools import product
 from typing import Dict, Any
 
 from services.raspi_api_client import get_raspi_client, get_raspi_aggregator, RaspberryPiConfig
 from services.real_time_data_service import get_real_time_service
 from services.smart_uart_trigger import get_trigger_manager, UARTScanConfig
+from utils.cache_utils import TTLCache
+from utils.compression_utils import compress_response
+from utils.time_utils import cached_iso_now
+from views.api_responses import (TEMPLATE_SLOT, json_bytes_response, json_response,
+                                 json_template, prebuilt_json, request_json_body)
 
 
 # 創建 Blueprint
@@ -18,548 +30,666 @@ realtime_api_bp = Blueprint('realtime_api', __name__, url_prefix='/api/realtime'
 
 logger = logging.getLogger(__name__)
 
+# 各服務的單例，於匯入時綁定一次，各請求直接引用
+raspi_client = raspi_aggregator = real_time_service = trigger_manager = None
+
+# GET /config 的回應模板：配置很少變動，只在 POST 更新或重新綁定服務後重建
+_config_template_cache = None
+_config_template_lock = threading.Lock()
+
+
+# /raspi/status 與 /raspi/uart/summary 共用的 RAS_pi 快照：一次查詢產生兩份資料
+RASPI_SNAPSHOT_TTL = 0.5
+
+_raspi_snapshot_cache = TTLCache(RASPI_SNAPSHOT_TTL, maxsize=1)
+
+
+def reload_services():
+    """重新綁定服務單例（服務被 cleanup_* 清除並重建後呼叫）"""
+    global raspi_client, raspi_aggregator, real_time_service, trigger_manager
+    raspi_client = get_raspi_client()
+    raspi_aggregator = get_raspi_aggregator()
+    real_time_service = get_real_time_service()
+    trigger_manager = get_trigger_manager()
+    _invalidate_config_template()
+    _raspi_snapshot_cache.invalidate()
+
+
+def _raspi_snapshot():
+    """取得 RAS_pi 完整狀態與 UART 摘要的快照 (RASPI_SNAPSHOT_TTL 秒內重用)"""
+    return _raspi_snapshot_cache.get_or_set('snapshot', raspi_aggregator.get_snapshot)
+
+
+def _config_template():
+    """取得 (必要時建立) 目前配置的 /config 回應模板"""
+    global _config_template_cache
+    with _config_template_lock:
+        if _config_template_cache is None:
+            raspi_config = real_time_service.raspi_config
+            scan_config = trigger_manager.scan_config
+            _config_template_cache = json_template({
+                'success': True,
+                'config': {
+                    'raspi_config': {
+                        'host': raspi_config.host,
+                        'port': raspi_config.port,
+                        'timeout': raspi_config.timeout,
+                        'retry_count': raspi_config.retry_count,
+                        'poll_interval': raspi_config.poll_interval
+                    },
+                    'trigger_config': {
+                        'min_scan_interval': scan_config.min_scan_interval,
+                        'max_scan_interval': scan_config.max_scan_interval,
+                        'adaptive_scanning': scan_config.adaptive_scanning,
+                        'priority_mac_ids': scan_config.priority_mac_ids,
+                        'scan_timeout': scan_config.scan_timeout
+                    }
+                },
+                'timestamp': TEMPLATE_SLOT
+            })
+        return _config_template_cache
+
+
+def _invalidate_config_template():
+    """配置變更後捨棄 /config 回應模板"""
+    global _config_template_cache
+    with _config_template_lock:
+        _config_template_cache = None
+
+
+reload_services()
+
+# 輪詢型端點的回應快取秒數：多個分頁同時輪詢時只實際查詢一次
+POLL_CACHE_TTL = 1.0
+
+_poll_cache = TTLCache(POLL_CACHE_TTL, maxsize=8)
+
+
+def _poll_cached(view):
+    """
+    以端點名稱快取回應內容 POLL_CACHE_TTL 秒
+
+    回應帶 X-Cache: HIT/MISS 標頭；查詢參數 nocache 有值時略過快取。
+    500 錯誤不快取。
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        key = view.__name__
+        if not request.args.get('nocache'):
+            cached = _poll_cache.get(key)
+            if cached is not None:
+                body, status = cached
+                response = Response(body, status=status, mimetype='application/json')
+                response.headers['X-Cache'] = 'HIT'
+                return response
+        
+        response = make_response(view(*args, **kwargs))
+        if response.status_code != 500:
+            _poll_cache.set(key, (response.get_data(), response.status_code))
+        response.headers['X-Cache'] = 'MISS'
+        return response
+    return wrapper
+
+
+# 啟動/停止服務在背景執行，請求立即回傳 202 與 task_id，之後以 /tasks/<task_id> 查詢結果
+TASK_RESULT_TTL = 600
+
+_task_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='realtime-task')
+_tasks = TTLCache(TASK_RESULT_TTL, maxsize=64)
+_active_tasks = {}
+_tasks_lock = threading.Lock()
+
+
+def _submit_task(action, func, done_message, failed_message):
+    """
+    在背景執行服務的 start/stop 並回傳 202
+
+    同一動作已在執行時直接回傳原本的 task_id，不會重複啟動或停止。
+    """
+    with _tasks_lock:
+        task_id = _active_tasks.get(action)
+        task = _tasks.get(task_id) if task_id else None
+        if task is None or task['future'].done():
+            task_id = uuid.uuid4().hex
+            future = _task_executor.submit(func)
+            task = {
+                'action': action,
+                'future': future,
+                'done_message': done_message,
+                'failed_message': failed_message,
+                'submitted_at': cached_iso_now()
+            }
+            _tasks.set(task_id, task)
+            _active_tasks[action] = task_id
+            # 完成後讓輪詢端點立即反映新狀態
+            future.add_done_callback(lambda _: _poll_cache.invalidate())
+    
+    return json_response({
+        'success': True,
+        'message': '已排入背景執行',
+        'task_id': task_id,
+        'status_url': url_for('.get_task_status', task_id=task_id),
+        'timestamp': cached_iso_now()
+    }, 202)
+
+
+@realtime_api_bp.route('/tasks/<task_id>')
+def get_task_status(task_id):
+    """查詢背景 start/stop 工作的狀態"""
+    task = _tasks.get(task_id)
+    if task is None:
+        return json_response({
+            'success': False,
+            'error': f'找不到工作: {task_id}',
+            'timestamp': cached_iso_now()
+        }, 404)
+    
+    future = task['future']
+    result = {
+        'task_id': task_id,
+        'action': task['action'],
+        'submitted_at': task['submitted_at'],
+        'done': future.done()
+    }
+    if not future.done():
+        result['status'] = 'running'
+    elif future.exception() is not None:
+        result['status'] = 'error'
+        result['error'] = str(future.exception())
+    elif future.result():
+        result['status'] = 'succeeded'
+        result['message'] = task['done_message']
+    else:
+        result['status'] = 'failed'
+        result['message'] = task['failed_message']
+    
+    return json_response({
+        'success': True,
+        'task': result,
+        'timestamp': cached_iso_now()
+    })
+
+
+# MAC 資料查詢：進行中的請求 (single-flight) 與短暫的結果快取
+MAC_DATA_CACHE_TTL = 0.2
+
+_mac_data_cache = TTLCache(MAC_DATA_CACHE_TTL, maxsize=64)
+_mac_data_inflight = {}
+_mac_data_lock = threading.Lock()
+
+
+@realtime_api_bp.after_request
+def _invalidate_poll_cache(response):
+    """啟動/停止服務或更新配置後清除輪詢快取，讓下一次查詢立即反映變更"""
+    if request.method == 'POST':
+        _poll_cache.invalidate()
+    return response
+
+
+@realtime_api_bp.errorhandler(Exception)
+def _handle_error(e):
+    """各端點未處理的例外統一在此記錄並回傳 500（HTTP 錯誤維持原本的回應）"""
+    if isinstance(e, HTTPException):
+        return e
+    logger.error("即時監控 API %s 失敗: %s", request.endpoint, e)
+    return json_response({
+        'success': False,
+        'error': str(e),
+        'timestamp': cached_iso_now()
+    }, 500)
+
+
+# /status、/statistics 等回應有數 KB，依 Accept-Encoding 壓縮後再送出
+realtime_api_bp.after_request(compress_response)
+
 
 @realtime_api_bp.route('/status')
+@_poll_cached
 def get_realtime_status():
     """獲取即時監控系統整體狀態"""
-    try:
-        # 獲取各個服務的狀態
-        raspi_client = get_raspi_client()
-        real_time_service = get_real_time_service()
-        trigger_manager = get_trigger_manager()
-        
-        # RAS_pi 連接狀態
-        raspi_connection = raspi_client.get_connection_status()
-        
-        # 即時資料服務狀態
-        realtime_service_status = real_time_service.get_service_status()
-        
-        # 觸發管理器狀態
-        trigger_status = trigger_manager.get_status()
-        
-        # 系統整體狀態評估
-        overall_health = _assess_system_health(
-            raspi_connection, 
-            realtime_service_status, 
-            trigger_status
-        )
-        
-        return jsonify({
-            'success': True,
-            'timestamp': datetime.now().isoformat(),
-            'overall_health': overall_health,
-            'components': {
-                'raspi_connection': raspi_connection,
-                'realtime_service': realtime_service_status,
-                'trigger_manager': trigger_status
-            }
-        })
-        
-    except Exception as e:
-        logger.error(f"獲取即時狀態失敗: {e}")
-        return jsonify({
-            'success': False,
-            'error': str(e),
-            'timestamp': datetime.now().isoformat()
-        }), 500
+    # RAS_pi 連接狀態
+    raspi_connection = raspi_client.get_connection_status()
+    
+    # 觸發管理器狀態（已內含同一個即時資料服務的狀態，不必再取一次）
+    trigger_status = trigger_manager.get_status()
+    
+    # 即時資料服務狀態
+    realtime_service_status = trigger_status['real_time_service_status']
+    
+    # 系統整體狀態評估
+    overall_health = _assess_system_health(
+        raspi_connection, 
+        realtime_service_status, 
+        trigger_status
+    )
+    
+    return json_response({
+        'success': True,
+        'timestamp': cached_iso_now(),
+        'overall_health': overall_health,
+        'components': {
+            'raspi_connection': raspi_connection,
+            'realtime_service': realtime_service_status,
+            'trigger_manager': trigger_status
+        }
+    })
 
 
 @realtime_api_bp.route('/raspi/status')
 def get_raspi_status():
     """獲取 RAS_pi 詳細狀態"""
-    try:
-        aggregator = get_raspi_aggregator()
-        complete_status = aggregator.get_complete_status()
-        
-        return jsonify({
-            'success': True,
-            'data': complete_status,
-            'timestamp': datetime.now().isoformat()
-        })
-        
-    except Exception as e:
-        logger.error(f"獲取 RAS_pi 狀態失敗: {e}")
-        return jsonify({
-            'success': False,
-            'error': str(e),
-            'timestamp': datetime.now().isoformat()
-        }), 500
+    complete_status = _raspi_snapshot()['status']
+    
+    return json_response({
+        'success': True,
+        'data': complete_status,
+        'timestamp': cached_iso_now()
+    })
 
 
 @realtime_api_bp.route('/raspi/uart/summary')
+@_poll_cached
 def get_raspi_uart_summary():
     """獲取 RAS_pi UART 即時摘要"""
+    uart_summary = _raspi_snapshot()['uart_summary']
+    
+    return json_response({
+        'success': True,
+        'data': uart_summary,
+        'timestamp': cached_iso_now()
+    })
+
+
+# MAC 資料查詢的預設與上限分鐘數（上限一天，避免一次向 RAS_pi 要求過多資料）
+DEFAULT_MAC_DATA_MINUTES = 10
+MAX_MAC_DATA_MINUTES = 1440
+
+
+def _fetch_mac_data(mac_id, minutes):
+    """
+    向 RAS_pi 查詢 MAC 資料；相同 (mac_id, minutes) 同時只發出一個請求
+
+    其餘並行的請求等待同一個結果，成功的結果再保留 MAC_DATA_CACHE_TTL 秒供連續輪詢使用。
+    """
+    key = (mac_id, minutes)
+    cached = _mac_data_cache.get(key)
+    if cached is not None:
+        return cached
+    
+    with _mac_data_lock:
+        future = _mac_data_inflight.get(key)
+        leader = future is None
+        if leader:
+            future = _mac_data_inflight[key] = Future()
+    
+    if not leader:
+        return future.result()
+    
     try:
-        aggregator = get_raspi_aggregator()
-        uart_summary = aggregator.get_real_time_uart_summary()
-        
-        return jsonify({
-            'success': True,
-            'data': uart_summary,
-            'timestamp': datetime.now().isoformat()
-        })
-        
-    except Exception as e:
-        logger.error(f"獲取 UART 摘要失敗: {e}")
-        return jsonify({
-            'success': False,
-            'error': str(e),
-            'timestamp': datetime.now().isoformat()
-        }), 500
+        result = raspi_client.get_uart_mac_data(mac_id, minutes)
+        if result[0]:
+            _mac_data_cache.set(key, result)
+        future.set_result(result)
+        return result
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with _mac_data_lock:
+            _mac_data_inflight.pop(key, None)
 
 
 @realtime_api_bp.route('/raspi/uart/mac-data/<mac_id>')
 def get_raspi_mac_data(mac_id):
     """獲取 RAS_pi 特定 MAC ID 的即時資料"""
-    try:
-        minutes = request.args.get('minutes', 10, type=int)
-        
-        raspi_client = get_raspi_client()
-        success, data = raspi_client.get_uart_mac_data(mac_id, minutes)
-        
-        if success:
-            return jsonify({
-                'success': True,
-                'mac_id': mac_id,
-                'minutes': minutes,
-                'data': data,
-                'timestamp': datetime.now().isoformat()
-            })
-        else:
-            return jsonify({
-                'success': False,
-                'mac_id': mac_id,
-                'error': 'Failed to fetch data from RAS_pi',
-                'timestamp': datetime.now().isoformat()
-            }), 500
-            
-    except Exception as e:
-        logger.error(f"獲取 MAC 資料失敗: {e}")
-        return jsonify({
+    raw = request.args.get('minutes')
+    minutes = int(raw) if raw and raw.isdigit() else DEFAULT_MAC_DATA_MINUTES
+    minutes = min(max(minutes, 1), MAX_MAC_DATA_MINUTES)
+    
+    success, data = _fetch_mac_data(mac_id, minutes)
+    
+    if success:
+        return json_response({
+            'success': True,
+            'mac_id': mac_id,
+            'minutes': minutes,
+            'data': data,
+            'timestamp': cached_iso_now()
+        })
+    else:
+        return json_response({
             'success': False,
-            'error': str(e),
-            'timestamp': datetime.now().isoformat()
-        }), 500
+            'mac_id': mac_id,
+            'error': 'Failed to fetch data from RAS_pi',
+            'timestamp': cached_iso_now()
+        }, 500)
 
 
 @realtime_api_bp.route('/service/start', methods=['POST'])
 def start_realtime_service():
     """啟動即時監控服務"""
-    try:
-        real_time_service = get_real_time_service()
-        
-        if real_time_service.is_running:
-            return jsonify({
-                'success': True,
-                'message': '即時監控服務已在運行',
-                'timestamp': datetime.now().isoformat()
-            })
-        
-        success = real_time_service.start()
-        
-        if success:
-            return jsonify({
-                'success': True,
-                'message': '即時監控服務已啟動',
-                'timestamp': datetime.now().isoformat()
-            })
-        else:
-            return jsonify({
-                'success': False,
-                'message': '即時監控服務啟動失敗',
-                'timestamp': datetime.now().isoformat()
-            }), 500
-            
-    except Exception as e:
-        logger.error(f"啟動即時監控服務失敗: {e}")
-        return jsonify({
-            'success': False,
-            'error': str(e),
-            'timestamp': datetime.now().isoformat()
-        }), 500
+    if real_time_service.is_running:
+        return json_response({
+            'success': True,
+            'message': '即時監控服務已在運行',
+            'timestamp': cached_iso_now()
+        })
+    
+    return _submit_task('service_start', real_time_service.start,
+                        '即時監控服務已啟動', '即時監控服務啟動失敗')
 
 
 @realtime_api_bp.route('/service/stop', methods=['POST'])
 def stop_realtime_service():
     """停止即時監控服務"""
-    try:
-        real_time_service = get_real_time_service()
-        
-        if not real_time_service.is_running:
-            return jsonify({
-                'success': True,
-                'message': '即時監控服務未在運行',
-                'timestamp': datetime.now().isoformat()
-            })
-        
-        success = real_time_service.stop()
-        
-        if success:
-            return jsonify({
-                'success': True,
-                'message': '即時監控服務已停止',
-                'timestamp': datetime.now().isoformat()
-            })
-        else:
-            return jsonify({
-                'success': False,
-                'message': '即時監控服務停止失敗',
-                'timestamp': datetime.now().isoformat()
-            }), 500
-            
-    except Exception as e:
-        logger.error(f"停止即時監控服務失敗: {e}")
-        return jsonify({
-            'success': False,
-            'error': str(e),
-            'timestamp': datetime.now().isoformat()
-        }), 500
+    if not real_time_service.is_running:
+        return json_response({
+            'success': True,
+            'message': '即時監控服務未在運行',
+            'timestamp': cached_iso_now()
+        })
+    
+    return _submit_task('service_stop', real_time_service.stop,
+                        '即時監控服務已停止', '即時監控服務停止失敗')
 
 
 @realtime_api_bp.route('/trigger/start', methods=['POST'])
 def start_trigger_manager():
     """啟動智能觸發管理器"""
-    try:
-        trigger_manager = get_trigger_manager()
-        
-        if trigger_manager.is_active:
-            return jsonify({
-                'success': True,
-                'message': '智能觸發管理器已在運行',
-                'timestamp': datetime.now().isoformat()
-            })
-        
-        success = trigger_manager.start()
-        
-        if success:
-            return jsonify({
-                'success': True,
-                'message': '智能觸發管理器已啟動',
-                'timestamp': datetime.now().isoformat()
-            })
-        else:
-            return jsonify({
-                'success': False,
-                'message': '智能觸發管理器啟動失敗',
-                'timestamp': datetime.now().isoformat()
-            }), 500
-            
-    except Exception as e:
-        logger.error(f"啟動智能觸發管理器失敗: {e}")
-        return jsonify({
-            'success': False,
-            'error': str(e),
-            'timestamp': datetime.now().isoformat()
-        }), 500
+    if trigger_manager.is_active:
+        return json_response({
+            'success': True,
+            'message': '智能觸發管理器已在運行',
+            'timestamp': cached_iso_now()
+        })
+    
+    return _submit_task('trigger_start', trigger_manager.start,
+                        '智能觸發管理器已啟動', '智能觸發管理器啟動失敗')
 
 
 @realtime_api_bp.route('/trigger/stop', methods=['POST'])
 def stop_trigger_manager():
     """停止智能觸發管理器"""
-    try:
-        trigger_manager = get_trigger_manager()
-        
-        if not trigger_manager.is_active:
-            return jsonify({
-                'success': True,
-                'message': '智能觸發管理器未在運行',
-                'timestamp': datetime.now().isoformat()
-            })
-        
-        success = trigger_manager.stop()
-        
-        if success:
-            return jsonify({
-                'success': True,
-                'message': '智能觸發管理器已停止',
-                'timestamp': datetime.now().isoformat()
-            })
-        else:
-            return jsonify({
-                'success': False,
-                'message': '智能觸發管理器停止失敗',
-                'timestamp': datetime.now().isoformat()
-            }), 500
-            
-    except Exception as e:
-        logger.error(f"停止智能觸發管理器失敗: {e}")
-        return jsonify({
-            'success': False,
-            'error': str(e),
-            'timestamp': datetime.now().isoformat()
-        }), 500
+    if not trigger_manager.is_active:
+        return json_response({
+            'success': True,
+            'message': '智能觸發管理器未在運行',
+            'timestamp': cached_iso_now()
+        })
+    
+    return _submit_task('trigger_stop', trigger_manager.stop,
+                        '智能觸發管理器已停止', '智能觸發管理器停止失敗')
 
 
 @realtime_api_bp.route('/trigger/manual', methods=['POST'])
 def manual_trigger_scan():
     """手動觸發掃描"""
-    try:
-        data = request.get_json() or {}
-        message = data.get('message', '手動觸發掃描')
-        
-        trigger_manager = get_trigger_manager()
-        
-        if not trigger_manager.is_active:
-            return jsonify({
-                'success': False,
-                'message': '智能觸發管理器未啟動',
-                'timestamp': datetime.now().isoformat()
-            }), 400
-        
-        success = trigger_manager.manual_scan(message)
-        
-        if success:
-            return jsonify({
-                'success': True,
-                'message': f'手動掃描已觸發: {message}',
-                'timestamp': datetime.now().isoformat()
-            })
-        else:
-            return jsonify({
-                'success': False,
-                'message': '手動觸發失敗',
-                'timestamp': datetime.now().isoformat()
-            }), 500
-            
-    except Exception as e:
-        logger.error(f"手動觸發掃描失敗: {e}")
-        return jsonify({
+    data = request_json_body()
+    if data is None:
+        return json_response({
             'success': False,
-            'error': str(e),
-            'timestamp': datetime.now().isoformat()
-        }), 500
+            'message': '無效的請求資料',
+            'timestamp': cached_iso_now()
+        }, 400)
+    message = data.get('message', '手動觸發掃描')
+    
+    if not trigger_manager.is_active:
+        return json_response({
+            'success': False,
+            'message': '智能觸發管理器未啟動',
+            'timestamp': cached_iso_now()
+        }, 400)
+    
+    success = trigger_manager.manual_scan(message)
+    
+    if success:
+        return json_response({
+            'success': True,
+            'message': f'手動掃描已觸發: {message}',
+            'timestamp': cached_iso_now()
+        })
+    else:
+        return json_response({
+            'success': False,
+            'message': '手動觸發失敗',
+            'timestamp': cached_iso_now()
+        }, 500)
+
+
+# POST /config 可更新的欄位，以及回應中 updated_fields 使用的名稱
+_RASPI_KEYS = ('poll_interval',)
+_TRIGGER_KEYS = ('min_scan_interval', 'max_scan_interval', 'adaptive_scanning',
+                 'priority_mac_ids', 'scan_timeout')
+_RASPI_FIELD_NAMES = {key: 'raspi_' + key for key in _RASPI_KEYS}
+_TRIGGER_FIELD_NAMES = {key: 'trigger_' + key for key in _TRIGGER_KEYS}
 
 
 @realtime_api_bp.route('/config', methods=['GET', 'POST'])
 def manage_realtime_config():
     """管理即時監控配置"""
     if request.method == 'GET':
-        try:
-            # 獲取當前配置
-            real_time_service = get_real_time_service()
-            trigger_manager = get_trigger_manager()
-            
-            current_config = {
-                'raspi_config': {
-                    'host': real_time_service.raspi_config.host,
-                    'port': real_time_service.raspi_config.port,
-                    'timeout': real_time_service.raspi_config.timeout,
-                    'retry_count': real_time_service.raspi_config.retry_count,
-                    'poll_interval': real_time_service.raspi_config.poll_interval
-                },
-                'trigger_config': {
-                    'min_scan_interval': trigger_manager.scan_config.min_scan_interval,
-                    'max_scan_interval': trigger_manager.scan_config.max_scan_interval,
-                    'adaptive_scanning': trigger_manager.scan_config.adaptive_scanning,
-                    'priority_mac_ids': trigger_manager.scan_config.priority_mac_ids,
-                    'scan_timeout': trigger_manager.scan_config.scan_timeout
-                }
-            }
-            
-            return jsonify({
-                'success': True,
-                'config': current_config,
-                'timestamp': datetime.now().isoformat()
-            })
-            
-        except Exception as e:
-            logger.error(f"獲取配置失敗: {e}")
-            return jsonify({
-                'success': False,
-                'error': str(e),
-                'timestamp': datetime.now().isoformat()
-            }), 500
-    
+        # 獲取當前配置（快取的回應模板，只填入時間戳記）
+        return json_bytes_response(_config_template() % prebuilt_json(cached_iso_now()))
+
     else:  # POST
         try:
-            data = request.get_json()
+            data = request_json_body()
             if not data:
-                return jsonify({
+                return json_response({
                     'success': False,
                     'message': '無效的請求資料',
-                    'timestamp': datetime.now().isoformat()
-                }), 400
-            
-            updated_fields = []
+                    'timestamp': cached_iso_now()
+                }, 400)
             
             # 更新即時服務配置
-            service_updates = {}
             raspi_config = data.get('raspi_config', {})
-            for key in ['poll_interval']:
-                if key in raspi_config:
-                    service_updates[key] = raspi_config[key]
-                    updated_fields.append(f"raspi_{key}")
-            
+            service_updates = {key: raspi_config[key] for key in _RASPI_KEYS if key in raspi_config}
             if service_updates:
-                real_time_service = get_real_time_service()
                 real_time_service.update_config(**service_updates)
             
             # 更新觸發管理器配置
-            trigger_updates = {}
             trigger_config = data.get('trigger_config', {})
-            for key in ['min_scan_interval', 'max_scan_interval', 'adaptive_scanning', 
-                       'priority_mac_ids', 'scan_timeout']:
-                if key in trigger_config:
-                    trigger_updates[key] = trigger_config[key]
-                    updated_fields.append(f"trigger_{key}")
-            
+            trigger_updates = {key: trigger_config[key] for key in _TRIGGER_KEYS if key in trigger_config}
             if trigger_updates:
-                trigger_manager = get_trigger_manager()
                 trigger_manager.update_scan_config(**trigger_updates)
             
-            return jsonify({
+            updated_fields = ([_RASPI_FIELD_NAMES[key] for key in service_updates]
+                              + [_TRIGGER_FIELD_NAMES[key] for key in trigger_updates])
+            
+            if updated_fields:
+                _invalidate_config_template()
+            
+            return json_response({
                 'success': True,
                 'message': f'配置已更新: {", ".join(updated_fields)}' if updated_fields else '無配置更新',
                 'updated_fields': updated_fields,
-                'timestamp': datetime.now().isoformat()
+                'timestamp': cached_iso_now()
             })
             
-        except Exception as e:
-            logger.error(f"更新配置失敗: {e}")
-            return jsonify({
-                'success': False,
-                'error': str(e),
-                'timestamp': datetime.now().isoformat()
-            }), 500
+        except Exception:
+            # 可能已套用部分欄位，模板一律重建後交給錯誤處理器回應
+            _invalidate_config_template()
+            raise
 
 
 @realtime_api_bp.route('/statistics')
+@_poll_cached
 def get_realtime_statistics():
     """獲取即時監控系統統計資料"""
-    try:
-        real_time_service = get_real_time_service()
-        trigger_manager = get_trigger_manager()
-        
-        service_status = real_time_service.get_service_status()
-        trigger_status = trigger_manager.get_status()
-        
-        # 綜合統計
-        combined_stats = {
-            'system_uptime': service_status.get('uptime_seconds'),
-            'total_raspi_checks': service_status.get('stats', {}).get('total_checks', 0),
-            'successful_raspi_checks': service_status.get('stats', {}).get('successful_checks', 0),
-            'total_scans_triggered': trigger_status.get('statistics', {}).get('total_scans', 0),
-            'successful_scans': trigger_status.get('statistics', {}).get('successful_scans', 0),
-            'mac_ids_discovered': len(service_status.get('stats', {}).get('mac_ids_discovered', [])),
-            'current_activity_level': trigger_status.get('adaptive_state', {}).get('activity_level', 'unknown'),
-            'last_successful_check': service_status.get('last_successful_check'),
-            'last_scan_time': trigger_status.get('last_scan_time')
-        }
-        
-        return jsonify({
-            'success': True,
-            'statistics': combined_stats,
-            'detailed_stats': {
-                'realtime_service': service_status.get('stats', {}),
-                'trigger_manager': trigger_status.get('statistics', {}),
-                'adaptive_state': trigger_status.get('adaptive_state', {})
-            },
-            'timestamp': datetime.now().isoformat()
-        })
-        
-    except Exception as e:
-        logger.error(f"獲取統計資料失敗: {e}")
-        return jsonify({
-            'success': False,
-            'error': str(e),
-            'timestamp': datetime.now().isoformat()
-        }), 500
+    trigger_status = trigger_manager.get_status()
+    service_status = trigger_status['real_time_service_status']
+    
+    # 巢狀的統計字典各取一次
+    service_stats = service_status.get('stats', {})
+    trigger_stats = trigger_status.get('statistics', {})
+    adaptive_state = trigger_status.get('adaptive_state', {})
+    
+    # 綜合統計
+    combined_stats = {
+        'system_uptime': service_status.get('uptime_seconds'),
+        'total_raspi_checks': service_stats.get('total_checks', 0),
+        'successful_raspi_checks': service_stats.get('successful_checks', 0),
+        'total_scans_triggered': trigger_stats.get('total_scans', 0),
+        'successful_scans': trigger_stats.get('successful_scans', 0),
+        'mac_ids_discovered': len(service_stats.get('mac_ids_discovered', [])),
+        'current_activity_level': adaptive_state.get('activity_level', 'unknown'),
+        'last_successful_check': service_status.get('last_successful_check'),
+        'last_scan_time': trigger_status.get('last_scan_time')
+    }
+    
+    return json_response({
+        'success': True,
+        'statistics': combined_stats,
+        'detailed_stats': {
+            'realtime_service': service_stats,
+            'trigger_manager': trigger_stats,
+            'adaptive_state': adaptive_state
+        },
+        'timestamp': cached_iso_now()
+    })
+
+
+def _health_template(raspi_connected, realtime_service_running, trigger_manager_active):
+    """建立指定服務狀態組合的 /health 回應模板，請求時只填入時間戳記"""
+    return json_template({
+        'success': True,
+        'health': {
+            'raspi_connected': raspi_connected,
+            'realtime_service_running': realtime_service_running,
+            'trigger_manager_active': trigger_manager_active,
+            'overall_healthy': raspi_connected and realtime_service_running and trigger_manager_active
+        },
+        'timestamp': TEMPLATE_SLOT
+    })
+
+
+_HEALTH_TEMPLATES = {flags: _health_template(*flags)
+                     for flags in product((False, True), repeat=3)}
 
 
 @realtime_api_bp.route('/health')
 def health_check():
-    """即時監控系統健康檢查"""
-    try:
-        # 快速健康檢查
-        raspi_client = get_raspi_client()
-        real_time_service = get_real_time_service()
-        trigger_manager = get_trigger_manager()
-        
-        health_status = {
-            'raspi_connected': raspi_client.is_connected,
-            'realtime_service_running': real_time_service.is_running,
-            'trigger_manager_active': trigger_manager.is_active,
-            'overall_healthy': False
-        }
-        
-        # 綜合健康評估
-        health_status['overall_healthy'] = (
-            health_status['raspi_connected'] and 
-            health_status['realtime_service_running'] and 
-            health_status['trigger_manager_active']
-        )
-        
-        status_code = 200 if health_status['overall_healthy'] else 503
-        
-        return jsonify({
-            'success': True,
-            'health': health_status,
-            'timestamp': datetime.now().isoformat()
-        }), status_code
-        
-    except Exception as e:
-        logger.error(f"健康檢查失敗: {e}")
-        return jsonify({
-            'success': False,
-            'error': str(e),
-            'timestamp': datetime.now().isoformat()
-        }), 500
+    """
+    即時監控系統健康檢查（供負載平衡/探針使用）
+
+    只讀取三個服務旗標，不查詢任何狀態物件；需要完整評估時使用 /health/detailed。
+    """
+    # 快速健康檢查：三個旗標的組合對應預先建立的回應模板
+    flags = (bool(raspi_client.is_connected),
+             bool(real_time_service.is_running),
+             bool(trigger_manager.is_active))
+    
+    # 綜合健康評估
+    status_code = 200 if all(flags) else 503
+    
+    return json_bytes_response(
+        _HEALTH_TEMPLATES[flags] % prebuilt_json(cached_iso_now()), status_code)
+
+
+@realtime_api_bp.route('/health/detailed')
+@_poll_cached
+def health_check_detailed():
+    """即時監控系統詳細健康評估（含各元件狀態、問題與建議）"""
+    raspi_connection = raspi_client.get_connection_status()
+    trigger_status = trigger_manager.get_status()
+    realtime_service_status = trigger_status['real_time_service_status']
+    
+    health = _assess_system_health(raspi_connection, realtime_service_status, trigger_status)
+    healthy = (raspi_connection.get('connected', False)
+               and realtime_service_status.get('running', False)
+               and trigger_status.get('active', False))
+    
+    return json_response({
+        'success': True,
+        'healthy': bool(healthy),
+        'health': health,
+        'components': {
+            'raspi_connection': raspi_connection,
+            'realtime_service': {
+                'running': realtime_service_status.get('running', False),
+                'uptime_seconds': realtime_service_status.get('uptime_seconds'),
+                'last_successful_check': realtime_service_status.get('last_successful_check')
+            },
+            'trigger_manager': {
+                'active': trigger_status.get('active', False),
+                'scan_in_progress': trigger_status.get('scan_in_progress', False),
+                'last_scan_time': trigger_status.get('last_scan_time')
+            }
+        },
+        'timestamp': cached_iso_now()
+    }, 200 if healthy else 503)
+
+
+@realtime_api_bp.route('/services/reload', methods=['POST'])
+def reload_realtime_services():
+    """重新綁定服務單例（服務實例被重建後使用）"""
+    reload_services()
+    return json_response({
+        'success': True,
+        'message': '即時監控服務實例已重新綁定',
+        'timestamp': cached_iso_now()
+    })
+
+
+# 健康評分：各元件正常時的得分，以及評分門檻 (30/50/70/90) 對應的狀態
+_RASPI_WEIGHT = 30
+_SERVICE_WEIGHT = 35
+_TRIGGER_WEIGHT = 35
+_STATUS_THRESHOLDS = (30, 50, 70, 90)
+_STATUS_LABELS = tuple(map(sys.intern, ('critical', 'poor', 'fair', 'good', 'excellent')))
+
+# 健康評估的固定問題/建議字串，各回應共用同一物件
+_ISSUE_RASPI = sys.intern('RAS_pi 連接中斷')
+_ISSUE_SERVICE = sys.intern('即時資料服務未運行')
+_ISSUE_TRIGGER = sys.intern('智能觸發管理器未啟動')
+_RECOMMEND_RASPI = sys.intern('檢查網路連接和 RAS_pi 服務狀態')
+_RECOMMEND_SERVICE = sys.intern('啟動即時資料監控服務')
+_RECOMMEND_NETWORK = sys.intern('檢查網路穩定性和 RAS_pi 服務狀態')
+_RECOMMEND_TRIGGER = sys.intern('啟動智能 UART 觸發管理器')
 
 
 def _assess_system_health(raspi_connection: Dict, realtime_status: Dict, trigger_status: Dict) -> Dict:
     """評估系統整體健康狀態"""
-    health = {
-        'status': 'unknown',
-        'score': 0,
-        'issues': [],
-        'recommendations': []
-    }
+    raspi_ok = bool(raspi_connection.get('connected', False))
+    service_ok = bool(realtime_status.get('running', False))
+    trigger_ok = bool(trigger_status.get('active', False))
+    
+    score = (raspi_ok * _RASPI_WEIGHT + service_ok * _SERVICE_WEIGHT
+             + trigger_ok * _TRIGGER_WEIGHT)
+    
+    issues = []
+    recommendations = []
     
     # RAS_pi 連接評估
-    if not raspi_connection.get('connected', False):
-        health['issues'].append('RAS_pi 連接中斷')
-        health['recommendations'].append('檢查網路連接和 RAS_pi 服務狀態')
-    else:
-        health['score'] += 30
+    if not raspi_ok:
+        issues.append(_ISSUE_RASPI)
+        recommendations.append(_RECOMMEND_RASPI)
     
     # 即時服務評估
-    if not realtime_status.get('running', False):
-        health['issues'].append('即時資料服務未運行')
-        health['recommendations'].append('啟動即時資料監控服務')
+    if not service_ok:
+        issues.append(_ISSUE_SERVICE)
+        recommendations.append(_RECOMMEND_SERVICE)
     else:
-        health['score'] += 35
-        
         # 檢查服務品質
         stats = realtime_status.get('stats', {})
         total_checks = stats.get('total_checks', 0)
-        successful_checks = stats.get('successful_checks', 0)
-        
         if total_checks > 0:
-            success_rate = successful_checks / total_checks
+            success_rate = stats.get('successful_checks', 0) / total_checks
             if success_rate < 0.8:
-                health['issues'].append(f'即時服務成功率偏低 ({success_rate:.1%})')
-                health['recommendations'].append('檢查網路穩定性和 RAS_pi 服務狀態')
+                issues.append(f'即時服務成功率偏低 ({success_rate:.1%})')
+                recommendations.append(_RECOMMEND_NETWORK)
     
     # 觸發管理器評估
-    if not trigger_status.get('active', False):
-        health['issues'].append('智能觸發管理器未啟動')
-        health['recommendations'].append('啟動智能 UART 觸發管理器')
-    else:
-        health['score'] += 35
-    
-    # 綜合評分
-    if health['score'] >= 90:
-        health['status'] = 'excellent'
-    elif health['score'] >= 70:
-        health['status'] = 'good'
-    elif health['score'] >= 50:
-        health['status'] = 'fair'
-    elif health['score'] >= 30:
-        health['status'] = 'poor'
-    else:
-        health['status'] = 'critical'
+    if not trigger_ok:
+        issues.append(_ISSUE_TRIGGER)
+        recommendations.append(_RECOMMEND_TRIGGER)
     
-    return health
+    return {
+        'status': _STATUS_LABELS[bisect_right(_STATUS_THRESHOLDS, score)],
+        'score': score,
+        'issues': issues,
+        'recommendations': recommendations
+    }
 
 
 # 控制器初始化函數
@@ -572,13 +702,11 @@ def init_realtime_api_controller():
     
     try:
         # 嘗試初始化各個服務（但不自動啟動）
-        get_raspi_client()
-        get_real_time_service()
-        get_trigger_manager()
+        reload_services()
         
         logger.info("即時監控服務組件初始化完成")
         return True
         
     except Exception as e:
-        logger.error(f"即時監控 API 控制器初始化失敗: {e}")
+        logger.error("即時監控 API 控制器初始化失敗: %s", e)
         return False
\ No newline at end of file
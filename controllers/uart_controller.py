@@ -3,11 +3,14 @@ UART 控制器
 處理 UART 相關的路由和邏輯
 """
 
-from flask import Blueprint, request, jsonify, Response
+from flask import Blueprint, request, jsonify
 import logging
-import json
+import queue
 from datetime import datetime
 from models import UartDataModel
+from utils.cache_utils import TTLCache
+from utils.sse_utils import open_event_stream
+from views.api_responses import json_bytes_response, json_response, prebuilt_json
 
 # 創建 Blueprint
 uart_bp = Blueprint('uart', __name__, url_prefix='/api/uart')
@@ -15,10 +18,46 @@ uart_bp = Blueprint('uart', __name__, url_prefix='/api/uart')
 # 初始化模型
 uart_model = UartDataModel()
 
-# 全域變數（這些應該從原始程式碼移過來）
+# 全域變數（由 init_controller 注入）
 uart_reader = None
 protocol_manager = None
 
+# SSE 無新資料時送出 keep-alive 註解的間隔秒數（同時用來偵測用戶端斷線）
+STREAM_KEEPALIVE_SECONDS = 15
+_SSE_KEEPALIVE = b': keep-alive\n\n'
+
+# 串口列舉需走訪系統裝置，短時間內的重複查詢共用同一份已序列化的結果
+PORTS_CACHE_TTL = 2
+
+_ports_cache = TTLCache(PORTS_CACHE_TTL, maxsize=1)
+
+# 全部 MAC 的通道彙總；接收到新數據時清除，讓新的 MAC ID 立即出現
+MAC_CHANNELS_CACHE_TTL = 10
+
+_mac_channels_cache = TTLCache(MAC_CHANNELS_CACHE_TTL, maxsize=1)
+
+def init_controller(uart_reader_instance, protocol_manager_instance=None):
+    """初始化控制器"""
+    global uart_reader, protocol_manager
+    uart_reader = uart_reader_instance
+    protocol_manager = protocol_manager_instance
+
+
+def _get_uart_reader():
+    """取得 UART 讀取器；未經 init_controller 注入時改由 uart_integrated 取得"""
+    if uart_reader is not None:
+        return uart_reader
+    try:
+        from uart_integrated import uart_reader as reader
+    except ImportError:
+        return None
+    return reader
+
+
+# 接收 UART 數據時每筆必須包含的欄位
+_REQUIRED_FIELDS_ORDER = ('mac_id', 'timestamp')
+_REQUIRED_FIELDS = frozenset(_REQUIRED_FIELDS_ORDER)
+
 
 @uart_bp.route('/status')
 def api_uart_status():
@@ -91,22 +130,24 @@ def api_uart_mac_channels(mac_id=None):
                 }
             })
         else:
-            # 獲取所有 MAC ID 的通道資訊
-            mac_ids = uart_model.get_mac_ids()
-            mac_channels = {}
-            
-            for mid in mac_ids:
-                channels = uart_model.get_mac_channels(mid)
-                mac_channels[mid] = {
-                    'channels': channels,
-                    'channel_count': len(channels)
+            # 獲取所有 MAC ID 的通道資訊（單次掃描，結果快取 MAC_CHANNELS_CACHE_TTL 秒）
+            body = _mac_channels_cache.get('body')
+            if body is None:
+                mac_channels = {
+                    mid: {
+                        'channels': channels,
+                        'channel_count': len(channels)
+                    }
+                    for mid, channels in uart_model.get_all_mac_channels().items()
                 }
+                body = prebuilt_json({
+                    'success': True,
+                    'data': mac_channels,
+                    'total_mac_count': len(mac_channels)
+                })
+                _mac_channels_cache.set('body', body)
             
-            return jsonify({
-                'success': True,
-                'data': mac_channels,
-                'total_mac_count': len(mac_ids)
-            })
+            return json_bytes_response(body)
         
     except Exception as e:
         logging.error(f"獲取MAC通道資訊時發生錯誤: {e}")
@@ -128,30 +169,25 @@ def api_uart_mac_data(mac_id):
         if limit > 50000:
             limit = 50000
         
-        # 獲取數據
-        data_result = uart_model.get_uart_data_from_files(mac_id=mac_id, limit=limit)
-        
-        if not data_result['success']:
-            return jsonify(data_result), 400
-        
-        # 如果指定了通道，進行額外過濾
+        # 先驗證通道號，無效時不讀取任何檔案
+        channel_num = None
         if channel:
-            try:
-                channel_num = int(channel)
-                filtered_data = []
-                for record in data_result['data']:
-                    if record.get('channel') == channel_num:
-                        filtered_data.append(record)
-                data_result['data'] = filtered_data
-                data_result['total_count'] = len(filtered_data)
-                data_result['channel_filter'] = channel_num
-            except ValueError:
+            if not (channel.isascii() and channel.isdigit()):
                 return jsonify({
                     'success': False,
                     'error': f'無效的通道號: {channel}'
                 }), 400
+            channel_num = int(channel)
+        
+        # 獲取數據（通道過濾在讀檔時進行）
+        data_result = uart_model.get_uart_data_from_files(mac_id=mac_id, limit=limit,
+                                                          channel=channel_num)
+        
+        if not data_result['success']:
+            return jsonify(data_result), 400
         
-        return jsonify(data_result)
+        # 最多 50000 筆，直接以 orjson 序列化為 bytes 回應
+        return json_response(data_result)
         
     except Exception as e:
         logging.error(f"獲取MAC數據時發生錯誤: {e}")
@@ -194,13 +230,13 @@ def api_uart_test():
 
 @uart_bp.route('/ports')
 def api_uart_ports():
-    """獲取可用的串口列表"""
+    """獲取可用的串口列表（列舉結果快取 PORTS_CACHE_TTL 秒）"""
     try:
-        import serial.tools.list_ports
-        
-        ports = []
-        for port in serial.tools.list_ports.comports():
-            ports.append({
+        body = _ports_cache.get('body')
+        if body is None:
+            import serial.tools.list_ports
+            
+            ports = [{
                 'device': port.device,
                 'description': port.description,
                 'hwid': port.hwid,
@@ -208,13 +244,16 @@ def api_uart_ports():
                 'pid': port.pid,
                 'serial_number': port.serial_number,
                 'manufacturer': port.manufacturer
+            } for port in serial.tools.list_ports.comports()]
+            
+            body = prebuilt_json({
+                'success': True,
+                'data': ports,
+                'total_count': len(ports)
             })
+            _ports_cache.set('body', body)
         
-        return jsonify({
-            'success': True,
-            'data': ports,
-            'total_count': len(ports)
-        })
+        return json_bytes_response(body)
         
     except ImportError:
         return jsonify({
@@ -333,32 +372,39 @@ def api_uart_diagnostic():
 
 @uart_bp.route('/stream')
 def api_uart_stream():
-    """UART 數據流"""
+    """UART 數據流 (Server-Sent Events，有新資料時才推送)"""
     try:
+        reader = _get_uart_reader()
+        if not hasattr(reader, 'subscribe'):
+            # 沒有 UART 讀取器就不會有資料，不佔用工作執行緒維持空的連線
+            return jsonify({
+                'success': False,
+                'error': 'UART 讀取器不可用'
+            }), 503
+        
         def generate_uart_stream():
-            """生成UART數據流"""
-            # 這裡應該實現實際的數據流邏輯
-            # 暫時返回模擬數據
-            import time
-            
-            while True:
-                # 獲取最新數據
-                latest_data = uart_model.safe_get_uart_data(uart_reader)
-                
-                if latest_data:
-                    for data_point in latest_data[-5:]:  # 只發送最近5筆數據
-                        yield f"data: {json.dumps(data_point)}\n\n"
-                
-                time.sleep(1)  # 每秒更新一次
-        
-        return Response(
-            generate_uart_stream(),
-            mimetype='text/plain',
-            headers={
-                'Cache-Control': 'no-cache',
-                'Connection': 'keep-alive'
-            }
-        )
+            """生成UART數據流：阻塞等待訂閱佇列，逾時送出 keep-alive 以偵測斷線"""
+            subscriber = reader.subscribe()
+            try:
+                while True:
+                    try:
+                        data_point = subscriber.get(timeout=STREAM_KEEPALIVE_SECONDS)
+                    except queue.Empty:
+                        yield _SSE_KEEPALIVE
+                        continue
+                    yield b'data: ' + prebuilt_json(data_point) + b'\n\n'
+            finally:
+                # 用戶端斷線 (GeneratorExit) 時取消訂閱
+                reader.unsubscribe(subscriber)
+        
+        # 與其他 SSE 端點共用連線上限；連線到期後前端自動重連
+        response = open_event_stream(generate_uart_stream())
+        if response is None:
+            return jsonify({
+                'success': False,
+                'error': '即時串流連線數已達上限，請稍後再試'
+            }), 503
+        return response
         
     except Exception as e:
         logging.error(f"UART數據流時發生錯誤: {e}")
@@ -417,14 +463,15 @@ def api_uart_receive_data():
             }), 400
         
         # 驗證數據格式
-        required_fields = ['mac_id', 'timestamp']
-        for field in required_fields:
+        for field in _REQUIRED_FIELDS_ORDER:
             if field not in data:
                 return jsonify({
                     'success': False,
                     'error': f'缺少必要字段: {field}'
                 }), 400
         
+        _mac_channels_cache.invalidate()
+        
         # 處理接收到的數據
         processed_data = {
             'received_time': datetime.now().isoformat(),
@@ -466,22 +513,13 @@ def api_uart_receive_batch():
                 'error': '批次數據格式錯誤'
             }), 400
         
-        processed_count = 0
-        errors = []
+        _mac_channels_cache.invalidate()
         
-        for i, item in enumerate(batch_data):
-            try:
-                # 驗證每個數據項目
-                if 'mac_id' not in item or 'timestamp' not in item:
-                    errors.append(f'項目 {i}: 缺少必要字段')
-                    continue
-                
-                # 處理數據項目
-                processed_count += 1
-                
-            except Exception as e:
-                errors.append(f'項目 {i}: {str(e)}')
-                continue
+        # 一次走訪驗證所有項目；不是物件的項目另外標示格式錯誤
+        errors = [f'項目 {i}: 缺少必要字段' if isinstance(item, dict) else f'項目 {i}: 數據格式錯誤'
+                  for i, item in enumerate(batch_data)
+                  if not (isinstance(item, dict) and _REQUIRED_FIELDS <= item.keys())]
+        processed_count = len(batch_data) - len(errors)
         
         return jsonify({
             'success': True,
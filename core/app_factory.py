@@ -27,6 +27,10 @@ def create_app(config=None):
     # 配置應用程式
     configure_app(app, config)
     
+    # 以 orjson 處理 jsonify / get_json（未安裝時沿用預設）
+    from utils.json_provider import install_json_provider
+    install_json_provider(app)
+    
     # 設定日誌
     configure_logging(app)
     
@@ -91,6 +95,10 @@ def configure_logging(app):
             ]
         )
     
+    # 日誌寫入交由背景執行緒處理，避免檔案 I/O 阻塞請求
+    from utils.logging_utils import enable_queue_logging
+    enable_queue_logging()
+    
     app.logger.info('Dashboard 應用程式日誌系統已初始化')
 
 
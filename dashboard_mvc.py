@@ -120,6 +120,12 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+# 日誌寫入交由背景執行緒處理，避免檔案 I/O 阻塞請求
+from utils.logging_utils import enable_queue_logging
+from utils.json_provider import install_json_provider
+from utils.server_utils import run_app
+enable_queue_logging()
+
 # === 安全導入管理器 ===
 class SafeImportManager:
     """安全導入管理器，處理可選依賴的導入"""
@@ -205,6 +211,9 @@ def create_app() -> Flask:
         'SEND_FILE_MAX_AGE_DEFAULT': 300,  # 5 minutes cache for static files
     })
     
+    # 以 orjson 處理 jsonify / get_json（未安裝時沿用預設）
+    install_json_provider(app)
+    
     # 註冊錯誤處理器
     register_error_handlers(app)
     
@@ -307,6 +316,13 @@ def register_blueprints(app: Flask):
         except:
             pass  # 多協定控制器可選
         
+        # 即時監控 API (RAS_pi 服務模組不可用時略過)
+        try:
+            from controllers.realtime_api_controller import realtime_api_bp
+            app.register_blueprint(realtime_api_bp)  # /api/realtime/*
+        except ImportError as e:
+            logger.warning(f"即時監控 API 不可用: {e}")
+        
         logger.info("所有 Blueprint 已註冊 (與 RAS_pi 系統同步)")
         
         # 顯示註冊的路由 (調試用)
@@ -386,6 +402,13 @@ def initialize_components():
     except ImportError as e:
         logger.warning(f"UART 讀取器不可用: {e}")
     
+    # UART API 控制器的即時數據流需要讀取器推送新資料
+    try:
+        from controllers.uart_controller import init_controller as init_uart_controller
+        init_uart_controller(uart_reader)
+    except ImportError as e:
+        logger.warning(f"UART API 控制器初始化失敗: {e}")
+    
     # 初始化服務層
     uart_service = None
     try:
@@ -625,12 +648,7 @@ def main():
         print("=" * 60)
         
         # 啟動 Flask 應用程式
-        app.run(
-            host=config.HOST,
-            port=config.PORT,
-            debug=config.DEBUG,
-            threaded=True
-        )
+        run_app(app, config.HOST, config.PORT, debug=config.DEBUG)
         
     except KeyboardInterrupt:
         logger.info("接收到中斷信號，正在關閉服務...")
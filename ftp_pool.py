@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+FTP 連線池
+依 (server, port, username) 重用已登入的 FTP 連線，省去每次上傳都重新連線、登入的開銷
+"""
+
+import ftplib
+import hashlib
+import logging
+import queue
+import socket
+import threading
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Dict, Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+PoolKey = Tuple[str, int, str, bytes]
+
+# 傳輸用的 socket 緩衝區與 storbinary 區塊大小 (256 KB)
+SOCKET_BUFFER_SIZE = 262144
+UPLOAD_BLOCKSIZE = 262144
+
+
+def _tune_socket(sock: socket.socket) -> None:
+    """加大收發緩衝區並關閉 Nagle 演算法，避免大檔傳輸受限於預設視窗"""
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, SOCKET_BUFFER_SIZE)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, SOCKET_BUFFER_SIZE)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    except OSError as e:
+        logger.debug("無法調整 FTP socket 參數: %s", e)
+
+
+@lru_cache(maxsize=64)
+def parse_response(raw: str) -> Tuple[int, str]:
+    """
+    將 FTP 回應 (例如 "226 Transfer complete") 拆成 (狀態碼, 訊息)
+
+    伺服器回應高度重複，以 LRU 快取直接重用解析結果；無法辨識狀態碼時回傳 0。
+    """
+    code = raw[:3]
+    if not code.isdigit():
+        return 0, raw.rstrip('\r\n')
+    return int(code), raw[4:].rstrip('\r\n')
+
+
+def _pool_key(server: str, port: int, username: str, password: str) -> PoolKey:
+    """連線組鍵值；密碼只保留摘要，變更密碼後不會誤用以舊密碼登入的連線"""
+    digest = hashlib.blake2b(password.encode('utf-8'), digest_size=16).digest()
+    return server, int(port), username, digest
+
+
+class TunedFTP(ftplib.FTP):
+    """
+    控制連線與每條資料連線都套用 _tune_socket 的 FTP 用戶端
+
+    將 transcript 設為 list 時會記錄控制連線的收發內容 (密碼以 **** 遮蔽)，
+    每條連線同時只有一個借用者，因此記錄不會與其他請求混在一起。
+    """
+
+    transcript = None
+
+    def putline(self, line):
+        if self.transcript is not None:
+            self.transcript.append('> ' + ('PASS ****' if line[:5].upper() == 'PASS ' else line))
+        super().putline(line)
+
+    def getline(self):
+        line = super().getline()
+        if self.transcript is not None:
+            self.transcript.append('< ' + line)
+        return line
+
+    def connect(self, *args, **kwargs):
+        welcome = super().connect(*args, **kwargs)
+        _tune_socket(self.sock)
+        return welcome
+
+    def ntransfercmd(self, cmd, rest=None):
+        conn, size = super().ntransfercmd(cmd, rest)
+        _tune_socket(conn)
+        return conn, size
+
+
+class FTPConnectionPool:
+    """
+    FTP 連線池
+
+    每組 (server, port, username, 密碼摘要) 各有一個佇列保存閒置連線；
+    背景執行緒定期關閉閒置超過 idle_timeout 的連線。
+    新連線一律使用被動模式。
+    """
+
+    def __init__(self, max_idle_per_key: int = 4, idle_timeout: float = 60,
+                 connect_timeout: float = 30, keepalive_check: float = 10):
+        """
+        初始化連線池
+
+        Args:
+            max_idle_per_key: 每組連線最多保留的閒置連線數
+            idle_timeout: 閒置超過此秒數的連線由背景執行緒關閉
+            connect_timeout: 建立連線的逾時秒數
+            keepalive_check: 閒置超過此秒數的連線在借出前先以 NOOP 確認仍可用
+        """
+        self.max_idle_per_key = max_idle_per_key
+        self.idle_timeout = idle_timeout
+        self.connect_timeout = connect_timeout
+        self.keepalive_check = keepalive_check
+        self._pools: Dict[PoolKey, queue.LifoQueue] = {}
+        self._lock = threading.Lock()
+        self._reaper = None
+
+    def _get_queue(self, key: PoolKey) -> queue.LifoQueue:
+        """取得 (必要時建立) 指定連線組的閒置佇列"""
+        with self._lock:
+            idle = self._pools.get(key)
+            if idle is None:
+                idle = self._pools[key] = queue.LifoQueue(self.max_idle_per_key)
+            if self._reaper is None:
+                self._reaper = threading.Thread(target=self._reap_loop,
+                                                name='ftp-pool-reaper', daemon=True)
+                self._reaper.start()
+            return idle
+
+    def _connect(self, key: PoolKey, password: str, timeout: float) -> ftplib.FTP:
+        """建立新的 FTP 連線並登入"""
+        server, port, username, _ = key
+        ftp = TunedFTP()
+        ftp.connect(server, port, timeout=timeout)
+        ftp.login(username, password)
+        ftp.set_pasv(True)
+        ftp._pool_key = key
+        logger.debug("FTP 連線池建立新連線: %s:%s (%s)", server, port, username)
+        return ftp
+
+    @staticmethod
+    def _close(ftp: ftplib.FTP) -> None:
+        """關閉連線，忽略已斷線造成的錯誤"""
+        try:
+            ftp.quit()
+        except Exception:
+            ftp.close()
+
+    @staticmethod
+    def _set_timeout(ftp: ftplib.FTP, timeout: float) -> None:
+        """設定控制連線與之後資料連線的逾時秒數"""
+        ftp.timeout = timeout
+        if ftp.sock is not None:
+            ftp.sock.settimeout(timeout)
+
+    def get_ftp(self, server: str, port: int, username: str, password: str,
+                timeout: Optional[float] = None) -> ftplib.FTP:
+        """
+        借出一條已登入的連線，優先重用閒置連線
+
+        使用完畢須呼叫 release()；連線發生錯誤時改呼叫 discard()。
+
+        Args:
+            timeout: 本次借用的連線/讀取逾時秒數，預設為 connect_timeout
+        """
+        timeout = self.connect_timeout if timeout is None else timeout
+        key = _pool_key(server, port, username, password)
+        idle = self._get_queue(key)
+        now = time.monotonic()
+
+        while True:
+            try:
+                ftp, last_used = idle.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                self._set_timeout(ftp, timeout)
+                if now - last_used >= self.keepalive_check:
+                    ftp.voidcmd('NOOP')
+                return ftp
+            except Exception:
+                self._close(ftp)
+
+        return self._connect(key, password, timeout)
+
+    def release(self, ftp: ftplib.FTP) -> None:
+        """歸還連線；閒置佇列已滿時直接關閉"""
+        key = getattr(ftp, '_pool_key', None)
+        if key is None:
+            self._close(ftp)
+            return
+        try:
+            self._set_timeout(ftp, self.connect_timeout)
+            self._get_queue(key).put_nowait((ftp, time.monotonic()))
+        except (queue.Full, OSError):
+            self._close(ftp)
+
+    def discard(self, ftp: ftplib.FTP) -> None:
+        """丟棄狀態不明的連線（例如傳輸中發生錯誤）"""
+        self._close(ftp)
+
+    @contextmanager
+    def borrow(self, server: str, port: int, username: str, password: str,
+               timeout: Optional[float] = None) -> Iterator[ftplib.FTP]:
+        """以 with 區塊借用連線：正常結束時歸還，發生例外 (含 ftplib.error_*) 時丟棄"""
+        ftp = self.get_ftp(server, port, username, password, timeout)
+        try:
+            yield ftp
+        except BaseException:
+            self.discard(ftp)
+            raise
+        else:
+            self.release(ftp)
+
+    def _reap_loop(self) -> None:
+        """背景執行緒：關閉閒置過久的連線"""
+        interval = max(self.idle_timeout / 4, 1)
+        while True:
+            time.sleep(interval)
+            try:
+                self.reap_idle()
+            except Exception as e:
+                logger.warning("FTP 連線池清理失敗: %s", e)
+
+    def reap_idle(self) -> int:
+        """
+        關閉閒置超過 idle_timeout 的連線
+
+        Returns:
+            int: 關閉的連線數
+        """
+        with self._lock:
+            pools = list(self._pools.values())
+
+        deadline = time.monotonic() - self.idle_timeout
+        closed = 0
+        for idle in pools:
+            keep = []
+            while True:
+                try:
+                    item = idle.get_nowait()
+                except queue.Empty:
+                    break
+                if item[1] < deadline:
+                    self._close(item[0])
+                    closed += 1
+                else:
+                    keep.append(item)
+            for ftp, last_used in reversed(keep):
+                try:
+                    idle.put_nowait((ftp, last_used))
+                except queue.Full:
+                    self._close(ftp)
+
+        if closed:
+            logger.debug("FTP 連線池關閉 %d 條閒置連線", closed)
+        return closed
+
+
+# 全域連線池實例
+ftp_pool = FTPConnectionPool()
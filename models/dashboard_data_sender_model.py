@@ -235,4 +235,37 @@ class DashboardDataSenderModel:
         
     def send_batch_data(self, data_list):
         """批量發送資料"""
-        return self.sender.send_batch_data(data_list)
\ No newline at end of file
+        return self.sender.send_batch_data(data_list)
+
+
+# 全域資料發送器：啟動與停止 UART 時必須操作同一個實例
+_dashboard_sender = None
+_dashboard_sender_lock = threading.Lock()
+
+
+def get_dashboard_sender():
+    """獲取全域資料發送器實例（第一次呼叫時建立）"""
+    global _dashboard_sender
+    if _dashboard_sender is None:
+        with _dashboard_sender_lock:
+            if _dashboard_sender is None:
+                _dashboard_sender = DashboardDataSenderModel().get_sender()
+    return _dashboard_sender
+
+
+def reset_dashboard_sender():
+    """
+    設定變更後重設資料發送器
+
+    發送服務執行中時就地重新載入 Dashboard 設定，避免留下無法停止的發送執行緒；
+    未執行時捨棄實例，下次取用時重新建立。
+    """
+    global _dashboard_sender
+    with _dashboard_sender_lock:
+        sender = _dashboard_sender
+        if sender is None:
+            return
+        if sender.is_running:
+            sender.load_dashboard_config()
+        else:
+            _dashboard_sender = None
@@ -7,6 +7,7 @@ import os
 import csv
 import glob
 import logging
+import threading
 from datetime import datetime
 from typing import List, Dict, Any, Optional
 
@@ -17,6 +18,33 @@ class UartDataModel:
     def __init__(self):
         self.current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
         self.history_dir = os.path.join(self.current_dir, 'History')
+        
+        # MAC ID / 通道快取，以 History 目錄的檔案簽章 (檔案數, 最大 mtime) 失效
+        self._cache_lock = threading.Lock()
+        self._mac_ids_cache = None
+        self._mac_channels_cache = {}
+        self._all_mac_channels_cache = None
+    
+    def _get_files_signature(self):
+        """以單次 os.scandir 取得 UART 數據檔案的簽章，目錄不存在時回傳 None"""
+        try:
+            file_count = 0
+            latest_mtime = 0
+            with os.scandir(self.history_dir) as entries:
+                for entry in entries:
+                    if entry.name.startswith('uart_data_') and entry.name.endswith('.csv'):
+                        file_count += 1
+                        latest_mtime = max(latest_mtime, entry.stat().st_mtime_ns)
+            return file_count, latest_mtime
+        except OSError:
+            return None
+    
+    def invalidate_cache(self):
+        """清除 MAC ID 與通道快取"""
+        with self._cache_lock:
+            self._mac_ids_cache = None
+            self._mac_channels_cache.clear()
+            self._all_mac_channels_cache = None
     
     def safe_get_uart_data(self, uart_reader=None):
         """安全地獲取UART數據"""
@@ -28,8 +56,13 @@ class UartDataModel:
             logging.warning(f"獲取UART數據時發生錯誤: {e}")
             return []
     
-    def get_uart_data_from_files(self, mac_id: Optional[str] = None, limit: int = 10000) -> Dict[str, Any]:
-        """從History資料夾的CSV文件中讀取UART數據"""
+    def get_uart_data_from_files(self, mac_id: Optional[str] = None, limit: int = 10000,
+                                 channel: Optional[int] = None) -> Dict[str, Any]:
+        """
+        從History資料夾的CSV文件中讀取UART數據
+
+        指定 channel 時在讀檔階段就略過其他通道，limit 代表符合條件的筆數。
+        """
         try:
             if not os.path.exists(self.history_dir):
                 return {
@@ -75,7 +108,7 @@ class UartDataModel:
                     break
                 
                 try:
-                    file_data = self._read_csv_file(file_path, mac_id, limit - total_count)
+                    file_data = self._read_csv_file(file_path, mac_id, limit - total_count, channel)
                     all_data.extend(file_data)
                     total_count = len(all_data)
                     
@@ -95,7 +128,8 @@ class UartDataModel:
                 'data': all_data,
                 'total_count': len(all_data),
                 'files_read': len(priority_files),
-                'mac_filter': mac_id
+                'mac_filter': mac_id,
+                'channel_filter': channel
             }
             
         except Exception as e:
@@ -106,10 +140,39 @@ class UartDataModel:
                 'data': []
             }
     
-    def _read_csv_file(self, file_path: str, mac_id: Optional[str] = None, limit: int = 10000) -> List[Dict[str, Any]]:
+    def _read_csv_file(self, file_path: str, mac_id: Optional[str] = None, limit: int = 10000,
+                       channel: Optional[int] = None) -> List[Dict[str, Any]]:
         """讀取單個CSV文件"""
         data = []
         
+        for row_count, row in enumerate(self._iter_csv_rows(file_path)):
+            if len(data) >= limit:
+                break
+            
+            try:
+                # 如果指定了MAC ID，進行過濾
+                if mac_id and row.get('mac_id') != mac_id:
+                    continue
+                
+                # 清理和標準化數據
+                cleaned_row = self._clean_csv_row(row)
+                if not cleaned_row:
+                    continue
+                
+                # 如果指定了通道，只保留該通道的數據
+                if channel is not None and cleaned_row.get('channel') != channel:
+                    continue
+                
+                data.append(cleaned_row)
+                    
+            except Exception as e:
+                logging.debug(f"處理CSV行時發生錯誤 (行 {row_count}): {e}")
+                continue
+        
+        return data
+    
+    def _iter_csv_rows(self, file_path: str):
+        """逐行讀取CSV文件（自動偵測分隔符），不在記憶體中保留整個檔案"""
         with open(file_path, 'r', encoding='utf-8', errors='ignore') as csvfile:
             # 嘗試自動偵測CSV格式
             sample = csvfile.read(1024)
@@ -122,27 +185,7 @@ class UartDataModel:
             except:
                 delimiter = ','
             
-            reader = csv.DictReader(csvfile, delimiter=delimiter)
-            
-            for row_count, row in enumerate(reader):
-                if len(data) >= limit:
-                    break
-                
-                try:
-                    # 如果指定了MAC ID，進行過濾
-                    if mac_id and row.get('mac_id') != mac_id:
-                        continue
-                    
-                    # 清理和標準化數據
-                    cleaned_row = self._clean_csv_row(row)
-                    if cleaned_row:
-                        data.append(cleaned_row)
-                        
-                except Exception as e:
-                    logging.debug(f"處理CSV行時發生錯誤 (行 {row_count}): {e}")
-                    continue
-        
-        return data
+            yield from csv.DictReader(csvfile, delimiter=delimiter)
     
     def _clean_csv_row(self, row: Dict[str, str]) -> Optional[Dict[str, Any]]:
         """清理和標準化CSV行數據"""
@@ -203,7 +246,20 @@ class UartDataModel:
             return None
     
     def get_mac_ids(self) -> List[str]:
-        """獲取所有可用的MAC ID"""
+        """獲取所有可用的MAC ID (檔案未變動時使用快取)"""
+        signature = self._get_files_signature()
+        with self._cache_lock:
+            cached = self._mac_ids_cache
+        if cached is not None and cached[0] == signature:
+            return list(cached[1])
+        
+        mac_ids = self._load_mac_ids()
+        with self._cache_lock:
+            self._mac_ids_cache = (signature, mac_ids)
+        return list(mac_ids)
+    
+    def _load_mac_ids(self) -> List[str]:
+        """從數據檔案掃描所有MAC ID"""
         try:
             data_result = self.get_uart_data_from_files(limit=50000)
             if not data_result['success']:
@@ -221,7 +277,20 @@ class UartDataModel:
             return []
     
     def get_mac_channels(self, mac_id: str) -> List[int]:
-        """獲取指定MAC ID的所有通道"""
+        """獲取指定MAC ID的所有通道 (檔案未變動時使用快取)"""
+        signature = self._get_files_signature()
+        with self._cache_lock:
+            cached = self._mac_channels_cache.get(mac_id)
+        if cached is not None and cached[0] == signature:
+            return list(cached[1])
+        
+        channels = self._load_mac_channels(mac_id)
+        with self._cache_lock:
+            self._mac_channels_cache[mac_id] = (signature, channels)
+        return list(channels)
+    
+    def _load_mac_channels(self, mac_id: str) -> List[int]:
+        """從數據檔案掃描指定MAC ID的所有通道"""
         try:
             data_result = self.get_uart_data_from_files(mac_id=mac_id, limit=10000)
             if not data_result['success']:
@@ -236,4 +305,47 @@ class UartDataModel:
             
         except Exception as e:
             logging.error(f"獲取MAC通道列表時發生錯誤: {e}")
-            return []
\ No newline at end of file
+            return []
+    
+    def get_all_mac_channels(self) -> Dict[str, List[int]]:
+        """獲取所有MAC ID及其通道 {mac_id: [channel, ...]} (檔案未變動時使用快取)"""
+        signature = self._get_files_signature()
+        with self._cache_lock:
+            cached = self._all_mac_channels_cache
+        if cached is not None and cached[0] == signature:
+            return {mac_id: list(channels) for mac_id, channels in cached[1].items()}
+        
+        mac_channels = self._load_all_mac_channels()
+        with self._cache_lock:
+            self._all_mac_channels_cache = (signature, mac_channels)
+        return {mac_id: list(channels) for mac_id, channels in mac_channels.items()}
+    
+    def _load_all_mac_channels(self) -> Dict[str, List[int]]:
+        """
+        逐行掃描所有數據檔案一次，依 MAC ID 分組收集通道
+
+        不設總筆數上限，也不保留資料列，只出現在較舊檔案中的通道同樣會被收錄。
+        """
+        try:
+            csv_files = glob.glob(os.path.join(self.history_dir, 'uart_data_*.csv'))
+            
+            buckets = {}
+            for file_path in csv_files:
+                try:
+                    for row in self._iter_csv_rows(file_path):
+                        cleaned_row = self._clean_csv_row(row)
+                        mac_id = cleaned_row.get('mac_id') if cleaned_row else None
+                        if not mac_id:
+                            continue
+                        channels = buckets.setdefault(mac_id, set())
+                        if isinstance(cleaned_row.get('channel'), int):
+                            channels.add(cleaned_row['channel'])
+                except Exception as e:
+                    logging.warning(f"讀取文件 {file_path} 時發生錯誤: {e}")
+                    continue
+            
+            return {mac_id: sorted(buckets[mac_id]) for mac_id in sorted(buckets)}
+            
+        except Exception as e:
+            logging.error(f"獲取所有MAC通道時發生錯誤: {e}")
+            return {}
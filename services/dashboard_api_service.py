@@ -54,6 +54,10 @@ class DashboardAPIService:
         self.app = Flask(__name__)
         self.app.config['SECRET_KEY'] = 'dashboard-api-secret-key-2024'
         
+        # 以 orjson 處理 jsonify / get_json（未安裝時沿用預設）
+        from utils.json_provider import install_json_provider
+        install_json_provider(self.app)
+        
         # 啟用 CORS 支援
         CORS(self.app, resources={
             r"/api/*": {
@@ -134,14 +138,11 @@ class DashboardAPIService:
         print("🎯 API 服務已就緒，按 Ctrl+C 停止服務")
         print("=" * 60)
         
+        # 非除錯模式下優先使用 waitress（未安裝時沿用開發伺服器）
+        from utils.server_utils import run_app
+        
         try:
-            self.app.run(
-                host=host,
-                port=port,
-                debug=debug,
-                threaded=True,
-                use_reloader=False
-            )
+            run_app(self.app, host, port, debug=debug, use_reloader=False)
         except KeyboardInterrupt:
             print("\n\n⏹️  收到停止信號，正在關閉服務...")
             self.logger.info("Dashboard API 服務正常關閉")
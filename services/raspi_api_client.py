@@ -50,7 +50,9 @@ import json
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple, Any
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import partial
 
 
 @dataclass
@@ -230,6 +232,21 @@ class RaspberryPiApiClient:
         self.logger.info("RAS_pi API 客戶端已關閉")
 
 
+# 聚合器並行呼叫 RAS_pi 各 API 用的執行緒池
+_fanout_executor = ThreadPoolExecutor(max_workers=10, thread_name_prefix='raspi-fanout')
+
+
+def _gather(*calls):
+    """
+    並行執行多個無參數呼叫並依序回傳結果
+
+    彼此獨立的 RAS_pi 請求同時發出，總耗時約為最慢的一個而非全部相加。
+    只可在請求執行緒中呼叫，不可在 _fanout_executor 的工作中巢狀使用。
+    """
+    futures = [_fanout_executor.submit(call) for call in calls]
+    return [future.result() for future in futures]
+
+
 class RaspberryPiDataAggregator:
     """RAS_pi 資料聚合器 - 整合多個 API 呼叫的結果"""
     
@@ -239,6 +256,10 @@ class RaspberryPiDataAggregator:
     
     def get_complete_status(self) -> Dict:
         """獲取完整系統狀態"""
+        return self._complete_status()[0]
+    
+    def _complete_status(self) -> Tuple[Dict, Optional[Tuple[bool, Any]]]:
+        """獲取完整系統狀態，並一併回傳 UART 狀態的原始查詢結果（查詢失敗時為 None）"""
         result = {
             'success': False,
             'timestamp': datetime.now().isoformat(),
@@ -248,27 +269,20 @@ class RaspberryPiDataAggregator:
             'dashboard': {},
             'database': {}
         }
+        uart_response = None
         
         try:
-            # 系統狀態
-            success, system_data = self.client.get_status()
-            if success:
-                result['system'] = system_data
-            
-            # UART 狀態
-            success, uart_data = self.client.get_uart_status()
-            if success:
-                result['uart'] = uart_data
-            
-            # Dashboard 統計
-            success, dashboard_data = self.client.get_dashboard_stats()
-            if success:
-                result['dashboard'] = dashboard_data
-            
-            # 資料庫統計
-            success, db_data = self.client.get_database_statistics()
-            if success:
-                result['database'] = db_data
+            # 系統狀態、UART 狀態、Dashboard 統計、資料庫統計彼此獨立，同時查詢
+            responses = _gather(
+                self.client.get_status,
+                self.client.get_uart_status,
+                self.client.get_dashboard_stats,
+                self.client.get_database_statistics
+            )
+            uart_response = responses[1]
+            for key, (success, data) in zip(('system', 'uart', 'dashboard', 'database'), responses):
+                if success:
+                    result[key] = data
             
             result['success'] = result['connection']['connected']
             
@@ -276,10 +290,27 @@ class RaspberryPiDataAggregator:
             self.logger.error(f"獲取完整狀態時發生錯誤: {e}")
             result['error'] = str(e)
         
-        return result
+        return result, uart_response
     
-    def get_real_time_uart_summary(self) -> Dict:
-        """獲取即時 UART 資料摘要"""
+    def get_snapshot(self) -> Dict:
+        """
+        同時產生完整狀態與 UART 摘要
+
+        兩者共用同一次 UART 狀態查詢，同時需要兩份資料時比分別呼叫少一次往返。
+        """
+        status, uart_response = self._complete_status()
+        return {
+            'status': status,
+            'uart_summary': self.get_real_time_uart_summary(uart_response)
+        }
+    
+    def get_real_time_uart_summary(self, uart_response: Optional[Tuple[bool, Any]] = None) -> Dict:
+        """
+        獲取即時 UART 資料摘要
+
+        Args:
+            uart_response: 已取得的 get_uart_status() 結果，提供時不再重新查詢
+        """
         result = {
             'success': False,
             'timestamp': datetime.now().isoformat(),
@@ -292,7 +323,7 @@ class RaspberryPiDataAggregator:
         
         try:
             # UART 狀態
-            success, uart_status = self.client.get_uart_status()
+            success, uart_status = uart_response or self.client.get_uart_status()
             if not success:
                 return result
             
@@ -313,15 +344,22 @@ class RaspberryPiDataAggregator:
             recent_data_count = 0
             channels_summary = {}
             
-            for mac_id in mac_ids[:5]:  # 限制前5個，避免過多 API 呼叫
+            sampled_mac_ids = mac_ids[:5]  # 限制前5個，避免過多 API 呼叫
+            calls = []
+            for mac_id in sampled_mac_ids:
+                calls.append(partial(self.client.get_uart_mac_channels, mac_id))
+                calls.append(partial(self.client.get_uart_mac_data, mac_id, minutes=1))
+            responses = _gather(*calls)
+            
+            for index, mac_id in enumerate(sampled_mac_ids):
                 # 通道資訊
-                success, channels_data = self.client.get_uart_mac_channels(mac_id)
+                success, channels_data = responses[2 * index]
                 if success and channels_data.get('success'):
                     channel_count = len(channels_data.get('data', {}).get('channels', []))
                     channels_summary[mac_id] = {'channel_count': channel_count}
                 
                 # 最近資料
-                success, recent_data = self.client.get_uart_mac_data(mac_id, minutes=1)
+                success, recent_data = responses[2 * index + 1]
                 if success:
                     data_count = len(recent_data)
                     recent_data_count += data_count
@@ -1,11 +1,14 @@
 import serial
 import threading
 import time
+import queue
 import json
 import re
 import os
 import csv
+from collections import Counter
 from datetime import datetime
+from functools import lru_cache
 from config.config_manager import ConfigManager
 import paho.mqtt.client as mqtt
 
@@ -39,6 +42,33 @@ import logging
 if MODBUS_AVAILABLE:
     logging.info("成功載入 pymodbus 2.5.3 同步 API")
 
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+# 視為沒有 MAC ID 的值
+INVALID_MAC_SENTINELS = frozenset({'N/A', '', None})
+
+
+@lru_cache(maxsize=4096)
+def timestamp_to_us(timestamp):
+    """
+    將 TIMESTAMP_FORMAT 字串轉為自 epoch 起的整數微秒 (本地時間)
+
+    同一秒內的資料共用同一字串，以 LRU 快取省去重複解析；無法解析時回傳 None。
+    """
+    try:
+        return int(datetime.strptime(timestamp, TIMESTAMP_FORMAT).timestamp()) * 1_000_000
+    except (TypeError, ValueError):
+        return None
+
+
+def entry_ts_us(entry):
+    """取得資料的整數微秒時間戳，舊資料沒有 ts_us 時由 timestamp 字串換算"""
+    ts_us = entry.get('ts_us')
+    if ts_us is None:
+        ts_us = timestamp_to_us(entry.get('timestamp', ''))
+    return ts_us
+
+
 class UARTReader:
     def __init__(self):
         self.config_manager = ConfigManager()
@@ -47,6 +77,12 @@ class UARTReader:
         self.latest_data = []
         self.max_data_count = None  # 無限制保存資料
         self.lock = threading.Lock()
+        # MAC ID 索引：隨 latest_data 增減同步維護，查詢 MAC ID 列表時不必掃描全部資料
+        self._mac_id_counts = Counter()
+        self._mac_id_sorted = None  # 排序後的 MAC ID 快取，MAC ID 集合變動時清除
+        self._data_version = 0  # latest_data 每次變動時遞增，供衍生統計判斷是否需要重算
+        # SSE 等即時推送的訂閱佇列：每筆新資料放入各佇列一次，讀取端不必輪詢
+        self._subscribers = set()
         # 初始化時載入歷史數據
         self.load_historical_data()
         
@@ -87,8 +123,10 @@ class UARTReader:
                                 reader = csv.DictReader(f)
                                 for row in reader:
                                     # 轉換為標準格式
+                                    timestamp = row.get('timestamp', '')
                                     data_entry = {
-                                        'timestamp': row.get('timestamp', ''),
+                                        'timestamp': timestamp,
+                                        'ts_us': timestamp_to_us(timestamp),
                                         'mac_id': row.get('mac_id', 'N/A'),
                                         'channel': int(row.get('channel', 0)),
                                         'parameter': float(row.get('parameter', 0.0)),
@@ -111,8 +149,10 @@ class UARTReader:
                         with open(file_path, 'r', encoding='utf-8') as f:
                             reader = csv.DictReader(f)
                             for row in reader:
+                                timestamp = row.get('timestamp', '')
                                 data_entry = {
-                                    'timestamp': row.get('timestamp', ''),
+                                    'timestamp': timestamp,
+                                    'ts_us': timestamp_to_us(timestamp),
                                     'mac_id': row.get('mac_id', 'N/A'),
                                     'channel': int(row.get('channel', 0)),
                                     'parameter': float(row.get('parameter', 0.0)),
@@ -130,6 +170,7 @@ class UARTReader:
             # 更新 latest_data
             with self.lock:
                 self.latest_data = loaded_data
+                self._rebuild_mac_index()
                 
             logging.info(f"歷史數據載入完成，共載入 {len(loaded_data)} 筆數據")
             
@@ -337,8 +378,10 @@ class UARTReader:
                             parsed_data = self.parse_uart_data(decoded_line)
                             
                             # 建立資料物件
+                            now = datetime.now()
                             data_entry = {
-                                'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                                'timestamp': now.strftime(TIMESTAMP_FORMAT),
+                                'ts_us': int(now.timestamp() * 1_000_000),
                                 'data': decoded_line,
                                 'raw': line.hex(),
                                 'mac_id': parsed_data['mac_id'],
@@ -350,10 +393,14 @@ class UARTReader:
                             # 更新最新資料
                             with self.lock:
                                 self.latest_data.append(data_entry)
+                                self._index_mac_id(data_entry.get('mac_id'))
+                                self._data_version += 1
                                 
                                 # 自動清理超過30分鐘的舊數據
                                 self._cleanup_old_data()
                             
+                            self._publish(data_entry)
+                            
                             logging.info(f"UART 收到: {decoded_line} -> {data_entry}")
                             
                             # 儲存到資料庫
@@ -441,6 +488,44 @@ class UARTReader:
         with self.lock:
             return self.latest_data.copy()
     
+    def get_tail(self, n):
+        """
+        獲取最新的 n 筆UART資料（舊到新）
+
+        只複製尾端 n 筆，不像 get_latest_data() 會複製整份資料。
+        """
+        if n <= 0:
+            return []
+        with self.lock:
+            return self.latest_data[-n:]
+    
+    def subscribe(self, maxsize=256):
+        """
+        訂閱新收到的UART資料
+
+        回傳的佇列會收到之後每一筆新資料；使用完畢須呼叫 unsubscribe()。
+        佇列已滿 (讀取端跟不上) 時新資料直接捨棄，不會阻塞讀取迴圈。
+        """
+        subscriber = queue.Queue(maxsize)
+        with self.lock:
+            self._subscribers.add(subscriber)
+        return subscriber
+    
+    def unsubscribe(self, subscriber):
+        """取消訂閱"""
+        with self.lock:
+            self._subscribers.discard(subscriber)
+    
+    def _publish(self, data_entry):
+        """將新資料推送給所有訂閱者"""
+        with self.lock:
+            subscribers = list(self._subscribers)
+        for subscriber in subscribers:
+            try:
+                subscriber.put_nowait(data_entry)
+            except queue.Full:
+                pass
+    
     def get_data_count(self):
         """獲取資料筆數"""
         with self.lock:
@@ -450,6 +535,61 @@ class UARTReader:
         """清除所有資料"""
         with self.lock:
             self.latest_data.clear()
+            self._rebuild_mac_index()
+    
+    @staticmethod
+    def _is_valid_mac_id(mac_id):
+        """判斷 MAC ID 是否為有效值（排除空值與 'N/A'）"""
+        return bool(mac_id) and mac_id not in INVALID_MAC_SENTINELS
+    
+    def _index_mac_id(self, mac_id):
+        """將一筆資料的 MAC ID 加入索引（需持有 self.lock）"""
+        if self._is_valid_mac_id(mac_id):
+            if mac_id not in self._mac_id_counts:
+                self._mac_id_sorted = None
+            self._mac_id_counts[mac_id] += 1
+    
+    def _unindex_mac_id(self, mac_id):
+        """將一筆資料的 MAC ID 從索引移除（需持有 self.lock）"""
+        if self._is_valid_mac_id(mac_id):
+            remaining = self._mac_id_counts[mac_id] - 1
+            if remaining > 0:
+                self._mac_id_counts[mac_id] = remaining
+            else:
+                del self._mac_id_counts[mac_id]
+                self._mac_id_sorted = None
+    
+    def _rebuild_mac_index(self):
+        """依目前的 latest_data 重建 MAC ID 索引（需持有 self.lock）"""
+        is_valid = self._is_valid_mac_id
+        self._mac_id_counts = Counter(
+            mac_id for mac_id in (entry.get('mac_id') for entry in self.latest_data)
+            if is_valid(mac_id)
+        )
+        self._mac_id_sorted = None
+        self._data_version += 1
+    
+    def get_data_version(self):
+        """獲取資料版本號（latest_data 每次新增、清理、重新載入或清除時遞增）"""
+        with self.lock:
+            return self._data_version
+    
+    def has_any_valid_mac_id(self):
+        """是否已有任何含有效 MAC ID 的資料（O(1)，不建立列表）"""
+        with self.lock:
+            return bool(self._mac_id_counts)
+    
+    def get_mac_id_index(self):
+        """
+        獲取 MAC ID 索引
+        
+        Returns:
+            tuple: (排序後的唯一 MAC ID 列表, 含有效 MAC ID 的資料筆數)
+        """
+        with self.lock:
+            if self._mac_id_sorted is None:
+                self._mac_id_sorted = sorted(self._mac_id_counts)
+            return list(self._mac_id_sorted), sum(self._mac_id_counts.values())
     
     def get_status(self):
         """獲取UART讀取器狀態"""
@@ -488,20 +628,20 @@ class UARTReader:
             # 修正：從30分鐘改為2小時，確保 MAC ID 有足夠時間被前端獲取
             two_hours_ago = datetime.now() - timedelta(hours=2)
             
+            cutoff_us = int(two_hours_ago.timestamp() * 1_000_000)
+            
             # 計算清理前的數據量
             original_count = len(self.latest_data)
             
-            # 過濾出2小時內的數據
+            # 過濾出2小時內的數據（以整數微秒比較，不必逐筆解析時間字串）
             filtered_data = []
             for entry in self.latest_data:
-                try:
-                    # 解析時間戳
-                    entry_timestamp = datetime.strptime(entry['timestamp'], '%Y-%m-%d %H:%M:%S')
-                    if entry_timestamp >= two_hours_ago:
-                        filtered_data.append(entry)
-                except ValueError:
-                    # 如果時間戳解析失敗，保留該數據
+                ts_us = entry_ts_us(entry)
+                # 時間戳無法解析時保留該數據
+                if ts_us is None or ts_us >= cutoff_us:
                     filtered_data.append(entry)
+                else:
+                    self._unindex_mac_id(entry.get('mac_id'))
             
             # 更新數據列表
             self.latest_data = filtered_data
@@ -513,6 +653,8 @@ class UARTReader:
                 
         except Exception as e:
             logging.warning(f"清理舊數據時發生錯誤: {e}")
+            # 清理中途失敗時索引可能已部分更新，依現有資料重建
+            self._rebuild_mac_index()
     
     def _save_to_local_history(self, data_entry):
         """將資料保存到本地History資料夾，依照日期分類"""
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+快取工具模組
+提供執行緒安全的 TTL 快取，用於吸收前端輪詢造成的重複查詢
+"""
+
+import threading
+import time
+from functools import wraps
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    執行緒安全的簡易 TTL 快取
+
+    以 time.monotonic() 判斷過期，超過 maxsize 時淘汰最早寫入的項目。
+    """
+
+    def __init__(self, ttl: float, maxsize: int = 128):
+        """
+        初始化快取
+
+        Args:
+            ttl: 項目存活秒數
+            maxsize: 最大項目數
+        """
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data: Dict[Hashable, Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """取得未過期的快取值，不存在或已過期時回傳 default"""
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return default
+            expires_at, value = item
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """寫入快取值，可針對單一項目指定 ttl"""
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            if key not in self._data and len(self._data) >= self.maxsize:
+                self._data.pop(next(iter(self._data)))
+            self._data[key] = (expires_at, value)
+
+    def get_or_set(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """取得快取值，未命中時呼叫 factory 計算並寫入（計算期間不持有鎖）"""
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = factory()
+            self.set(key, value)
+        return value
+
+    def invalidate(self, key: Hashable = _MISSING) -> None:
+        """移除指定項目；未指定 key 時清空整個快取"""
+        with self._lock:
+            if key is _MISSING:
+                self._data.clear()
+            else:
+                self._data.pop(key, None)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+
+def ttl_cache(ttl: float, maxsize: int = 128):
+    """
+    以位置/關鍵字參數為鍵的 TTL 快取裝飾器
+
+    被裝飾的函數會多出 cache_clear() 與 cache 屬性。
+
+    Args:
+        ttl: 快取存活秒數
+        maxsize: 最大項目數
+    """
+    def decorator(func):
+        cache = TTLCache(ttl, maxsize)
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            key = (args, tuple(sorted(kwargs.items()))) if kwargs else args
+            return cache.get_or_set(key, lambda: func(*args, **kwargs))
+
+        wrapper.cache = cache
+        wrapper.cache_clear = cache.invalidate
+        return wrapper
+    return decorator
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+回應壓縮工具模組
+依用戶端 Accept-Encoding 以 Brotli 或 gzip 壓縮較大的 JSON 回應
+"""
+
+import gzip
+
+from flask import request
+
+try:
+    import brotli
+except ImportError:  # brotli 為選用依賴，未安裝時只提供 gzip
+    brotli = None
+
+# 小於此位元組數的回應直接送出，壓縮的額外開銷不划算
+COMPRESS_MIN_SIZE = 500
+COMPRESS_MIMETYPES = frozenset(('application/json',))
+
+# 偏向速度的壓縮等級：JSON 在低等級已能縮小數倍
+GZIP_LEVEL = 5
+BROTLI_QUALITY = 4
+
+
+def _choose_encoding():
+    """依 Accept-Encoding 選擇壓縮方式，優先 br"""
+    accept = request.accept_encodings
+    if brotli is not None and accept.quality('br') > 0:
+        return 'br'
+    if accept.quality('gzip') > 0:
+        return 'gzip'
+    return None
+
+
+def compress_response(response, min_size: int = COMPRESS_MIN_SIZE):
+    """
+    after_request 用：壓縮符合條件的回應
+
+    串流回應 (例如 SSE)、已編碼或非 JSON 的回應原樣回傳。
+    """
+    if (response.direct_passthrough or response.is_streamed
+            or response.mimetype not in COMPRESS_MIMETYPES
+            or not 200 <= response.status_code < 300
+            or 'Content-Encoding' in response.headers):
+        return response
+
+    response.vary.add('Accept-Encoding')
+    body = response.get_data()
+    if len(body) < min_size:
+        return response
+
+    encoding = _choose_encoding()
+    if encoding == 'br':
+        body = brotli.compress(body, quality=BROTLI_QUALITY)
+    elif encoding == 'gzip':
+        body = gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+    else:
+        return response
+
+    response.set_data(body)
+    response.headers['Content-Encoding'] = encoding
+    return response
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+JSON 序列化提供者
+以 orjson 取代 Flask 預設的標準庫 JSON 編碼，jsonify / request.get_json 皆自動套用
+"""
+
+import logging
+from typing import Any
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # orjson 為選用依賴，未安裝時維持 Flask 預設行為
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    使用 orjson 的 JSON 提供者
+
+    datetime 仍交由 Flask 的 default() 處理（維持原本的 HTTP 日期格式），
+    orjson 無法處理的物件（例如超過 64 位元的整數）則退回標準庫編碼。
+    jsonify 回應直接使用 orjson 產生的 bytes，不經過 str 再編碼一次。
+    """
+
+    _BASE_OPTIONS = (orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+                     | orjson.OPT_PASSTHROUGH_DATETIME) if orjson else 0
+
+    def _dumps_bytes(self, obj: Any, **kwargs: Any) -> bytes:
+        """序列化為 UTF-8 bytes；orjson 無法處理時退回標準庫"""
+        option = self._BASE_OPTIONS
+        if kwargs.get('sort_keys', self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get('indent'):
+            option |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(obj, default=kwargs.get('default', self.default), option=option)
+        except orjson.JSONEncodeError:
+            return super().dumps(obj, **kwargs).encode('utf-8')
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return self._dumps_bytes(obj, **kwargs).decode('utf-8')
+
+    def loads(self, s: Any, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any):
+        obj = self._prepare_response_obj(args, kwargs)
+        # 與 Flask 相同：除錯模式 (或 compact=False) 時輸出縮排格式
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            body = self._dumps_bytes(obj, indent=2)
+        else:
+            body = self._dumps_bytes(obj)
+        return self._app.response_class(body + b'\n', mimetype=self.mimetype)
+
+
+def install_json_provider(app) -> bool:
+    """
+    為 Flask 應用安裝 orjson 提供者
+
+    Returns:
+        bool: 是否已安裝（未安裝 orjson 時回傳 False，沿用預設提供者）
+    """
+    if orjson is None:
+        logger.info("orjson 未安裝，使用 Flask 預設 JSON 提供者")
+        return False
+
+    app.json = OrjsonProvider(app)
+    return True
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+日誌工具模組
+提供非同步 (佇列式) 日誌輸出，讓檔案/主控台 I/O 離開請求執行緒
+"""
+
+import atexit
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+_queue_listener: Optional[QueueListener] = None
+
+
+def enable_queue_logging(logger: Optional[logging.Logger] = None) -> Optional[QueueListener]:
+    """
+    將 logger 現有的處理器移到背景 QueueListener 執行緒
+
+    呼叫端只需把紀錄放入佇列，實際的格式化與寫檔由背景執行緒完成。
+    重複呼叫不會重複安裝。
+
+    Args:
+        logger: 目標 logger，預設為 root logger
+
+    Returns:
+        Optional[QueueListener]: 已啟動的 listener；沒有處理器可轉移時為 None
+    """
+    global _queue_listener
+
+    if _queue_listener is not None:
+        return _queue_listener
+
+    target = logger or logging.getLogger()
+    handlers = [h for h in target.handlers if not isinstance(h, QueueHandler)]
+    if not handlers:
+        return None
+
+    log_queue = queue.SimpleQueue()
+    for handler in handlers:
+        target.removeHandler(handler)
+    target.addHandler(QueueHandler(log_queue))
+
+    _queue_listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _queue_listener.start()
+    atexit.register(_queue_listener.stop)
+
+    return _queue_listener
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+服務啟動工具模組
+非除錯模式下以 waitress 提供 WSGI 服務，取代 Flask 內建的開發伺服器
+"""
+
+import logging
+import os
+
+try:
+    from waitress import serve
+except ImportError:  # waitress 為選用依賴，未安裝時沿用 Flask 開發伺服器
+    serve = None
+
+logger = logging.getLogger(__name__)
+
+# waitress 處理請求的執行緒數；WiFi 掃描、ping 等阻塞操作已交由背景執行緒池。
+# 即時監控 API 會同步呼叫 RAS_pi，連線較慢的部署可用 DASHBOARD_WSGI_THREADS 調高
+WSGI_THREADS = int(os.getenv('DASHBOARD_WSGI_THREADS', '8'))
+
+
+def run_app(app, host: str, port: int, debug: bool = False,
+            threads: int = WSGI_THREADS, **run_kwargs) -> None:
+    """
+    啟動 Flask 應用
+
+    除錯模式或未安裝 waitress 時使用 app.run(threaded=True)，
+    其餘情況交給 waitress（純 Python，Windows 與樹莓派皆可使用）。
+
+    Args:
+        app: Flask 應用實例
+        host: 監聽位址
+        port: 監聽埠
+        debug: 是否為除錯模式
+        threads: waitress 工作執行緒數
+        **run_kwargs: 使用開發伺服器時額外傳給 app.run() 的參數
+    """
+    if debug or serve is None:
+        if not debug:
+            logger.info("waitress 未安裝，使用 Flask 開發伺服器")
+        app.run(host=host, port=port, debug=debug, threaded=True, **run_kwargs)
+        return
+
+    logger.info("以 waitress 啟動服務: %s:%s (threads=%d)", host, port, threads)
+    serve(app, host=host, port=port, threads=threads)
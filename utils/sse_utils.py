@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Server-Sent Events 工具模組
+限制 SSE 連線的壽命與同時連線數，避免長連線佔滿 WSGI 工作執行緒
+"""
+
+import os
+import threading
+import time
+
+from flask import Response
+
+from utils.server_utils import WSGI_THREADS
+
+# 所有 SSE 端點合計的同時連線上限，預設保留一半工作執行緒給一般請求
+SSE_MAX_STREAMS = int(os.getenv('DASHBOARD_SSE_MAX_STREAMS', str(max(1, WSGI_THREADS // 2))))
+
+# 單一連線的最長秒數；到期後結束串流，由 EventSource 依 retry 自動重新連線
+SSE_MAX_LIFETIME = int(os.getenv('DASHBOARD_SSE_MAX_LIFETIME', '300'))
+SSE_RETRY_MS = 3000
+
+_RETRY_FIELD = f'retry: {SSE_RETRY_MS}\n\n'.encode('ascii')
+
+_stream_slots = threading.BoundedSemaphore(SSE_MAX_STREAMS)
+
+
+def open_event_stream(events):
+    """
+    以有限壽命與全域連線上限包裝 SSE 產生器
+
+    每送出一段資料後檢查是否超過 SSE_MAX_LIFETIME，因此產生器應定期 yield
+    (資料或 keep-alive)。名額在回應關閉時釋放，即使產生器從未開始執行。
+
+    Args:
+        events: 產生 SSE 文字 (str 或 bytes) 的產生器
+
+    Returns:
+        Response: text/event-stream 回應；連線數已達上限時回傳 None
+    """
+    if not _stream_slots.acquire(blocking=False):
+        events.close()
+        return None
+
+    # 產生器結束與回應關閉都會呼叫 release()，以一次性的鎖確保只釋放一次
+    release_once = threading.Lock()
+
+    def release():
+        if release_once.acquire(blocking=False):
+            _stream_slots.release()
+
+    def stream():
+        try:
+            yield _RETRY_FIELD
+            deadline = time.monotonic() + SSE_MAX_LIFETIME
+            for chunk in events:
+                yield chunk
+                if time.monotonic() >= deadline:
+                    break
+        finally:
+            events.close()
+            release()
+
+    response = Response(
+        stream(),
+        mimetype='text/event-stream',
+        headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no'
+        }
+    )
+    response.call_on_close(release)
+    return response
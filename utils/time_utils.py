@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+時間工具模組
+提供不建立 datetime 物件的 ISO 時間字串格式化
+"""
+
+import time
+
+
+def fast_iso_now(_time=time.time, _localtime=time.localtime) -> str:
+    """
+    回傳目前本地時間的 ISO 8601 字串（微秒精度）
+
+    格式與 datetime.now().isoformat() 相同，但直接由 time.localtime() 組成，
+    省去建立 datetime 物件。
+    """
+    t = _time()
+    s = _localtime(t)
+    return (f"{s.tm_year:04d}-{s.tm_mon:02d}-{s.tm_mday:02d}"
+            f"T{s.tm_hour:02d}:{s.tm_min:02d}:{s.tm_sec:02d}.{int(t % 1 * 1e6):06d}")
+
+
+def fast_iso_seconds(seconds: int, _localtime=time.localtime) -> str:
+    """回傳指定 epoch 秒數的本地時間 ISO 8601 字串（秒級精度）"""
+    s = _localtime(seconds)
+    return (f"{s.tm_year:04d}-{s.tm_mon:02d}-{s.tm_mday:02d}"
+            f"T{s.tm_hour:02d}:{s.tm_min:02d}:{s.tm_sec:02d}")
+
+
+_iso_second_cache = (None, '')
+
+
+def cached_iso_now(_time=time.time) -> str:
+    """
+    回傳目前本地時間的 ISO 8601 字串（秒級精度）
+
+    同一秒內的呼叫直接重用上次格式化的字串，適合回應內容中的時間戳記。
+    """
+    global _iso_second_cache
+    sec = int(_time())
+    cached_sec, text = _iso_second_cache
+    if cached_sec != sec:
+        text = fast_iso_seconds(sec)
+        _iso_second_cache = (sec, text)
+    return text
@@ -3,11 +3,110 @@ API 回應視圖
 標準化 API 回應格式
 """
 
-from flask import jsonify
-from datetime import datetime
+from flask import jsonify, Response, request, make_response
+from functools import wraps
 from typing import Any, Dict, Optional, List
+import hashlib
+import json
 import logging
 
+from utils.time_utils import fast_iso_now
+
+try:
+    import orjson
+except ImportError:  # orjson 為選用依賴，未安裝時退回標準庫
+    orjson = None
+
+
+# 預先序列化的錯誤回應模板，只需填入編碼後的錯誤訊息
+_ERROR_TEMPLATE = b'{"success":false,"error":%s}'
+
+
+def _encode_json_string(value: str) -> bytes:
+    """將字串編碼為 JSON 字串常值 (bytes)"""
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, ensure_ascii=False).encode('utf-8')
+
+
+def json_error(message: Any, status_code: int = 500) -> Response:
+    """輕量錯誤回應，格式為 {"success": false, "error": message}"""
+    return Response(_ERROR_TEMPLATE % _encode_json_string(str(message)),
+                    status=status_code,
+                    mimetype='application/json')
+
+
+def prebuilt_json(payload: Any) -> bytes:
+    """
+    將回應內容序列化為 JSON bytes（固定內容通常於模組匯入時呼叫一次）
+
+    非字串鍵會轉為字串，其他無法直接序列化的物件以 str() 表示。
+    """
+    if orjson is not None:
+        return orjson.dumps(payload, default=str, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(payload, ensure_ascii=False, separators=(',', ':'),
+                      default=str).encode('utf-8')
+
+
+def json_bytes_response(body: bytes, status_code: int = 200) -> Response:
+    """直接以已序列化的 JSON bytes 建立回應，不再經過 jsonify"""
+    return Response(body, status=status_code, mimetype='application/json')
+
+
+# json_template() 中代表「稍後填入」的欄位值
+TEMPLATE_SLOT = '\x00slot\x00'
+_SLOT_JSON = b'"\\u0000slot\\u0000"'
+
+
+def json_template(payload: Any) -> bytes:
+    """
+    將結構固定的回應預先序列化為 %-模板
+
+    值為 TEMPLATE_SLOT 的欄位會變成 %s，請求時依序填入 prebuilt_json(值) 即可，
+    其餘固定內容不必每次重新建立 dict 與編碼。
+    """
+    body = prebuilt_json(payload).replace(b'%', b'%%')
+    if _SLOT_JSON not in body:
+        raise ValueError('模板中沒有 TEMPLATE_SLOT 欄位')
+    return body.replace(_SLOT_JSON, b'%s')
+
+
+def json_response(payload: Any, status_code: int = 200) -> Response:
+    """直接序列化為 bytes 並建立回應，略過 jsonify 的參數整理與縮排判斷"""
+    return json_bytes_response(prebuilt_json(payload), status_code)
+
+
+def request_json_body() -> Optional[Dict]:
+    """
+    直接解析請求主體為 JSON 物件，不做 Content-Type 檢查也不快取原始內容
+
+    空主體視為 {}；無法解析或不是物件時回傳 None。
+    """
+    raw = request.get_data(cache=False) or b'{}'
+    try:
+        data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+    except ValueError:  # orjson.JSONDecodeError 與 json.JSONDecodeError 皆為 ValueError
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def etag_json(view):
+    """
+    為 JSON GET 端點加上強 ETag 的裝飾器
+
+    以 BLAKE2b 雜湊回應內容作為 ETag，請求的 If-None-Match 相符時回傳 304，
+    省去重複傳輸未變動的資料。非 GET 或非 200 的回應不處理。
+    """
+    @wraps(view)
+    def decorated_function(*args, **kwargs):
+        response = make_response(view(*args, **kwargs))
+        if request.method != 'GET' or response.status_code != 200 or not response.is_json:
+            return response
+        
+        response.set_etag(hashlib.blake2b(response.get_data(), digest_size=16).hexdigest())
+        return response.make_conditional(request)
+    return decorated_function
+
 
 class ApiResponseView:
     """API 回應視圖類"""
@@ -17,7 +116,7 @@ class ApiResponseView:
         """成功回應"""
         response = {
             'success': True,
-            'timestamp': datetime.now().isoformat()
+            'timestamp': fast_iso_now()
         }
         
         if data is not None:
@@ -34,7 +133,7 @@ class ApiResponseView:
         response = {
             'success': False,
             'error': error,
-            'timestamp': datetime.now().isoformat()
+            'timestamp': fast_iso_now()
         }
         
         if details:
@@ -147,7 +246,7 @@ class DataResponseView:
         """系統狀態回應格式"""
         response_data = {
             'status': status_data,
-            'check_time': datetime.now().isoformat()
+            'check_time': fast_iso_now()
         }
         
         response_data.update(kwargs)
@@ -159,7 +258,7 @@ class DataResponseView:
         """網路狀態回應格式"""
         response_data = {
             'network': network_data,
-            'test_time': datetime.now().isoformat()
+            'test_time': fast_iso_now()
         }
         
         response_data.update(kwargs)